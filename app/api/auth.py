@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from app.database.database import get_db
+from app.database.database import get_async_db
 from app.schemas import Token, UserCreate, UserResponse
 from app.models import User
+from app.repositories.catalog_cache import on_user_changed
+from app.utils.config import settings
 from app.utils.security import (
     create_access_token, 
-    verify_password, 
-    get_password_hash
+    verify_password_async, 
+    get_password_hash_async
 )
+from app.utils.worker_pool import PoolSaturatedError
 
 router = APIRouter()
 
@@ -17,15 +21,34 @@ class LoginRequest(BaseModel):
     username: str
     password: str
 
+async def find_user(db: AsyncSession, condition):
+    result = await db.execute(select(User).where(condition))
+    return result.scalars().first()
+
+async def run_password_job(job):
+    """Дождаться задачи пула паролей; при перегрузке пула — 503"""
+    try:
+        return await job
+    except PoolSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервер перегружен, повторите попытку позже",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+        )
+
 @router.post("/login", response_model=Token)
 async def login(
     credentials: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Вход в систему"""
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = await find_user(db, User.username == credentials.username)
+    # Не держим соединение с БД, пока пароль проверяется в пуле
+    await db.close()
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await run_password_job(
+        verify_password_async(credentials.password, user.password_hash)
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверное имя пользователя или пароль",
@@ -38,22 +61,23 @@ async def login(
 @router.post("/register", response_model=Token)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Регистрация нового пользователя"""
     # Проверяем существование пользователя
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = await find_user(db, User.username == user_data.username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Пользователь с таким именем уже существует")
     
     # Проверяем email
     if user_data.email:
-        existing_email = db.query(User).filter(User.email == user_data.email).first()
+        existing_email = await find_user(db, User.email == user_data.email)
         if existing_email:
             raise HTTPException(status_code=400, detail="Пользователь с таким email уже существует")
     
-    # Создаем нового пользователя
-    hashed_password = get_password_hash(user_data.password)
+    # Создаем нового пользователя (соединение с БД на время хеширования отпускаем)
+    await db.close()
+    hashed_password = await run_password_job(get_password_hash_async(user_data.password))
     db_user = User(
         username=user_data.username,
         email=user_data.email or "",
@@ -63,8 +87,8 @@ async def register(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    on_user_changed()
     
     # Создаем токен
     access_token = create_access_token(data={"sub": db_user.username})
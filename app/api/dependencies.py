@@ -2,20 +2,22 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.database import get_db
+from app.database.database import get_async_db
 from app.models.users import User
+from app.repositories.user_cache import UserSnapshot, user_cache
 from app.schemas.auth import TokenData
 from app.utils.config import settings
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[UserSnapshot]:
     """
     Получить текущего пользователя основанэ на токене
     """
@@ -44,12 +46,30 @@ def get_current_user(
             detail="u041dеверный токен",
         )
     
-    # Получаем пользователя из базы данных
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="u041fользователь не найден",
-        )
+    # Снимок пользователя из кэша, в БД идем только при промахе
+    user = user_cache.get(("user", username))
+    if user is None:
+        result = await db.execute(select(User).where(User.username == username))
+        db_user = result.scalars().first()
+        if not db_user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="u041fользователь не найден",
+            )
+        user = UserSnapshot.from_user(db_user)
+        user_cache.set(("user", username), user)
     
     return user
+
+async def get_current_superuser(
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
+    """
+    Текущий пользователь, если он администратор, иначе 403
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав",
+        )
+    return current_user
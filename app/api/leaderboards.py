@@ -0,0 +1,38 @@
+# api/leaderboards.py
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Optional
+
+from app.repositories.leaderboards import BOARDS, GLOBAL_SCOPE, leaderboards
+from app.services.leaderboards import leaderboard_refresher
+from app.utils.config import settings
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+@router.get("/{board}")
+async def read_leaderboard(
+    board: str,
+    genre: Optional[str] = None,
+    pick: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=settings.LEADERBOARD_SIZE),
+):
+    """
+    Рейтинг фильмов: top-rated, most-viewed или most-favorited, по всему
+    каталогу, жанру (genre) или подборке (pick). Отдается из памяти.
+    """
+    if board not in BOARDS:
+        raise HTTPException(status_code=404, detail=f"Неизвестный рейтинг, доступны: {', '.join(BOARDS)}")
+    if genre and pick:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Укажите либо жанр, либо подборку",
+        )
+    scope = ("genre", genre.lower()) if genre else ("pick", pick) if pick else GLOBAL_SCOPE
+
+    await leaderboard_refresher.ensure_fresh()
+    return {
+        "board": board,
+        "scope": dict([scope]) if len(scope) == 2 else {},
+        "items": leaderboards.page(board, scope, offset, limit),
+        "updated_at": leaderboards.built_at.isoformat() if leaderboards.built_at else None,
+    }
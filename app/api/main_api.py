@@ -5,83 +5,107 @@
 - Аутентификации
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List, Optional
 
-from app.database.database import get_db
+from app.database.counters import read_counters
+from app.database.database import get_async_db
 from app.models.movies import Movie
 from app.models.reviews import Review
 from app.models.favorites import Favorite
-from app.models.users import User
 from app.models.picks import Pick
-from app.models.movie_picks import MoviePick
+from app.repositories.catalog import CatalogRepository
+from app.repositories.engagement import InvalidWindowError, parse_window, trending
+from app.repositories.genres import list_genre_names, set_movie_genres
+from app.repositories.movie_stats import MovieStatRepository
+from app.repositories.upserts import link_movie_picks, upsert_movies
+from app.repositories.catalog_cache import (
+    catalog_cache,
+    on_favorite_changed,
+    on_movie_changed,
+    on_review_changed,
+)
 from app.api.dependencies import get_current_user
+from app.services.engagement import engagement_recorder, utcnow
+from app.repositories.user_cache import UserSnapshot, user_cache
+from app.schemas.favorites import FavoriteCheckRequest
+from app.utils.security import password_pool
+from app.utils.http_cache import PRIVATE_CACHE_CONTROL, conditional_response, render_json
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    keyset_paginate,
+    split_page,
+)
 
 # Роутер
 router = APIRouter()
 
+# Ключ сортировки ленты отзывов (новые первыми)
+REVIEW_PAGE_KEY = (Review.created_at, Review.id)
+
+
+async def page_response(fetch_page):
+    """Выполнить постраничную выборку и вернуть {"items", "next_cursor"}"""
+    try:
+        items, next_cursor = await fetch_page()
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def cached_json(request: Request, key: tuple, loader, cache_control: Optional[str] = None):
+    """Ответ из кэша каталога с поддержкой ETag/304 (JSON рендерится один раз)"""
+    rendered = catalog_cache.get(key)
+    if rendered is None:
+        rendered = render_json(await loader())
+        catalog_cache.set(key, rendered)
+    return conditional_response(request, rendered, cache_control)
+
 # ============================================================================
 # ФИЛЬМЫ
 # ============================================================================
 
 @router.get("/movies", tags=["Movies"])
-async def get_movies(db: Session = Depends(get_db)):
+async def get_movies(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    pick: Optional[str] = None,
+    genre: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Получить список всех фильмов с подборками
+    Получить страницу фильмов с подборками (по убыванию рейтинга).
+    Следующая страница запрашивается с cursor=next_cursor.
     """
-    movies = db.query(Movie).all()
-    result = []
-    
-    for movie in movies:
-        picks = db.query(Pick.name).join(
-            MoviePick, MoviePick.pick_id == Pick.id
-        ).filter(
-            MoviePick.movie_id == movie.id
-        ).all()
-        
-        result.append({
-            "id": movie.id,
-            "title": movie.title,
-            "overview": movie.overview,
-            "year": movie.year,
-            "genre": movie.genre,
-            "rating": movie.rating,
-            "poster_url": movie.poster_url,
-            "picks": [p[0] for p in picks],
-            "created_by": movie.created_by
-        })
-    
-    return result
+    return await cached_json(
+        request,
+        ("movies", limit, cursor, pick, genre, min_rating),
+        lambda: page_response(lambda: CatalogRepository(db).list_movies(
+            limit, cursor=cursor, pick=pick, genre=genre, min_rating=min_rating
+        )),
+    )
 
 
 @router.get("/movies/{movie_id}", tags=["Movies"])
-async def get_movie(movie_id: int, db: Session = Depends(get_db)):
+async def get_movie(movie_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Получить информацию о конкретном фильме
     """
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
-    if not movie:
-        raise HTTPException(status_code=404, detail="Фильм не найден")
-    
-    picks = db.query(Pick.name).join(
-        MoviePick, MoviePick.pick_id == Pick.id
-    ).filter(
-        MoviePick.movie_id == movie_id
-    ).all()
+    async def load_movie():
+        movie = await CatalogRepository(db).get_movie(movie_id)
+        if not movie:
+            raise HTTPException(status_code=404, detail="Фильм не найден")
+        return movie
     
-    return {
-        "id": movie.id,
-        "title": movie.title,
-        "overview": movie.overview,
-        "year": movie.year,
-        "genre": movie.genre,
-        "rating": movie.rating,
-        "poster_url": movie.poster_url,
-        "picks": [p[0] for p in picks],
-        "created_by": movie.created_by
-    }
+    return await cached_json(request, ("movie", movie_id), load_movie)
 
 
 @router.post("/movies", tags=["Movies"])
@@ -93,8 +117,8 @@ async def create_movie(
     picks: List[str] = [],
     overview: Optional[str] = None,
     poster_url: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Создать новый фильм (только админ)
@@ -113,7 +137,7 @@ async def create_movie(
             detail="Выберите минимум 2 подборки для фильма"
         )
     
-    movie = Movie(
+    row = dict(
         title=title,
         year=year,
         genre=genre,
@@ -122,37 +146,28 @@ async def create_movie(
         poster_url=poster_url,
         created_by=current_user.id
     )
-    db.add(movie)
-    db.flush()  # Получаем ID
+    # Дубликат (то же название и год) отсекает уникальный natural_key
+    created = await db.run_sync(lambda session: upsert_movies(session, [row]))
+    if not created:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Такой фильм уже есть в каталоге"
+        )
+    movie_id = next(iter(created.values()))
     
-    # Добавляем подборки
-    for pick_slug in picks:
-        pick = db.query(Pick).filter(Pick.slug == pick_slug).first()
-        if pick:
-            movie_pick = MoviePick(movie_id=movie.id, pick_id=pick.id)
-            db.add(movie_pick)
+    # Добавляем подборки (все slug'и разрешаем одним запросом)
+    pick_ids = (await db.execute(select(Pick.id).where(Pick.slug.in_(picks)))).scalars().all()
     
-    db.commit()
-    db.refresh(movie)
+    def link(session):
+        link_movie_picks(session, [(movie_id, pick_id) for pick_id in pick_ids])
+        set_movie_genres(session, movie_id, genre)
     
-    # Возвращаем полный объект фильма с подборками
-    pick_names = db.query(Pick.name).join(
-        MoviePick, MoviePick.pick_id == Pick.id
-    ).filter(
-        MoviePick.movie_id == movie.id
-    ).all()
+    await db.run_sync(link)
+    await db.commit()
+    on_movie_changed(movie_id)
     
-    return {
-        "id": movie.id,
-        "title": movie.title,
-        "year": movie.year,
-        "genre": movie.genre,
-        "rating": movie.rating,
-        "overview": movie.overview,
-        "poster_url": movie.poster_url,
-        "picks": [p[0] for p in pick_names],
-        "created_by": movie.created_by
-    }
+    # Возвращаем полный объект фильма с подборками
+    return await CatalogRepository(db).get_movie(movie_id)
 
 
 # ============================================================================
@@ -160,30 +175,39 @@ async def create_movie(
 # ============================================================================
 
 @router.get("/reviews", tags=["Reviews"])
-async def get_reviews(movie_id: Optional[int] = None, db: Session = Depends(get_db)):
+async def get_reviews(
+    request: Request,
+    movie_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Получить все отзывы (опционально фильтровать по фильму)
+    Получить страницу отзывов, новые первыми (опционально фильтровать по фильму)
     """
-    query = db.query(Review)
+    stmt = select(Review).options(joinedload(Review.user))
     
     if movie_id:
-        query = query.filter(Review.movie_id == movie_id)
+        stmt = stmt.where(Review.movie_id == movie_id)
     
-    reviews = query.all()
-    result = []
+    async def fetch_page():
+        rows = (await db.execute(keyset_paginate(stmt, REVIEW_PAGE_KEY, cursor, limit))).all()
+        reviews, next_cursor = split_page(rows, limit, len(REVIEW_PAGE_KEY))
+        return [review_to_dict(review) for review in reviews], next_cursor
     
-    for review in reviews:
-        result.append({
-            "id": review.id,
-            "movie_id": review.movie_id,
-            "user_id": review.user_id,
-            "author_name": review.author_name or (review.user.username if review.user else "Аноним"),
-            "text": review.text,
-            "rating": review.rating,
-            "created_at": review.created_at.isoformat() if review.created_at else None
-        })
-    
-    return result
+    return await cached_json(request, ("reviews", movie_id, limit, cursor), lambda: page_response(fetch_page))
+
+
+def review_to_dict(review: Review) -> dict:
+    return {
+        "id": review.id,
+        "movie_id": review.movie_id,
+        "user_id": review.user_id,
+        "author_name": review.author_name or (review.user.username if review.user else "Аноним"),
+        "text": review.text,
+        "rating": review.rating,
+        "created_at": review.created_at.isoformat() if review.created_at else None
+    }
 
 
 @router.post("/reviews", tags=["Reviews"])
@@ -191,14 +215,14 @@ async def create_review(
     movie_id: int,
     text: str,
     rating: float,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Создать новый отзыв на фильм
     """
     # Проверяем, что фильм существует
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
+    movie = await db.get(Movie, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Фильм не найден")
     
@@ -210,30 +234,27 @@ async def create_review(
         author_name=current_user.username
     )
     db.add(review)
-    db.commit()
-    db.refresh(review)
+    # Агрегаты оценок меняются в той же транзакции, что и отзывы
+    await db.flush()
+    await MovieStatRepository(db).apply_review(movie_id, rating, 1)
+    await db.commit()
+    await db.refresh(review)
+    on_review_changed(movie_id)
+    engagement_recorder.add(movie_id, "review")
     
-    return {
-        "id": review.id,
-        "movie_id": review.movie_id,
-        "user_id": review.user_id,
-        "author_name": review.author_name,
-        "text": review.text,
-        "rating": review.rating,
-        "created_at": review.created_at.isoformat() if review.created_at else None
-    }
+    return review_to_dict(review)
 
 
 @router.delete("/reviews/{review_id}", tags=["Reviews"])
 async def delete_review(
     review_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Удалить отзыв (только админ или автор отзыва)
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(status_code=404, detail="Отзыв не найден")
     
@@ -244,8 +265,12 @@ async def delete_review(
             detail="Вы не можете удалить этот отзыв"
         )
     
-    db.delete(review)
-    db.commit()
+    movie_id = review.movie_id
+    await db.delete(review)
+    await db.flush()
+    await MovieStatRepository(db).apply_review(movie_id, -review.rating, -1)
+    await db.commit()
+    on_review_changed(movie_id)
     
     return {"status": "deleted", "review_id": review_id}
 
@@ -256,64 +281,97 @@ async def delete_review(
 
 @router.get("/favorites", tags=["Favorites"])
 async def get_user_favorites(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Получить избранные фильмы текущего пользователя
+    Получить страницу избранных фильмов текущего пользователя
     """
-    favorites = db.query(Favorite).filter(Favorite.user_id == current_user.id).all()
-    result = []
-    
-    for fav in favorites:
-        movie = fav.movie
-        picks = db.query(Pick.name).join(
-            MoviePick, MoviePick.pick_id == Pick.id
-        ).filter(
-            MoviePick.movie_id == movie.id
-        ).all()
-        
-        result.append({
-            "id": movie.id,
-            "title": movie.title,
-            "overview": movie.overview,
-            "year": movie.year,
-            "genre": movie.genre,
-            "rating": movie.rating,
-            "poster_url": movie.poster_url,
-            "picks": [p[0] for p in picks]
-        })
-    
-    return result
+    return await cached_json(
+        request,
+        ("favorites", current_user.id, limit, cursor),
+        lambda: page_response(lambda: CatalogRepository(db).list_user_favorites(
+            current_user.id, limit, cursor=cursor
+        )),
+        cache_control=PRIVATE_CACHE_CONTROL,
+    )
+
+
+@router.get("/favorites/ids", tags=["Favorites"])
+async def get_favorite_ids(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    ID всех избранных фильмов пользователя (с ETag: неизменившийся
+    список отдается пустым 304)
+    """
+    async def load():
+        movie_ids = await CatalogRepository(db).favorite_movie_ids(current_user.id)
+        return {"movie_ids": movie_ids, "count": len(movie_ids)}
+
+    return await cached_json(
+        request,
+        ("favorites", current_user.id, "ids"),
+        load,
+        cache_control=PRIVATE_CACHE_CONTROL,
+    )
+
+
+# Объявлен раньше POST /favorites/{movie_id}, иначе "check" разбирался бы как movie_id
+@router.post("/favorites/check", tags=["Favorites"])
+async def check_favorites(
+    payload: FavoriteCheckRequest,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Какие из переданных фильмов есть в избранном (один запрос вместо
+    GET /favorites/check/{movie_id} на каждый фильм)
+    """
+    movie_ids = sorted(set(payload.movie_ids))
+    favorite_ids = await CatalogRepository(db).favorite_movie_ids(current_user.id, movie_ids) if movie_ids else []
+    return {"favorite_ids": favorite_ids}
 
 
 @router.post("/favorites/{movie_id}", tags=["Favorites"])
 async def add_to_favorites(
     movie_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Добавить фильм в избранное
     """
     # Проверяем фильм
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
+    movie = await db.get(Movie, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Фильм не найден")
     
     # Проверяем, что не добавлено уже
-    existing = db.query(Favorite).filter(
-        Favorite.user_id == current_user.id,
-        Favorite.movie_id == movie_id
-    ).first()
+    existing = await find_favorite(db, current_user.id, movie_id)
     
     if existing:
         raise HTTPException(status_code=400, detail="Фильм уже в избранном")
     
     favorite = Favorite(user_id=current_user.id, movie_id=movie_id)
     db.add(favorite)
-    db.commit()
-    db.refresh(favorite)
+    # Счетчик избранного в movie_stats меняется в той же транзакции
+    try:
+        await db.flush()
+    except IntegrityError:
+        # Параллельный запрос успел добавить тот же фильм
+        # (уникальный индекс ux_favorites_user_id_movie_id)
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Фильм уже в избранном")
+    await MovieStatRepository(db).apply_favorite(movie_id, 1)
+    await db.commit()
+    on_favorite_changed(current_user.id, movie_id)
+    engagement_recorder.add(movie_id, "favorite")
     
     return {"status": "added", "movie_id": movie_id}
 
@@ -321,22 +379,22 @@ async def add_to_favorites(
 @router.delete("/favorites/{movie_id}", tags=["Favorites"])
 async def remove_from_favorites(
     movie_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Удалить фильм из избранного
     """
-    favorite = db.query(Favorite).filter(
-        Favorite.user_id == current_user.id,
-        Favorite.movie_id == movie_id
-    ).first()
+    favorite = await find_favorite(db, current_user.id, movie_id)
     
     if not favorite:
         raise HTTPException(status_code=404, detail="Фильм не в избранном")
     
-    db.delete(favorite)
-    db.commit()
+    await db.delete(favorite)
+    await db.flush()
+    await MovieStatRepository(db).apply_favorite(movie_id, -1)
+    await db.commit()
+    on_favorite_changed(current_user.id, movie_id)
     
     return {"status": "removed", "movie_id": movie_id}
 
@@ -344,86 +402,102 @@ async def remove_from_favorites(
 @router.get("/favorites/check/{movie_id}", tags=["Favorites"])
 async def check_favorite(
     movie_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Проверить, есть ли фильм в избранном
     """
-    favorite = db.query(Favorite).filter(
-        Favorite.user_id == current_user.id,
-        Favorite.movie_id == movie_id
-    ).first()
+    favorite = await find_favorite(db, current_user.id, movie_id)
     
     return {"is_favorite": favorite is not None}
 
 
+async def find_favorite(db: AsyncSession, user_id: int, movie_id: int) -> Optional[Favorite]:
+    result = await db.execute(
+        select(Favorite).where(Favorite.user_id == user_id, Favorite.movie_id == movie_id)
+    )
+    return result.scalars().first()
+
+
 # ============================================================================
 # НАВИГАЦИОННЫЕ ЭНДПОИНТЫ
 # ============================================================================
 
 @router.get("/search", tags=["Search"])
-async def search_movies(q: str, db: Session = Depends(get_db)):
+async def search_movies(
+    q: str,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Поиск фильмов по названию
+    Полнотекстовый поиск по названию, описанию и жанру (по релевантности).
+    Слова ищутся по префиксу, поэтому эндпоинт подходит для подсказок при наборе.
     """
     if not q or len(q) < 2:
-        return []
+        return {"items": [], "next_cursor": None}
     
-    movies = db.query(Movie).filter(
-        Movie.title.ilike(f"%{q}%")
-    ).limit(20).all()
-    
-    result = []
-    for movie in movies:
-        picks = db.query(Pick.name).join(
-            MoviePick, MoviePick.pick_id == Pick.id
-        ).filter(
-            MoviePick.movie_id == movie.id
-        ).all()
-        
-        result.append({
-            "id": movie.id,
-            "title": movie.title,
-            "year": movie.year,
-            "genre": movie.genre,
-            "rating": movie.rating,
-            "poster_url": movie.poster_url,
-            "picks": [p[0] for p in picks]
-        })
-    
-    return result
+    return await page_response(lambda: CatalogRepository(db).search(q, limit, cursor=cursor))
 
 
 @router.get("/genres", tags=["Metadata"])
-async def get_genres(db: Session = Depends(get_db)):
+async def get_genres(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Получить список всех жанров
     """
-    movies = db.query(Movie.genre).distinct().all()
-    genres = set()
-    
-    for (genre_str,) in movies:
-        if genre_str:
-            if ',' in genre_str:
-                genres.update([g.strip() for g in genre_str.split(',')])
-            else:
-                genres.add(genre_str.strip())
-    
-    return sorted(list(genres))
+    return await cached_json(request, ("genres",), lambda: db.run_sync(list_genre_names))
 
 
 @router.get("/stats", tags=["Metadata"])
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Получить общую статистику
     """
-    movies_count = db.query(Movie).count()
-    reviews_count = db.query(Review).count()
-    users_count = db.query(User).count()
-    
+    async def load_stats():
+        # Счетчики ведут триггеры (app.database.counters), COUNT(*) не нужен
+        counters = await db.run_sync(lambda session: read_counters(session.connection()))
+        return {
+            "total_movies": counters["movies"],
+            "total_reviews": counters["reviews"],
+            "total_users": counters["users"],
+            "total_favorites": counters["favorites"]
+        }
+    
+    return await cached_json(request, ("stats",), load_stats)
+
+
+@router.get("/trending", tags=["Metadata"])
+async def get_trending(
+    request: Request,
+    window: str = "24h",
+    metric: str = Query("views", pattern="^(views|favorites|reviews)$"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Популярное за окно: 24h (часы), 7d (дни) или 3m (месяцы) по просмотрам,
+    избранному или отзывам. Читаются только корзины и свертки аналитики.
+    """
+    try:
+        parse_window(window)
+    except InvalidWindowError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return await cached_json(
+        request,
+        ("trending", window, metric, limit),
+        lambda: trending(db, window, metric, limit, utcnow()),
+    )
+
+
+@router.get("/metrics", tags=["Metadata"])
+async def get_metrics():
+    """
+    Счетчики внутренних кэшей и пулов процесса
+    """
     return {
-        "total_movies": movies_count,
-        "total_reviews": reviews_count,
-        "total_users": users_count
+        "catalog_cache": catalog_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "password_pool": password_pool.stats(),
     }
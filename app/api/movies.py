@@ -6,6 +6,7 @@ from typing import List, Optional
 from app.database.database import get_db
 from app.models import Movie, Pick, MoviePick
 from app.models.users import User
+from app.repositories.genres import list_genre_names, movie_ids_with_genre
 from app.schemas import MovieResponse, MovieDetailResponse, MovieCreate
 from app.services.auth import get_current_user
 
@@ -23,7 +24,7 @@ async def get_movies(
     query = db.query(Movie)
     
     if genre and genre != "all":
-        query = query.filter(Movie.genre.contains(genre))
+        query = query.filter(Movie.id.in_(movie_ids_with_genre(genre)))
     
     if rating_min:
         query = query.filter(Movie.rating >= rating_min)
@@ -107,15 +108,4 @@ async def create_movie(
 @router.get("/genres/list")
 async def get_genres_list(db: Session = Depends(get_db)):
     """Получить список всех жанров"""
-    movies = db.query(Movie).all()
-    genres = set()
-    
-    for movie in movies:
-        if movie.genre:
-            # Разделяем жанры по запятым
-            movie_genres = [g.strip() for g in movie.genre.split(",")]
-            for genre in movie_genres:
-                if genre:
-                    genres.add(genre)
-    
-    return {"genres": sorted(list(genres))}
\ No newline at end of file
+    return {"genres": list_genre_names(db)}
\ No newline at end of file
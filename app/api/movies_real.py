@@ -9,6 +9,7 @@ from app.database.database import get_db
 from app.models.movies import Movie
 from app.models.picks import Pick
 from app.models.movie_picks import MoviePick
+from app.repositories.genres import movie_ids_with_genre
 
 router = APIRouter()
 
@@ -45,7 +46,7 @@ def get_movies(
     
     # Применяем фильтры
     if genre and genre != 'all':
-        query = query.filter(Movie.genre.contains(genre))
+        query = query.filter(Movie.id.in_(movie_ids_with_genre(genre)))
     
     if year:
         query = query.filter(Movie.year == year)
@@ -93,9 +93,6 @@ async def update_review(
             detail="Рецензия не найдена"
         )
     
-    # Обновляем средний рейтинг фильма
-    await ReviewService(db).update_movie_rating(review.movie_id)
-    
     return updated_review
 
 @router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -114,9 +111,7 @@ async def delete_review(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Рецензия не найдена"
         )
-    
-    movie_id = review.movie_id
-    
+
     deleted = await ReviewService(db).delete_review(review_id)
     if not deleted:
         raise HTTPException(
@@ -124,9 +119,6 @@ async def delete_review(
             detail="Рецензия не найдена"
         )
     
-    # Обновляем средний рейтинг фильма
-    await ReviewService(db).update_movie_rating(movie_id)
-    
     return None
 
 # Добавим отдельный endpoint для удаления рецензий в контексте фильма
@@ -169,7 +161,4 @@ async def delete_movie_review(
             detail="Рецензия не найдена"
         )
     
-    # Обновляем средний рейтинг фильма
-    await ReviewService(db).update_movie_rating(movie_id)
-    
     return None
\ No newline at end of file
@@ -1,29 +1,67 @@
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.users import User
-from app.database.database import get_db
+from app.database.database import get_async_db
 from app.api.dependencies import get_current_user
+from app.repositories.catalog_cache import on_user_changed
+from app.repositories.user_cache import UserSnapshot
+from app.schemas.users import UserImportRecord
+from app.services.user_import import UserImporter, password_hasher
+from app.utils.config import settings
 
 router = APIRouter()
 
 @router.get("/me")
-def read_users_me(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def read_users_me(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Получить информацию о текущем пользователе"""
-    if not current_user:
+    # Снимок из кэша не содержит профиль целиком, поэтому читаем запись
+    user = await db.get(User, current_user.id) if current_user else None
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="u041dеобходима авторизация"
         )
     
     return {
-        "id": current_user.id,
-        "username": current_user.username,
-        "email": current_user.email,
-        "is_active": current_user.is_active,
-        "is_superuser": current_user.is_superuser,
-        "created_at": current_user.created_at.isoformat() if current_user.created_at else None
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "created_at": user.created_at.isoformat() if user.created_at else None
     }
+
+
+@router.post("/import")
+async def import_users(
+    users: List[UserImportRecord],
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Массовый импорт пользователей (только админ).
+    Пароли хешируются bcrypt в пуле процессов, пользователи с занятым
+    username пропускаются. Возвращает отчет с числом добавленных и
+    скоростью хеширования.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Только администратор может импортировать пользователей"
+        )
+    if len(users) > settings.USER_IMPORT_MAX_USERS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Не больше {settings.USER_IMPORT_MAX_USERS} пользователей за запрос"
+        )
+    
+    # Пул процессов общий и живет все время работы приложения (lifespan)
+    report = await UserImporter(password_hasher).run_async(db, users)
+    on_user_changed()
+    return report.as_dict()
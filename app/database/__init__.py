@@ -1,10 +1,13 @@
 # app/database/__init__.py
 from .base import Base
-from .database import engine, SessionLocal, get_db
+from .database import engine, SessionLocal, get_db, async_engine, AsyncSessionLocal, get_async_db
 
 __all__ = [
     'Base',
     'engine', 
     'SessionLocal',
-    'get_db'
+    'get_db',
+    'async_engine',
+    'AsyncSessionLocal',
+    'get_async_db',
 ]
\ No newline at end of file
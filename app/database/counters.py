@@ -0,0 +1,104 @@
+# app/database/counters.py
+"""Счетчики строк основных таблиц для GET /stats.
+
+COUNT(*) в SQLite — полный проход по таблице или индексу, и /stats
+дорожал вместе с данными. Теперь число строк movies, reviews, users и
+favorites хранится в таблице counters (name -> value), а поддерживают ее
+триггеры AFTER INSERT/DELETE: счетчик меняется в той же транзакции, что
+и строка, при любом пути записи (API, загрузчики, скрипты, сырой SQL).
+
+Триггеры не видят INSERT OR REPLACE (удаление заменяемой строки без
+recursive_triggers) и изменения при снятых триггерах. Такие расхождения
+исправляет reconcile_counters — периодически в приложении и скриптом
+app/scripts/reconcile_counters.py.
+"""
+import json
+from typing import Dict, Tuple
+
+from sqlalchemy import text
+
+COUNTERS_TABLE = "counters"
+COUNTED_TABLES = ("movies", "reviews", "users", "favorites")
+
+
+def _counter_triggers(table: str) -> list:
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS counters_{table}_ai AFTER INSERT ON {table} BEGIN
+            UPDATE counters SET value = value + 1 WHERE name = '{table}';
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS counters_{table}_ad AFTER DELETE ON {table} BEGIN
+            UPDATE counters SET value = value - 1 WHERE name = '{table}';
+        END
+        """,
+    ]
+
+
+COUNTERS_DDL = [statement for table in COUNTED_TABLES for statement in _counter_triggers(table)]
+
+
+def _existing_tables(connection) -> set:
+    rows = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))
+    return {name for name, in rows}
+
+
+def create_counter_triggers(target, connection, **kw) -> None:
+    """Обработчик after_create для метаданных: триггеры на уже созданных
+    таблицах и первичный подсчет"""
+    if connection.dialect.name != "sqlite":
+        return
+    tables = _existing_tables(connection)
+    if COUNTERS_TABLE not in tables:
+        return
+    for table in COUNTED_TABLES:
+        if table in tables:
+            for statement in _counter_triggers(table):
+                connection.execute(text(statement))
+    reconcile_counters(connection)
+
+
+def drop_counter_triggers(target, connection, **kw) -> None:
+    """Обработчик before_drop: триггеры удаляются вместе с таблицами"""
+    if connection.dialect.name != "sqlite":
+        return
+    for table in COUNTED_TABLES:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS counters_{table}_ai"))
+        connection.execute(text(f"DROP TRIGGER IF EXISTS counters_{table}_ad"))
+
+
+def reconcile_counters(connection) -> Dict[str, Tuple[int, int]]:
+    """Сверить счетчики с COUNT(*) и исправить расхождения; возвращает
+    {name: (было, стало)} для исправленных. Транзакцию не фиксирует.
+
+    Подсчет и запись идут в одной транзакции: если между ними другой
+    процесс изменил таблицы, SQLite отклонит запись (SQLITE_BUSY), и
+    сверка повторится при следующем запуске.
+    """
+    tables = _existing_tables(connection)
+    actual = {
+        table: connection.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        for table in COUNTED_TABLES
+        if table in tables
+    }
+    stored = dict(connection.execute(text("SELECT name, value FROM counters")).all())
+    drift = {name: (stored.get(name), value) for name, value in actual.items() if stored.get(name) != value}
+    if drift:
+        connection.execute(
+            text(
+                "INSERT INTO counters (name, value) VALUES (:name, :value) "
+                "ON CONFLICT (name) DO UPDATE SET value = excluded.value"
+            ),
+            [{"name": name, "value": value} for name, (_, value) in drift.items()],
+        )
+    return drift
+
+
+def read_counters(connection) -> Dict[str, int]:
+    """Текущие счетчики одним чтением по первичному ключу counters"""
+    rows = connection.execute(
+        text("SELECT name, value FROM counters WHERE name IN (SELECT value FROM json_each(:names))"),
+        {"names": json.dumps(COUNTED_TABLES)},
+    )
+    return {table: 0 for table in COUNTED_TABLES} | dict(rows.all())
@@ -1,21 +1,45 @@
+from typing import AsyncGenerator
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.database.base import Base  # Импортируем Base из base.py
+from app.database.sqlite import apply_sqlite_profile, pool_options
+from app.utils.config import settings
 import os
 
-# Используем SQLite базу данных movies.db
-DATABASE_URL = "sqlite:///./movies.db"
+# SQLite база данных movies.db (путь из настроек, переопределяется DATABASE_URL)
+DATABASE_URL = settings.DATABASE_URL
+# Тот же файл через асинхронный драйвер aiosqlite (для API)
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
 
 # Создаем движок SQLAlchemy
 engine = create_engine(
     DATABASE_URL, 
     connect_args={"check_same_thread": False},  # Для SQLite
-    echo=False  # Показывать SQL запросы в консоли (поставьте True для отладки)
+    echo=False,  # Показывать SQL запросы в консоли (поставьте True для отладки)
+    **pool_options()
 )
 
+# Асинхронный движок: запросы выполняются в потоке aiosqlite и не блокируют event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **pool_options())
+
+# WAL, busy_timeout и прочие PRAGMA на каждом новом соединении
+apply_sqlite_profile(engine)
+apply_sqlite_profile(async_engine.sync_engine)
+
 # Создаем фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронная фабрика: после commit объекты не истекают, чтобы ответ
+# можно было собрать без повторной (ленивой) загрузки атрибутов
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 def get_db():
     """Зависимость для получения сессии базы данных"""
     db = SessionLocal()
@@ -24,6 +48,11 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Зависимость для получения асинхронной сессии базы данных"""
+    async with AsyncSessionLocal() as session:
+        yield session
+
 def init_db():
     """Инициализация базы данных"""
     Base.metadata.create_all(bind=engine)
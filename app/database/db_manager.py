@@ -7,14 +7,15 @@ from typing import AsyncGenerator
 # Добавляем корень проекта в PYTHONPATH для корректных импортов
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from .database import engine, Base, AsyncSessionLocal
+from .database import async_engine, Base, AsyncSessionLocal
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
 
 async def init_db():
     """Публичная функция для инициализации БД"""
     try:
-        async with engine.begin() as conn:
+        async with async_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         print("✅ Таблицы базы данных созданы")
         return True
@@ -29,7 +30,7 @@ async def create_tables():
 async def drop_tables():
     """Удаление всех таблиц (только для разработки!)"""
     try:
-        async with engine.begin() as conn:
+        async with async_engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
         print("⚠️ Все таблицы удалены")
         return True
@@ -97,8 +98,8 @@ if __name__ == "__main__":
                 await reset_db()
         elif args.check:
             try:
-                async with engine.connect() as conn:
-                    await conn.execute("SELECT 1")
+                async with async_engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
                 print("✅ Соединение с БД установлено")
             except Exception as e:
                 print(f"❌ Ошибка соединения с БД: {e}")
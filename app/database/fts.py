@@ -0,0 +1,149 @@
+# app/database/fts.py
+"""Полнотекстовый индекс каталога на SQLite FTS5.
+
+movies_fts — contentless таблица (content='') над movies (title, overview,
+genre): текст хранится только в movies, индекс синхронизируют триггеры,
+поэтому любой путь записи (API, загрузчики, сырой SQL) держит его
+актуальным. Токенизатор unicode61 приводит к нижнему регистру и
+кириллицу; "ё" заменяется на "е" и при индексации, и в запросе.
+Префиксные индексы на 2-3 символа ускоряют поиск по мере набора.
+"""
+import json
+import logging
+import re
+from contextlib import contextmanager
+from typing import List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+MOVIES_FTS_TABLE = "movies_fts"
+
+def _normalized(column: str) -> str:
+    """SQL-выражение нормализации текста перед индексацией: ё -> е
+    (unicode61 снимает диакритику только с латиницы)"""
+    return f"replace(replace(coalesce({column}, ''), 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _indexed_values(prefix: str) -> str:
+    return ", ".join(_normalized(f"{prefix}.{column}") for column in ("title", "overview", "genre"))
+
+
+MOVIES_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, overview, genre,
+        content='',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, overview, genre)
+        VALUES (new.id, {_indexed_values("new")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview, genre)
+        VALUES ('delete', old.id, {_indexed_values("old")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF title, overview, genre ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview, genre)
+        VALUES ('delete', old.id, {_indexed_values("old")});
+        INSERT INTO movies_fts(rowid, title, overview, genre)
+        VALUES (new.id, {_indexed_values("new")});
+    END
+    """,
+]
+
+MOVIES_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS movies_fts_au",
+    "DROP TRIGGER IF EXISTS movies_fts_ad",
+    "DROP TRIGGER IF EXISTS movies_fts_ai",
+    "DROP TABLE IF EXISTS movies_fts",
+]
+
+# Веса колонок для bm25: совпадение в названии важнее описания
+BM25_WEIGHTS = (10.0, 1.0, 3.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def create_movie_search_index(target, connection, **kw) -> None:
+    """Обработчик after_create для таблицы movies: индекс, триггеры и
+    первичное заполнение. Без FTS5 поиск работает через LIKE."""
+    if connection.dialect.name != "sqlite":
+        return
+    try:
+        for statement in MOVIES_FTS_DDL:
+            connection.execute(text(statement))
+        rebuild_movie_search_index(connection)
+    except OperationalError as e:
+        logger.warning(f"FTS5 недоступен, поиск будет работать через LIKE: {e}")
+
+
+def drop_movie_search_index(target, connection, **kw) -> None:
+    """Обработчик before_drop: индекс удаляется вместе с movies"""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in MOVIES_FTS_DROP:
+        connection.execute(text(statement))
+
+
+def rebuild_movie_search_index(connection) -> None:
+    """Перестроить индекс по текущему содержимому movies"""
+    connection.execute(text("INSERT INTO movies_fts(movies_fts) VALUES ('delete-all')"))
+    connection.execute(text(
+        "INSERT INTO movies_fts(rowid, title, overview, genre) "
+        f"SELECT movies.id, {_indexed_values('movies')} FROM movies"
+    ))
+
+
+@contextmanager
+def bulk_movie_search_indexing(connection):
+    """Для пакетной загрузки внутри транзакции: построчный триггер
+    вставки снимается, а новые фильмы индексируются одним запросом
+    на пачку через возвращаемую функцию index(ids). DDL в SQLite
+    транзакционен, поэтому при откате триггер вернется сам."""
+    if not has_movie_search_index(connection):
+        yield lambda movie_ids: None
+        return
+
+    def index(movie_ids: Sequence[int]) -> None:
+        connection.execute(
+            text(
+                "INSERT INTO movies_fts(rowid, title, overview, genre) "
+                f"SELECT movies.id, {_indexed_values('movies')} FROM movies "
+                "WHERE movies.id IN (SELECT value FROM json_each(:ids))"
+            ),
+            {"ids": json.dumps(list(movie_ids))},
+        )
+
+    connection.execute(text("DROP TRIGGER IF EXISTS movies_fts_ai"))
+    try:
+        yield index
+    finally:
+        connection.execute(text(MOVIES_FTS_DDL[1]))
+
+
+def has_movie_search_index(connection) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": MOVIES_FTS_TABLE},
+    ).first() is not None
+
+
+def build_match_query(query: str) -> str:
+    """Пользовательский ввод -> выражение MATCH.
+
+    Каждое слово берется в кавычки (операторы FTS5 в запросе не
+    интерпретируются) и ищется по префиксу; слова объединяются через AND.
+    """
+    tokens: List[str] = _TOKEN_RE.findall(query.replace("ё", "е").replace("Ё", "Е"))
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,189 @@
+# app/database/snapshots.py
+"""Шаблонные снимки заполненной БД для быстрого сброса.
+
+Шаблон — файл SQLite со схемой и начальными данными, собранный один раз:
+create_all, отметка alembic head, заполнение, пересчет производных таблиц
+(индекс жанров, агрегаты movie_stats) и VACUUM. Имя файла содержит
+ключ — sha256 от версии сборки, alembic head, DDL моделей и данных
+заполнения, поэтому после изменения схемы или данных шаблон
+пересобирается сам.
+
+Сброс БД копирует шаблон онлайн-API резервного копирования SQLite
+(sqlite3.Connection.backup) — это работает и при открытых соединениях
+приложения. Для тестов шаблон копируется в БД в памяти: на каждый тест
+своя копия за миллисекунды вместо пересоздания схемы и заполнения.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.database.base import Base
+from app.database.counters import COUNTERS_DDL
+from app.database.fts import MOVIES_FTS_DDL
+from app.repositories.genres import rebuild_genre_index
+from app.repositories.movie_stats import rebuild_stat_aggregates
+from app.utils.config import BASE_DIR, settings
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = BASE_DIR / "alembic.ini"
+
+# Входит в ключ шаблона: увеличивается при изменении порядка сборки, чтобы
+# шаблоны, собранные прежним кодом, пересобрались
+BUILD_VERSION = 2
+
+
+def _script_directory():
+    # alembic импортируется только при сборке шаблона
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(BASE_DIR / "migrations"))
+    return ScriptDirectory.from_config(config)
+
+
+def alembic_heads() -> list:
+    return sorted(_script_directory().get_heads())
+
+
+def schema_fingerprint() -> str:
+    """alembic head и DDL всех таблиц, индексов и триггеров моделей"""
+    import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+
+    dialect = sqlite.dialect()
+    ddl = [*alembic_heads(), *MOVIES_FTS_DDL, *COUNTERS_DDL]
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        indexes = sorted(table.indexes, key=lambda index: index.name)
+        ddl.extend(str(CreateIndex(index).compile(dialect=dialect)) for index in indexes)
+    return hashlib.sha256("\n".join(ddl).encode("utf-8")).hexdigest()
+
+
+def _stamp_head(connection: Connection) -> None:
+    """Отметить схему как актуальную для alembic (create_all миграции не
+    выполняет)"""
+    from alembic.runtime.migration import MigrationContext
+
+    MigrationContext.configure(connection).stamp(_script_directory(), "heads")
+
+
+def refresh_derived_tables(connection: Connection) -> None:
+    """Производные таблицы по заполненным данным: seed пишет только
+    исходные (фильмы, отзывы, избранное)"""
+    rebuild_genre_index(connection)
+    rebuild_stat_aggregates(connection)
+
+
+def copy_database(source: sqlite3.Connection, target: sqlite3.Connection) -> None:
+    """Скопировать БД целиком онлайн-API резервного копирования"""
+    source.backup(target)
+
+
+@dataclass
+class DatabaseTemplate:
+    """Шаблон БД name: seed заполняет пустую схему через соединение в
+    открытой транзакции, seed_data возвращает данные заполнения (любой
+    JSON-сериализуемый объект) и входит в ключ шаблона."""
+    name: str
+    seed: Callable[[Connection], None]
+    seed_data: Callable[[], Any]
+    directory: Optional[Path] = None
+
+    def __post_init__(self):
+        self.directory = Path(self.directory or settings.DB_TEMPLATES_DIR)
+        self._key: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            payload = json.dumps(self.seed_data(), sort_keys=True, ensure_ascii=False, default=str)
+            fingerprint = f"{BUILD_VERSION}\n{schema_fingerprint()}\n{payload}"
+            self._key = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        return self._key
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{self.name}-{self.key[:16]}.db"
+
+    # ==================== СБОРКА ====================
+
+    def build(self, force: bool = False) -> Path:
+        """Собрать шаблон, если его нет (или force); вернуть путь к файлу"""
+        path = self.path
+        if path.exists() and not force:
+            return path
+
+        started = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Сборка во временный файл и атомарная замена: параллельный
+        # процесс не увидит недособранный шаблон
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.name}-", suffix=".db", dir=self.directory)
+        os.close(fd)
+        try:
+            engine = create_engine(f"sqlite:///{tmp_name}")
+            try:
+                Base.metadata.create_all(engine)
+                with engine.begin() as conn:
+                    _stamp_head(conn)
+                    self.seed(conn)
+                    refresh_derived_tables(conn)
+                with engine.connect() as conn:
+                    conn.exec_driver_sql("VACUUM")
+            finally:
+                engine.dispose()
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        # Шаблоны с устаревшим ключом больше не нужны
+        for stale in self.directory.glob(f"{self.name}-*.db"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        logger.info(f"Шаблон БД {path.name} собран за {time.perf_counter() - started:.2f} с")
+        return path
+
+    # ==================== ВОССТАНОВЛЕНИЕ ====================
+
+    def _open(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"{self.build().as_uri()}?mode=ro", uri=True)
+
+    def restore(self, target: Union[str, Path]) -> None:
+        """Заменить содержимое файла БД target содержимым шаблона"""
+        source = self._open()
+        destination = sqlite3.connect(str(target))
+        try:
+            copy_database(source, destination)
+        finally:
+            destination.close()
+            source.close()
+
+    def clone_in_memory(self) -> sqlite3.Connection:
+        """Копия шаблона в памяти (соединение можно передавать между потоками)"""
+        source = self._open()
+        clone = sqlite3.connect(":memory:", check_same_thread=False)
+        try:
+            copy_database(source, clone)
+        finally:
+            source.close()
+        return clone
+
+    def memory_engine(self) -> Engine:
+        """Движок SQLAlchemy над собственной копией шаблона в памяти"""
+        clone = self.clone_in_memory()
+        return create_engine("sqlite://", creator=lambda: clone, poolclass=StaticPool)
@@ -6,6 +6,12 @@ from .reviews import Review
 from .picks import Pick
 from .movie_picks import MoviePick
 from .roles import Role
+from .favorites import Favorite
+from .genres import Genre, MovieGenre
+from .movie_stats import MovieStat
+from .imports import ImportCheckpoint, ImportRecordHash
+from .counters import Counter
+from .engagement import EngagementEvent, EngagementHourly, EngagementDaily, EngagementMonthly
 
 __all__ = [
     "Base",
@@ -15,4 +21,15 @@ __all__ = [
     "Pick",
     "MoviePick",
     "Role",
+    "Favorite",
+    "Genre",
+    "MovieGenre",
+    "MovieStat",
+    "ImportCheckpoint",
+    "ImportRecordHash",
+    "Counter",
+    "EngagementEvent",
+    "EngagementHourly",
+    "EngagementDaily",
+    "EngagementMonthly",
 ]
\ No newline at end of file
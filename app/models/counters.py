@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, event
+from app.database.base import Base
+from app.database.counters import create_counter_triggers, drop_counter_triggers
+
+class Counter(Base):
+    """Число строк таблицы (name — имя таблицы), ведется триггерами
+    (app.database.counters)"""
+    __tablename__ = "counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<Counter(name='{self.name}', value={self.value})>"
+
+# Триггеры ссылаются на другие таблицы, поэтому создаются после всех
+event.listen(Base.metadata, "after_create", create_counter_triggers)
+event.listen(Base.metadata, "before_drop", drop_counter_triggers)
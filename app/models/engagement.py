@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String
+from app.database.base import Base
+
+class EngagementEvent(Base):
+    """Журнал действий с фильмом (только добавление). Одна строка — пачка
+    одинаковых действий за час, записанная при сбросе буфера
+    (app.services.engagement); старые строки удаляются при уплотнении."""
+    __tablename__ = "engagement_events"
+
+    id = Column(Integer, primary_key=True)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # view, favorite, review
+    count = Column(Integer, nullable=False, default=1)
+    occurred_at = Column(DateTime, nullable=False, index=True)  # начало часа, UTC
+
+    def __repr__(self):
+        return f"<EngagementEvent(movie_id={self.movie_id}, kind='{self.kind}', count={self.count})>"
+
+class _EngagementTotals:
+    views = Column(Integer, nullable=False, default=0)
+    favorites = Column(Integer, nullable=False, default=0)
+    reviews = Column(Integer, nullable=False, default=0)
+
+class EngagementHourly(_EngagementTotals, Base):
+    """Действия с фильмом по часам; ведется при сбросе буфера событий.
+    Первичный ключ начинается с bucket: окна «за последние N часов» —
+    диапазон по ключу."""
+    __tablename__ = "engagement_hourly"
+
+    bucket = Column(DateTime, primary_key=True)  # начало часа, UTC
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+
+class EngagementDaily(_EngagementTotals, Base):
+    """Свертка часовых корзин по дням (фоновая задача)"""
+    __tablename__ = "engagement_daily"
+
+    day = Column(Date, primary_key=True)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+
+class EngagementMonthly(_EngagementTotals, Base):
+    """Свертка дневных корзин по месяцам (month — первое число месяца)"""
+    __tablename__ = "engagement_monthly"
+
+    month = Column(Date, primary_key=True)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
 class Favorite(Base):
     __tablename__ = "favorites"
+    __table_args__ = (
+        Index("ix_favorites_user_id_created_at", "user_id", "created_at"),
+        # Фильм в избранном пользователя не больше одного раза; индекс же
+        # отвечает на проверку «в избранном ли» и покрывает поиск по user_id
+        Index("ux_favorites_user_id_movie_id", "user_id", "movie_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+from app.database.base import Base
+
+class Genre(Base):
+    """Справочник жанров, поддерживается при записи фильмов"""
+    __tablename__ = "genres"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, unique=True, index=True)
+    
+    # Отношения
+    movies = relationship("MovieGenre", back_populates="genre", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<Genre(id={self.id}, name='{self.name}')>"
+
+class MovieGenre(Base):
+    """Связь фильм-жанр: первичный ключ (genre_id, movie_id) служит индексом фильтра по жанру"""
+    __tablename__ = "movie_genres"
+    
+    genre_id = Column(Integer, ForeignKey("genres.id"), primary_key=True)
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True, index=True)
+    
+    # Отношения
+    genre = relationship("Genre", back_populates="movies")
+    movie = relationship("Movie", back_populates="genres")
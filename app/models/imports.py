@@ -0,0 +1,35 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+class ImportCheckpoint(Base):
+    """Позиция импорта файла каталога после последней зафиксированной пачки.
+
+    position — смещение в байтах (JSONL) или число прочитанных строк
+    данных (CSV); prefix_hash — sha256 прочитанной части файла, по нему
+    при возобновлении проверяется, что начало файла не изменилось.
+    """
+    __tablename__ = "import_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False, unique=True, index=True)
+    format = Column(String, nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    line = Column(Integer, nullable=False, default=0)
+    prefix_hash = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="running")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<ImportCheckpoint(source='{self.source}', position={self.position}, status='{self.status}')>"
+
+class ImportRecordHash(Base):
+    """Хэш содержимого последней импортированной версии записи каталога.
+
+    record_key — "id:<id>" или "key:<natural_key>" для записей без id.
+    """
+    __tablename__ = "import_record_hashes"
+
+    record_key = Column(String, primary_key=True)
+    content_hash = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
 class MoviePick(Base):
     __tablename__ = "movie_picks"
+    __table_args__ = (
+        # Первичный ключ (movie_id, pick_id) ищет подборки фильма; фильмы
+        # подборки (фильтр каталога по pick) ищутся по этому индексу
+        Index("ix_movie_picks_pick_id_movie_id", "pick_id", "movie_id"),
+    )
     
     movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
     pick_id = Column(Integer, ForeignKey("picks.id"), primary_key=True)
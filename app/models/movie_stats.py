@@ -9,9 +9,12 @@ class MovieStat(Base):
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), unique=True, nullable=False)
     views_count = Column(Integer, default=0)
+    # Агрегаты оценок ведутся приращениями при записи отзывов:
+    # average_rating = rating_sum / reviews_count
     average_rating = Column(Float, default=0.0)
+    rating_sum = Column(Float, default=0.0, server_default="0")
     reviews_count = Column(Integer, default=0)
-    favorites_count = Column(Integer, default=0)  # Количество добавлений в избранное
+    favorites_count = Column(Integer, default=0)  # Ведется приращениями при записи избранного
     picks_count = Column(Integer, default=0)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -1,10 +1,36 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Float, Text, DateTime, Boolean
+from sqlalchemy import Column, ForeignKey, Integer, String, Float, Text, DateTime, Boolean, Index, event, func, inspect, literal_column, select
 from datetime import datetime
+import re
 from sqlalchemy.orm import relationship
 from app.database.base import Base  # Импортируем Base из base.py
+from app.database.fts import create_movie_search_index, drop_movie_search_index
+
+_SPACES_RE = re.compile(r"\s+")
+
+def movie_natural_key(title, year):
+    """Естественный ключ фильма: название без регистра, "ё" и лишних
+    пробелов плюс год ("побег из шоушенка|1994")"""
+    normalized = _SPACES_RE.sub(" ", (title or "").strip().lower().replace("ё", "е"))
+    return f"{normalized}|{year if year is not None else ''}"
+
+def updated_natural_key(stored, movie_id, title, year):
+    """Ключ после смены названия или года. Дубли, существовавшие до
+    уникального индекса, хранят ключ с суффиксом "#<id>" (миграция
+    d6f8a0b2c4e5); пока нормализованные название и год те же, суффикс
+    сохраняется, иначе обновление упрется в уникальный индекс"""
+    key = movie_natural_key(title, year)
+    return stored if stored == f"{key}#{movie_id}" else key
+
+def _natural_key_default(context):
+    params = context.get_current_parameters()
+    return movie_natural_key(params.get("title"), params.get("year"))
 
 class Movie(Base):
     __tablename__ = "movies"
+    __table_args__ = (
+        # Цель ON CONFLICT при идемпотентной загрузке (app.repositories.upserts)
+        Index("ux_movies_natural_key", "natural_key", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -15,12 +41,54 @@ class Movie(Base):
     poster_url = Column(String)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Нормализованные название и год (movie_natural_key), заполняется автоматически
+    natural_key = Column(String, nullable=False, default=_natural_key_default)
     
     # Отношения
     creator = relationship("User", foreign_keys=[created_by])
     reviews = relationship("Review", back_populates="movie", cascade="all, delete-orphan")
     favorites = relationship("Favorite", back_populates="movie", cascade="all, delete-orphan")
     picks = relationship("MoviePick", back_populates="movie", cascade="all, delete-orphan")
+    genres = relationship("MovieGenre", back_populates="movie", cascade="all, delete-orphan")
+    stat = relationship("MovieStat", back_populates="movie", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Movie(id={self.id}, title='{self.title}')>"
+
+# Рейтинг в порядке выдачи каталога: NULL считается нулем, иначе сравнение
+# ключа курсора с NULL теряло бы такие фильмы. 0.0 — литерал, а не параметр:
+# только так SQLite сопоставляет выражение запроса с индексом
+SORT_RATING = func.coalesce(Movie.rating, literal_column("0.0"))
+
+# Порядок выдачи каталога и keyset-пагинация (rowid = id неявно в конце индекса)
+Index("ix_movies_sort_rating_created_at", SORT_RATING, Movie.created_at)
+
+@event.listens_for(Movie, "before_update")
+def _refresh_natural_key(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.title.history.has_changes() or state.attrs.year.history.has_changes()):
+        return
+    stored = connection.scalar(select(Movie.natural_key).where(Movie.id == target.id))
+    target.natural_key = updated_natural_key(stored, target.id, target.title, target.year)
+
+# Индекс жанров (movie_genres) следует за Movie.genre при любой записи через
+# ORM; пакетные загрузчики и upsert (Core) обновляют его сами. Триггером это
+# не сделать: разбор строки жанров в SQLite требует WITH, а он в триггерах
+# запрещен
+def _index_genres(connection, target):
+    # Импорт здесь: app.repositories.genres сам импортирует модели
+    from app.repositories.genres import set_movie_genres
+    set_movie_genres(connection, target.id, target.genre)
+
+@event.listens_for(Movie, "after_insert")
+def _index_genres_on_insert(mapper, connection, target):
+    _index_genres(connection, target)
+
+@event.listens_for(Movie, "after_update")
+def _index_genres_on_update(mapper, connection, target):
+    if inspect(target).attrs.genre.history.has_changes():
+        _index_genres(connection, target)
+
+# Полнотекстовый индекс movies_fts создается вместе с таблицей
+event.listen(Movie.__table__, "after_create", create_movie_search_index)
+event.listen(Movie.__table__, "before_drop", drop_movie_search_index)
@@ -1,9 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, func, desc, and_, or_
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Dict, Any, Type, TypeVar, Generic
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Type, TypeVar, Generic
 from app.database.database import Base
 from app.exceptions.base import NotFoundError
+from app.utils.pagination import keyset_paginate, split_page
 
 ModelType = TypeVar("ModelType", bound=Base) # type: ignore
 
@@ -51,6 +52,25 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db.execute(query)
         return result.scalars().all()
     
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        key: Sequence[str] = ("created_at", "id")
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset-аналог get_all: страница по курсору вместо OFFSET"""
+        query = select(self.model)
+        
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    query = query.where(getattr(self.model, field) == value)
+        
+        key_columns = [getattr(self.model, field) for field in key]
+        result = await self.db.execute(keyset_paginate(query, key_columns, cursor, limit))
+        return split_page(result.all(), limit, len(key_columns))
+    
     async def create(self, obj_in: Dict[str, Any]) -> ModelType:
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
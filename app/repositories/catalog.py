@@ -0,0 +1,218 @@
+# app/repositories/catalog.py
+"""Чтение каталога фильмов вместе с названиями подборок.
+
+Любая выборка фильмов обходится двумя запросами: сами фильмы и одна
+пакетная загрузка подборок для всех найденных фильмов (без N+1).
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.database.fts import BM25_WEIGHTS, build_match_query, has_movie_search_index
+from app.models.favorites import Favorite
+from app.models.movie_picks import MoviePick
+from app.models.movies import SORT_RATING, Movie
+from app.models.picks import Pick
+from app.repositories.genres import movie_ids_with_genre
+from app.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+    split_page,
+)
+
+# Сколько ID можно передать в IN (...) одним запросом.
+# Старые сборки SQLite ограничивают число параметров 999.
+IN_BATCH_SIZE = 900
+
+# Порядок выдачи каталога, он же ключ курсора (индекс ix_movies_sort_rating_created_at)
+MOVIE_PAGE_KEY = (SORT_RATING, Movie.created_at, Movie.id)
+FAVORITE_PAGE_KEY = (Favorite.created_at, Favorite.id)
+
+
+def movie_to_dict(movie: Movie, picks: List[str]) -> dict:
+    """Сериализация фильма в формат ответа API"""
+    return {
+        "id": movie.id,
+        "title": movie.title,
+        "overview": movie.overview,
+        "year": movie.year,
+        "genre": movie.genre,
+        "rating": movie.rating,
+        "poster_url": movie.poster_url,
+        "picks": picks,
+        "created_by": movie.created_by,
+    }
+
+
+class CatalogRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def fetch(self, stmt: Select) -> List[dict]:
+        """Выполнить выборку фильмов и приложить к ним подборки"""
+        movies = (await self.db.execute(stmt)).scalars().all()
+        return await self._with_picks(movies, stmt)
+
+    async def fetch_page(
+        self,
+        stmt: Select,
+        key_columns: Sequence,
+        cursor: Optional[str],
+        limit: int,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Страница выборки фильмов по курсору и курсор следующей страницы"""
+        rows = (await self.db.execute(keyset_paginate(stmt, key_columns, cursor, limit))).all()
+        movies, next_cursor = split_page(rows, limit, len(key_columns))
+        return await self._with_picks(movies, stmt), next_cursor
+
+    async def _with_picks(self, movies: Sequence[Movie], stmt: Select) -> List[dict]:
+        if not movies:
+            return []
+
+        if len(movies) <= IN_BATCH_SIZE:
+            movie_ids = [movie.id for movie in movies]
+        else:
+            # Для больших выборок не раздуваем список параметров,
+            # а передаем исходный запрос подзапросом
+            movie_ids = stmt.with_only_columns(Movie.id, maintain_column_froms=True)
+
+        picks = await self.get_pick_names(movie_ids)
+        return [movie_to_dict(movie, picks.get(movie.id, [])) for movie in movies]
+
+    async def get_pick_names(self, movie_ids: Sequence[int] | Select) -> Dict[int, List[str]]:
+        """Названия подборок для набора фильмов одним запросом"""
+        rows = (await self.db.execute(
+            select(MoviePick.movie_id, Pick.name)
+            .join(Pick, MoviePick.pick_id == Pick.id)
+            .where(MoviePick.movie_id.in_(movie_ids))
+            .order_by(MoviePick.movie_id, Pick.id)
+        )).all()
+
+        picks_by_movie: Dict[int, List[str]] = defaultdict(list)
+        for movie_id, pick_name in rows:
+            picks_by_movie[movie_id].append(pick_name)
+        return picks_by_movie
+
+    async def list_movies(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        pick: Optional[str] = None,
+        genre: Optional[str] = None,
+        min_rating: Optional[float] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Каталог по убыванию рейтинга, страницами по курсору"""
+        stmt = select(Movie)
+
+        if min_rating:
+            # То же выражение, что в ключе: условие идет диапазоном по индексу
+            stmt = stmt.where(SORT_RATING >= min_rating)
+
+        if pick and pick != "all":
+            stmt = stmt.where(
+                Movie.id.in_(
+                    select(MoviePick.movie_id)
+                    .join(Pick, MoviePick.pick_id == Pick.id)
+                    .where(Pick.slug == pick)
+                )
+            )
+
+        if genre and genre != "all":
+            stmt = stmt.where(Movie.id.in_(movie_ids_with_genre(genre)))
+
+        return await self.fetch_page(stmt, MOVIE_PAGE_KEY, cursor, limit)
+
+    async def get_movie(self, movie_id: int) -> Optional[dict]:
+        movies = await self.fetch(select(Movie).where(Movie.id == movie_id))
+        return movies[0] if movies else None
+
+    async def list_user_favorites(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Избранное пользователя, новые добавления первыми"""
+        stmt = (
+            select(Movie)
+            .join(Favorite, Favorite.movie_id == Movie.id)
+            .where(Favorite.user_id == user_id)
+        )
+        return await self.fetch_page(stmt, FAVORITE_PAGE_KEY, cursor, limit)
+
+    async def favorite_movie_ids(
+        self,
+        user_id: int,
+        movie_ids: Optional[Sequence[int]] = None,
+    ) -> List[int]:
+        """ID избранных фильмов пользователя (все или только из movie_ids)
+        одним запросом по уникальному индексу (user_id, movie_id)"""
+        stmt = select(Favorite.movie_id).where(Favorite.user_id == user_id)
+        if movie_ids is not None:
+            stmt = stmt.where(Favorite.movie_id.in_(movie_ids))
+        result = await self.db.execute(stmt.order_by(Favorite.movie_id))
+        return list(result.scalars())
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Полнотекстовый поиск по названию, описанию и жанру.
+
+        Результаты упорядочены по релевантности (bm25), поэтому курсор
+        хранит смещение: ранг зависит от запроса и не годится как ключ.
+        """
+        offset = 0
+        if cursor:
+            (offset,) = decode_cursor(cursor, 1)
+            if not isinstance(offset, int) or offset < 0:
+                raise InvalidCursorError("Некорректный курсор")
+
+        if await self.db.run_sync(lambda session: has_movie_search_index(session.connection())):
+            movie_ids = await self._match_ids(query, limit + 1, offset)
+        else:
+            movie_ids = await self._like_ids(query, limit + 1, offset)
+
+        next_cursor = encode_cursor([offset + limit]) if len(movie_ids) > limit else None
+        movie_ids = movie_ids[:limit]
+        if not movie_ids:
+            return [], next_cursor
+
+        movies = {
+            movie["id"]: movie
+            for movie in await self.fetch(select(Movie).where(Movie.id.in_(movie_ids)))
+        }
+        return [movies[movie_id] for movie_id in movie_ids if movie_id in movies], next_cursor
+
+    async def _match_ids(self, query: str, limit: int, offset: int) -> List[int]:
+        match = build_match_query(query)
+        if not match:
+            return []
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+        rows = await self.db.execute(
+            text(
+                "SELECT rowid FROM movies_fts WHERE movies_fts MATCH :match "
+                f"ORDER BY bm25(movies_fts, {weights}), rowid LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "limit": limit, "offset": offset},
+        )
+        return list(rows.scalars())
+
+    async def _like_ids(self, query: str, limit: int, offset: int) -> List[int]:
+        """Запасной вариант без FTS5: полный просмотр таблицы"""
+        pattern = f"%{query}%"
+        stmt = (
+            select(Movie.id)
+            .where(or_(Movie.title.ilike(pattern), Movie.overview.ilike(pattern), Movie.genre.ilike(pattern)))
+            .order_by(Movie.rating.desc(), Movie.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return list((await self.db.execute(stmt)).scalars())
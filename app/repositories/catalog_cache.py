@@ -0,0 +1,70 @@
+# app/repositories/catalog_cache.py
+"""Кэш чтения каталога и хуки его инвалидации.
+
+Каталог меняется только через эндпоинты записи и скрипты загрузки,
+поэтому чтения отдаются из памяти, а каждый эндпоинт записи вызывает
+соответствующий хук. Изменения, сделанные скриптами в обход API,
+становятся видны по истечении TTL.
+
+Те же хуки помечают фильмы для обновления рейтингов
+(app.repositories.leaderboards).
+
+Значения — готовые JSON-ответы с ETag (app.utils.http_cache.RenderedJSON).
+
+Пространства ключей:
+    ("movies", ...)            страницы каталога
+    ("movie", movie_id)        карточка фильма
+    ("reviews", movie_id, ...) страницы отзывов (movie_id=None — общая лента)
+    ("favorites", user_id, ...) страницы избранного пользователя
+    ("movie_stat", movie_id)   снимок статистики для счетчика просмотров
+    ("genres",), ("stats",)    метаданные
+"""
+from typing import Optional
+
+from app.repositories.leaderboards import leaderboards
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+
+catalog_cache = TTLCache(
+    max_size=settings.CACHE_MAX_SIZE,
+    default_ttl=settings.CACHE_TTL_SECONDS,
+)
+
+
+def on_movie_changed(movie_id: Optional[int] = None) -> None:
+    """Фильм создан или изменен: сбрасываем все, где он может фигурировать"""
+    catalog_cache.invalidate_prefix("movies")
+    catalog_cache.invalidate_prefix("favorites")
+    if movie_id is None:
+        catalog_cache.invalidate_prefix("movie")
+        catalog_cache.invalidate_prefix("movie_stat")
+    else:
+        catalog_cache.invalidate(("movie", movie_id))
+        catalog_cache.invalidate(("movie_stat", movie_id))
+    catalog_cache.invalidate(("genres",))
+    catalog_cache.invalidate(("stats",))
+    leaderboards.mark_dirty(movie_id)
+
+
+def on_review_changed(movie_id: int) -> None:
+    catalog_cache.invalidate_prefix("reviews", movie_id)
+    catalog_cache.invalidate_prefix("reviews", None)
+    catalog_cache.invalidate(("movie_stat", movie_id))
+    catalog_cache.invalidate(("stats",))
+    leaderboards.mark_dirty(movie_id)
+
+
+def on_favorite_changed(user_id: int, movie_id: Optional[int] = None) -> None:
+    catalog_cache.invalidate_prefix("favorites", user_id)
+    if movie_id is not None:
+        catalog_cache.invalidate(("movie_stat", movie_id))
+        leaderboards.mark_dirty(movie_id)
+
+
+def on_movie_stat_changed(movie_id: int) -> None:
+    catalog_cache.invalidate(("movie_stat", movie_id))
+    leaderboards.mark_dirty(movie_id)
+
+
+def on_user_changed() -> None:
+    catalog_cache.invalidate(("stats",))
@@ -0,0 +1,194 @@
+# app/repositories/engagement.py
+"""Аналитика действий с фильмами по времени: журнал, корзины, свертки.
+
+    engagement_events    журнал пачек действий (view, favorite, review)
+    engagement_hourly    суммы по часам — пишутся вместе с журналом
+    engagement_daily     свертка часов по дням   } фоновая задача
+    engagement_monthly   свертка дней по месяцам } (rollup_engagement)
+
+Запись идет пачками из буфера в памяти (app.services.engagement): одна
+транзакция на сброс, executemany в журнал и upsert с приращением в
+часовые корзины. Чтения (trending) обращаются только к корзинам и
+сверткам, журнал нужен для разбора и пересчета за срок хранения.
+
+Свертка пересчитывает дни и месяцы начиная с since целиком
+(INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE), поэтому ее
+можно повторять. Уплотнение удаляет журнал старше
+ENGAGEMENT_RAW_RETENTION_DAYS, часы — старше
+ENGAGEMENT_HOURLY_RETENTION_DAYS (по границе дня) и дни — старше
+ENGAGEMENT_DAILY_RETENTION_DAYS (по границе месяца); месяцы хранятся
+всегда. Границы выровнены, поэтому удаляются только полностью
+свернутые корзины.
+"""
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, func, insert as sa_insert, or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.engagement import EngagementDaily, EngagementEvent, EngagementHourly, EngagementMonthly
+from app.models.movies import Movie
+from app.utils.config import settings
+
+# Вид действия -> столбец сумм в корзинах
+KINDS = {"view": "views", "favorite": "favorites", "review": "reviews"}
+TOTALS = tuple(KINDS.values())
+
+# Ключ буфера событий: (movie_id, вид, начало часа)
+EventKey = Tuple[int, str, datetime]
+
+WINDOW_RE = re.compile(r"^(\d+)([hdm])$")
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+# ==================== ЗАПИСЬ ====================
+
+def record_events(conn: Connection, events: Dict[EventKey, int]) -> None:
+    """Записать пачку событий: журнал и часовые корзины в одной транзакции"""
+    conn.execute(
+        sa_insert(EngagementEvent.__table__),
+        [
+            {"movie_id": movie_id, "kind": kind, "count": count, "occurred_at": bucket}
+            for (movie_id, kind, bucket), count in events.items()
+        ],
+    )
+    hourly: Dict[Tuple[datetime, int], dict] = {}
+    for (movie_id, kind, bucket), count in events.items():
+        row = hourly.setdefault((bucket, movie_id), {"bucket": bucket, "movie_id": movie_id, **dict.fromkeys(TOTALS, 0)})
+        row[KINDS[kind]] += count
+    table = EngagementHourly.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.bucket, table.c.movie_id],
+        set_={column: table.c[column] + stmt.excluded[column] for column in TOTALS},
+    )
+    conn.execute(stmt, list(hourly.values()))
+
+
+# ==================== СВЕРТКА И УПЛОТНЕНИЕ ====================
+
+def _rollup(target, key: str, source, source_key, condition):
+    """INSERT ... SELECT сумм строк source, отобранных condition, по
+    корзинам target (source_key — корзина target для строки source)"""
+    table = target.__table__
+    select_stmt = (
+        select(source_key, source.movie_id, *(func.sum(getattr(source, column)) for column in TOTALS))
+        .where(condition)
+        .group_by(source_key, source.movie_id)
+    )
+    stmt = insert(table).from_select([key, "movie_id", *TOTALS], select_stmt)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c[key], table.c.movie_id],
+        set_={column: stmt.excluded[column] for column in TOTALS},
+        where=or_(*(table.c[column].is_distinct_from(stmt.excluded[column]) for column in TOTALS)),
+    )
+
+
+def rollup_engagement(conn: Connection, since: date) -> Dict[str, int]:
+    """Пересчитать дни с since и месяцы с начала месяца since; возвращает
+    число измененных строк. Транзакцию не фиксирует."""
+    # Условия по самим ключам корзин, чтобы отбор шел по первичному ключу
+    daily = _rollup(
+        EngagementDaily, "day", EngagementHourly, func.date(EngagementHourly.bucket),
+        EngagementHourly.bucket >= datetime.combine(since, datetime.min.time()),
+    )
+    monthly = _rollup(
+        EngagementMonthly, "month", EngagementDaily, func.date(EngagementDaily.day, "start of month"),
+        EngagementDaily.day >= month_start(since),
+    )
+    return {
+        "daily": conn.execute(daily).rowcount,
+        "monthly": conn.execute(monthly).rowcount,
+    }
+
+
+def retention_cutoffs(now: datetime) -> Dict[str, datetime]:
+    """Границы уплотнения: строки старше удаляются"""
+    hourly = (now - timedelta(days=settings.ENGAGEMENT_HOURLY_RETENTION_DAYS)).date()
+    daily = month_start((now - timedelta(days=settings.ENGAGEMENT_DAILY_RETENTION_DAYS)).date())
+    return {
+        "events": now - timedelta(days=settings.ENGAGEMENT_RAW_RETENTION_DAYS),
+        "hourly": datetime.combine(hourly, datetime.min.time()),
+        "daily": daily,
+    }
+
+
+def compact_engagement(conn: Connection, now: datetime) -> Dict[str, int]:
+    """Удалить журнал и корзины за пределами сроков хранения; вызывается
+    после свертки. Транзакцию не фиксирует."""
+    cutoffs = retention_cutoffs(now)
+    return {
+        "events": conn.execute(delete(EngagementEvent).where(EngagementEvent.occurred_at < cutoffs["events"])).rowcount,
+        "hourly": conn.execute(delete(EngagementHourly).where(EngagementHourly.bucket < cutoffs["hourly"])).rowcount,
+        "daily": conn.execute(delete(EngagementDaily).where(EngagementDaily.day < cutoffs["daily"])).rowcount,
+    }
+
+
+# ==================== ЧТЕНИЕ ====================
+
+class InvalidWindowError(ValueError):
+    pass
+
+
+def parse_window(window: str) -> Tuple[int, str]:
+    """"24h", "7d", "3m" -> (число, единица) с проверкой срока хранения"""
+    match = WINDOW_RE.match(window)
+    if not match or int(match.group(1)) < 1:
+        raise InvalidWindowError("Окно задается как <число><h|d|m>, например 24h, 7d, 3m")
+    size, unit = int(match.group(1)), match.group(2)
+    limits = {
+        "h": settings.ENGAGEMENT_HOURLY_RETENTION_DAYS * 24,
+        "d": settings.ENGAGEMENT_DAILY_RETENTION_DAYS,
+        "m": 120,
+    }
+    if size > limits[unit]:
+        raise InvalidWindowError(f"Окно {window} длиннее срока хранения (не больше {limits[unit]}{unit})")
+    return size, unit
+
+
+def window_source(size: int, unit: str, now: datetime):
+    """Таблица корзин и условие окна: часы — из часовых корзин (свежие),
+    дни и месяцы — из сверток"""
+    if unit == "h":
+        return EngagementHourly, EngagementHourly.bucket >= hour_bucket(now) - timedelta(hours=size - 1)
+    if unit == "d":
+        return EngagementDaily, EngagementDaily.day >= now.date() - timedelta(days=size - 1)
+    first = month_start(now.date())
+    months = first.year * 12 + first.month - 1 - (size - 1)
+    return EngagementMonthly, EngagementMonthly.month >= date(months // 12, months % 12 + 1, 1)
+
+
+async def trending(db: AsyncSession, window: str, metric: str, limit: int, now: datetime) -> List[dict]:
+    """Фильмы с наибольшим числом действий metric за окно"""
+    size, unit = parse_window(window)
+    source, condition = window_source(size, unit, now)
+    sums = {column: func.sum(getattr(source, column)).label(column) for column in TOTALS}
+    totals = (
+        select(source.movie_id, *sums.values())
+        .where(condition)
+        .group_by(source.movie_id)
+        .order_by(sums[metric].desc(), source.movie_id)
+        .limit(limit)
+        .subquery()
+    )
+    stmt = (
+        select(Movie.id, Movie.title, Movie.poster_url, *(totals.c[column] for column in TOTALS))
+        .join(totals, totals.c.movie_id == Movie.id)
+        .order_by(totals.c[metric].desc(), Movie.id)
+    )
+    rows = (await db.execute(stmt)).all()
+    return [
+        {"movie_id": row.id, "title": row.title, "poster_url": row.poster_url,
+         **{column: getattr(row, column) for column in TOTALS}}
+        for row in rows
+    ]
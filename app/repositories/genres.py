@@ -0,0 +1,93 @@
+# app/repositories/genres.py
+"""Индекс жанров: справочник genres и связи movie_genres.
+
+Строка Movie.genre ("Драма, Криминал") остается для отображения, а
+листинг и фильтрация по жанру идут через индексированные таблицы.
+Запись фильма через ORM обновляет связи сама (события Movie в
+app.models.movies), Core-запись (upsert, пакетная загрузка) вызывает
+set_movie_genres явно.
+Функции синхронные; из асинхронного кода их вызывают через
+AsyncSession.run_sync.
+"""
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.genres import Genre, MovieGenre
+from app.models.movies import Movie
+
+
+def split_genres(genre: Optional[str]) -> List[str]:
+    """Разбить строку жанров на уникальные названия с сохранением порядка"""
+    names = []
+    for name in (genre or "").split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def get_or_create_genre_ids(db: Union[Session, Connection], names: Iterable[str]) -> Dict[str, int]:
+    """ID жанров по названиям, недостающие жанры создаются"""
+    names = set(names)
+    if not names:
+        return {}
+
+    genre_ids = dict(db.execute(select(Genre.name, Genre.id).where(Genre.name.in_(names))).all())
+    missing = names - genre_ids.keys()
+    if missing:
+        db.execute(insert(Genre), [{"name": name} for name in sorted(missing)])
+        genre_ids.update(
+            db.execute(select(Genre.name, Genre.id).where(Genre.name.in_(missing))).all()
+        )
+    return genre_ids
+
+
+def set_movie_genres(db: Session, movie_id: int, genre: Optional[str]) -> None:
+    """Привести связи фильма с жанрами в соответствие строке Movie.genre"""
+    genre_ids = get_or_create_genre_ids(db, split_genres(genre))
+    db.execute(delete(MovieGenre).where(MovieGenre.movie_id == movie_id))
+    if genre_ids:
+        db.execute(
+            insert(MovieGenre),
+            [{"movie_id": movie_id, "genre_id": genre_id} for genre_id in genre_ids.values()],
+        )
+
+
+def rebuild_genre_index(db: Session) -> int:
+    """Полностью перестроить movie_genres по Movie.genre (для данных,
+    загруженных в обход приложения). Возвращает число связей."""
+    movies = db.execute(select(Movie.id, Movie.genre)).all()
+    genre_ids = get_or_create_genre_ids(
+        db, {name for _, genre in movies for name in split_genres(genre)}
+    )
+    links = [
+        {"movie_id": movie_id, "genre_id": genre_ids[name]}
+        for movie_id, genre in movies
+        for name in split_genres(genre)
+    ]
+    db.execute(delete(MovieGenre))
+    if links:
+        db.execute(insert(MovieGenre), links)
+    return len(links)
+
+
+def list_genre_names(db: Session) -> List[str]:
+    """Жанры, у которых есть хотя бы один фильм, по алфавиту"""
+    stmt = (
+        select(Genre.name)
+        .where(exists().where(MovieGenre.genre_id == Genre.id))
+        .order_by(Genre.name)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def movie_ids_with_genre(name: str):
+    """Подзапрос ID фильмов жанра: поиск по uq genres.name и PK movie_genres"""
+    return (
+        select(MovieGenre.movie_id)
+        .join(Genre, MovieGenre.genre_id == Genre.id)
+        .where(Genre.name == name.strip())
+    )
@@ -0,0 +1,58 @@
+# app/repositories/imports.py
+"""Служебные таблицы импорта каталога: контрольные точки и хэши записей."""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.sql import func
+
+from app.models.imports import ImportCheckpoint, ImportRecordHash
+
+
+def get_checkpoint(conn: Connection, source: str) -> Optional[Row]:
+    return conn.execute(
+        select(ImportCheckpoint.__table__).where(ImportCheckpoint.source == source)
+    ).first()
+
+
+def save_checkpoint(
+    conn: Connection,
+    source: str,
+    fmt: str,
+    position: int,
+    line: int,
+    prefix_hash: str,
+    status: str = "running",
+) -> None:
+    values = dict(format=fmt, position=position, line=line, prefix_hash=prefix_hash, status=status)
+    conn.execute(
+        insert(ImportCheckpoint)
+        .values(source=source, **values)
+        .on_conflict_do_update(
+            index_elements=[ImportCheckpoint.source],
+            set_={**values, "updated_at": func.now()},
+        )
+    )
+
+
+def get_record_hashes(conn: Connection, keys: Iterable[str]) -> Dict[str, str]:
+    """Сохраненные хэши для ключей записей (отсутствующие ключи не возвращаются)"""
+    rows = conn.execute(
+        select(ImportRecordHash.record_key, ImportRecordHash.content_hash)
+        .where(ImportRecordHash.record_key.in_(list(keys)))
+    ).all()
+    return dict(rows)
+
+
+def save_record_hashes(conn: Connection, hashes: Dict[str, str]) -> None:
+    if not hashes:
+        return
+    stmt = insert(ImportRecordHash)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ImportRecordHash.record_key],
+            set_={"content_hash": stmt.excluded.content_hash, "updated_at": func.now()},
+        ),
+        [{"record_key": key, "content_hash": value} for key, value in hashes.items()],
+    )
@@ -0,0 +1,304 @@
+# app/repositories/leaderboards.py
+"""Предрасчитанные рейтинги фильмов (топ-N) в памяти процесса.
+
+Доски:
+    top-rated       байесовский рейтинг (см. score)
+    most-viewed     по views_count, при равенстве — по рейтингу
+    most-favorited  по favorites_count, при равенстве — по рейтингу
+
+Каждая доска ведется для областей ("global",), ("genre", имя жанра в
+нижнем регистре) и ("pick", slug подборки). Список области хранит
+LEADERBOARD_SIZE + запас фильмов, отсортированных по ключу, поэтому
+страница доски — срез списка без обращения к базе.
+
+Списки обновляются приращениями: хуки записи (catalog_cache, сброс
+счетчика просмотров) помечают фильм, и фоновая задача
+(app.services.leaderboards) перечитывает помеченные фильмы одним
+запросом и переставляет их в списках. Фильм, выпавший из полного
+списка, нельзя заменить без запроса ко всей области: когда в списке
+остается меньше LEADERBOARD_SIZE фильмов, область помечается к
+полному пересчету. Полный пересчет идет и по расписанию — он же
+обновляет глобальное среднее C, которое приращения не трогают.
+"""
+import heapq
+import math
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.models.genres import Genre, MovieGenre
+from app.models.movie_picks import MoviePick
+from app.models.movie_stats import MovieStat
+from app.models.movies import Movie
+from app.models.picks import Pick
+from app.utils.config import settings
+
+BOARDS = ("top-rated", "most-viewed", "most-favorited")
+GLOBAL_SCOPE = ("global",)
+
+# Верхняя граница шкалы оценок: добавление в избранное считается такой оценкой
+MAX_RATING = 10.0
+
+Scope = Tuple[str, ...]
+SortKey = Tuple[float, float, int]
+
+
+# ==================== ЧТЕНИЕ ИЗ БАЗЫ ====================
+
+def load_movies(conn: Connection, movie_ids: Optional[Sequence[int]] = None) -> List[dict]:
+    """Фильмы с агрегатами статистики и областями (жанры, подборки):
+    три запроса на любое число фильмов"""
+    stmt = (
+        select(
+            Movie.id,
+            Movie.title,
+            Movie.year,
+            Movie.genre,
+            Movie.poster_url,
+            Movie.rating,
+            func.coalesce(MovieStat.rating_sum, 0.0),
+            func.coalesce(MovieStat.reviews_count, 0),
+            func.coalesce(MovieStat.views_count, 0),
+            func.coalesce(MovieStat.favorites_count, 0),
+        )
+        .outerjoin(MovieStat, MovieStat.movie_id == Movie.id)
+    )
+    genres = select(MovieGenre.movie_id, Genre.name).join(Genre, Genre.id == MovieGenre.genre_id)
+    picks = select(MoviePick.movie_id, Pick.slug).join(Pick, Pick.id == MoviePick.pick_id)
+    if movie_ids is not None:
+        stmt = stmt.where(Movie.id.in_(movie_ids))
+        genres = genres.where(MovieGenre.movie_id.in_(movie_ids))
+        picks = picks.where(MoviePick.movie_id.in_(movie_ids))
+
+    scopes = defaultdict(lambda: [GLOBAL_SCOPE])
+    for movie_id, name in conn.execute(genres):
+        # lower() SQLite не понижает регистр кириллицы
+        scopes[movie_id].append(("genre", name.lower()))
+    for movie_id, slug in conn.execute(picks):
+        scopes[movie_id].append(("pick", slug))
+
+    keys = ("id", "title", "year", "genre", "poster_url", "rating",
+            "rating_sum", "reviews_count", "views_count", "favorites_count")
+    movies = []
+    for row in conn.execute(stmt):
+        movie = dict(zip(keys, row))
+        movie["scopes"] = scopes[movie["id"]]
+        movies.append(movie)
+    return movies
+
+
+def load_global_mean(conn: Connection) -> float:
+    """Средняя оценка по всем отзывам (C); без отзывов — средний рейтинг каталога"""
+    rating_sum, reviews_count = conn.execute(
+        select(func.sum(MovieStat.rating_sum), func.sum(MovieStat.reviews_count))
+    ).one()
+    if reviews_count:
+        return rating_sum / reviews_count
+    return conn.scalar(select(func.avg(Movie.rating))) or 0.0
+
+
+# ==================== РАСЧЕТ ====================
+
+def score(movie: dict, mean: float) -> float:
+    """Байесовский рейтинг (weighted rating, как в IMDb Top 250).
+
+    Средняя оценка фильма стягивается к глобальной средней C с весом
+    LEADERBOARD_PRIOR_VOTES фиктивных голосов, так что фильм с парой
+    десяток не обгоняет фильм с сотней девяток. Добавление в избранное
+    считается голосом с максимальной оценкой весом
+    LEADERBOARD_FAVORITE_WEIGHT, просмотры дают небольшую надбавку по
+    логарифму.
+    """
+    prior_votes = settings.LEADERBOARD_PRIOR_VOTES
+    favorites = settings.LEADERBOARD_FAVORITE_WEIGHT * movie["favorites_count"]
+    weighted = (
+        (prior_votes * mean + movie["rating_sum"] + favorites * MAX_RATING)
+        / (prior_votes + movie["reviews_count"] + favorites)
+    )
+    return weighted + settings.LEADERBOARD_VIEW_WEIGHT * math.log10(1 + movie["views_count"])
+
+
+def sort_keys(movie: dict, movie_score: float) -> Dict[str, SortKey]:
+    """Ключи сортировки фильма по доскам (по возрастанию ключа — лучшие первыми)"""
+    return {
+        "top-rated": (-movie_score, -(movie["rating"] or 0.0), movie["id"]),
+        "most-viewed": (-movie["views_count"], -movie_score, movie["id"]),
+        "most-favorited": (-movie["favorites_count"], -movie_score, movie["id"]),
+    }
+
+
+def _entry(movie: dict, movie_score: float) -> dict:
+    """Карточка фильма в ответе доски"""
+    entry = {key: value for key, value in movie.items() if key not in ("rating_sum", "scopes")}
+    entry["average_rating"] = (
+        round(movie["rating_sum"] / movie["reviews_count"], 2) if movie["reviews_count"] else None
+    )
+    entry["score"] = round(movie_score, 4)
+    return entry
+
+
+def rank_movies(movies: List[dict], mean: float, capacity: int):
+    """Полный расчет списков по всем фильмам: (списки, полные списки,
+    карточки фильмов, попавших в списки). Не трогает хранилище, поэтому
+    выполняется вне event loop."""
+    members = defaultdict(list)
+    scored = {}
+    for movie in movies:
+        movie_score = score(movie, mean)
+        keys = sort_keys(movie, movie_score)
+        scored[movie["id"]] = (movie, movie_score, keys)
+        for scope in movie["scopes"]:
+            for board in BOARDS:
+                members[(board, scope)].append((keys[board], movie["id"]))
+
+    lists, complete, listed = {}, set(), set()
+    for name, items in members.items():
+        # Частичная сортировка: O(n log capacity) вместо полной
+        lists[name] = heapq.nsmallest(capacity, items)
+        listed.update(movie_id for _, movie_id in lists[name])
+        if len(items) <= capacity:
+            complete.add(name)
+    entries = {}
+    for movie_id in listed:
+        movie, movie_score, keys = scored[movie_id]
+        entries[movie_id] = (_entry(movie, movie_score), keys, movie["scopes"])
+    return lists, complete, entries
+
+
+# ==================== ХРАНИЛИЩЕ ====================
+
+class LeaderboardStore:
+    """Топ-N списки досок по областям с приращенным обновлением"""
+
+    def __init__(self, size: int, slack: int):
+        self.size = size
+        self.capacity = size + slack
+        self.mean = 0.0
+        self.built_at: Optional[datetime] = None
+        # (доска, область) -> отсортированный список (ключ, movie_id)
+        self._lists: Dict[Tuple[str, Scope], List[Tuple[SortKey, int]]] = {}
+        # Списки, в которые вошли все фильмы области: в них можно вставлять
+        # любой фильм, не боясь пропустить лучший за пределами списка
+        self._complete: Set[Tuple[str, Scope]] = set()
+        # movie_id -> (карточка, ключи, области) для фильмов, попавших в списки
+        self._movies: Dict[int, Tuple[dict, Dict[str, SortKey], List[Scope]]] = {}
+        self._dirty: Set[int] = set()
+        self._rebuild_needed = True
+
+    # ==================== ПОМЕТКИ ====================
+
+    def mark_dirty(self, movie_id: Optional[int] = None) -> None:
+        """Фильм изменился (None — неизвестно какие: нужен полный пересчет)"""
+        if movie_id is None:
+            self._rebuild_needed = True
+        else:
+            self._dirty.add(movie_id)
+
+    def mark_many_dirty(self, movie_ids: Iterable[int]) -> None:
+        self._dirty.update(movie_ids)
+
+    def take_dirty(self) -> Set[int]:
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    @property
+    def rebuild_needed(self) -> bool:
+        return self._rebuild_needed
+
+    @property
+    def has_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    # ==================== ПОСТРОЕНИЕ ====================
+
+    def install(self, mean: float, ranked) -> None:
+        """Заменить списки результатом rank_movies. Пометки, сделанные во
+        время расчета, сохраняются и применятся следующим обновлением."""
+        self._lists, self._complete, self._movies = ranked
+        self.mean = mean
+        self._rebuild_needed = False
+        self.built_at = datetime.now(timezone.utc)
+
+    def _position(self, name, key: SortKey, movie_id: int) -> Optional[int]:
+        items = self._lists.get(name)
+        if not items:
+            return None
+        index = bisect_left(items, (key, movie_id))
+        return index if index < len(items) and items[index][1] == movie_id else None
+
+    # ==================== ПРИРАЩЕНИЯ ====================
+
+    def apply(self, movie_ids: Iterable[int], movies: List[dict]) -> None:
+        """Переставить помеченные фильмы по свежим данным; фильмы из
+        movie_ids, которых нет в movies, удалены из каталога"""
+        fresh = {movie["id"]: movie for movie in movies}
+        for movie_id in movie_ids:
+            shrunk = self._remove(movie_id)
+            movie = fresh.get(movie_id)
+            if movie is not None:
+                self._insert(movie)
+            for name in shrunk:
+                # Фильм ушел вниз из неполного списка, а следующие за ним
+                # фильмы области неизвестны
+                if name not in self._complete and len(self._lists[name]) < self.size:
+                    self._rebuild_needed = True
+
+    def _remove(self, movie_id: int) -> List[Tuple[str, Scope]]:
+        data = self._movies.pop(movie_id, None)
+        if data is None:
+            return []
+        _, keys, scopes = data
+        removed = []
+        for scope in scopes:
+            for board in BOARDS:
+                name = (board, scope)
+                index = self._position(name, keys[board], movie_id)
+                if index is not None:
+                    del self._lists[name][index]
+                    removed.append(name)
+        return removed
+
+    def _insert(self, movie: dict) -> None:
+        movie_score = score(movie, self.mean)
+        keys = sort_keys(movie, movie_score)
+        listed = False
+        for scope in movie["scopes"]:
+            for board in BOARDS:
+                name = (board, scope)
+                if name not in self._lists:
+                    # Новая область (жанр, подборка): до ближайшего пересчета
+                    # состоит из вставленных фильмов
+                    self._lists[name] = []
+                    self._complete.add(name)
+                items = self._lists[name]
+                item = (keys[board], movie["id"])
+                if name in self._complete or (items and item < items[-1]):
+                    insort(items, item)
+                    listed = True
+                    if len(items) > self.capacity:
+                        items.pop()
+                        self._complete.discard(name)
+        if listed:
+            self._movies[movie["id"]] = (_entry(movie, movie_score), keys, movie["scopes"])
+
+    # ==================== ЧТЕНИЕ ====================
+
+    def page(self, board: str, scope: Scope, offset: int, limit: int) -> List[dict]:
+        """Страница доски: срез списка, O(limit)"""
+        items = self._lists.get((board, scope), [])
+        end = min(offset + limit, self.size)
+        return [
+            {"rank": rank, **self._movies[movie_id][0]}
+            for rank, (_, movie_id) in enumerate(items[offset:end], start=offset + 1)
+        ]
+
+
+leaderboards = LeaderboardStore(settings.LEADERBOARD_SIZE, settings.LEADERBOARD_SLACK)
@@ -1,24 +1,32 @@
 # app/repositories/movie_stats.py
-from typing import Optional, List
+from typing import Dict, Optional, List, Sequence, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import bindparam, case, func, or_, select, true, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.movie_stats import MovieStat
 from app.models.movies import Movie
+from app.models.favorites import Favorite
+from app.models.reviews import Review
 from app.schemas.movie_stats import MovieStatCreate, MovieStatUpdate
 
 class MovieStatRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def get_by_id(self, stat_id: int) -> Optional[MovieStat]:
+    async def get_by_id(self, stat_id: int, with_movie: bool = False) -> Optional[MovieStat]:
         stmt = select(MovieStat).where(MovieStat.id == stat_id)
+        if with_movie:
+            stmt = stmt.options(selectinload(MovieStat.movie))
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def get_by_movie_id(self, movie_id: int) -> Optional[MovieStat]:
+    async def get_by_movie_id(self, movie_id: int, with_movie: bool = False) -> Optional[MovieStat]:
         stmt = select(MovieStat).where(MovieStat.movie_id == movie_id)
+        if with_movie:
+            stmt = stmt.options(selectinload(MovieStat.movie))
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
@@ -72,14 +80,74 @@ class MovieStatRepository:
             return True
         return False
     
-    async def increment_views(self, movie_id: int) -> Optional[MovieStat]:
-        stat = await self.get_by_movie_id(movie_id)
-        if stat:
-            stat.views_count += 1
-            await self.db.commit()
-            await self.db.refresh(stat)
-        
-        return stat
+    async def add_views(self, increments: Dict[int, int]) -> int:
+        """Прибавить просмотры фильмам (movie_id -> число) одной транзакцией.
+
+        Приращение выполняет сама база (views_count = views_count + ?),
+        поэтому параллельные записи не теряют просмотры. Возвращает
+        число обновленных строк статистики.
+        """
+        if not increments:
+            return 0
+        stmt = (
+            update(MovieStat.__table__)
+            .where(MovieStat.movie_id == bindparam("stat_movie_id"))
+            .values(views_count=MovieStat.views_count + bindparam("views"), updated_at=func.now())
+        )
+        result = await self.db.execute(
+            stmt,
+            [{"stat_movie_id": movie_id, "views": views} for movie_id, views in increments.items()],
+        )
+        await self.db.commit()
+        return result.rowcount
+    
+    async def apply_review(self, movie_id: int, rating_delta: float, count_delta: int) -> Tuple[float, int]:
+        """Учесть создание (+оценка, +1), изменение (разница оценок, 0) или
+        удаление (-оценка, -1) отзыва в агрегатах рейтинга фильма.
+
+        Сумма и число оценок меняются на месте, без AVG по всем отзывам
+        фильма. Транзакцию не фиксирует: вызывается до commit записи
+        отзыва, чтобы агрегаты не расходились с отзывами. Возвращает
+        (average_rating, reviews_count).
+        """
+        count = func.coalesce(MovieStat.reviews_count, 0) + count_delta
+        rating_sum = func.coalesce(MovieStat.rating_sum, 0.0) + rating_delta
+        stmt = (
+            update(MovieStat.__table__)
+            .where(MovieStat.movie_id == movie_id)
+            .values(
+                # При нуле отзывов сумма обнуляется, а не накапливает
+                # погрешность сложений float
+                rating_sum=case((count > 0, rating_sum), else_=0.0),
+                reviews_count=case((count > 0, count), else_=0),
+                average_rating=case((count > 0, rating_sum / count), else_=0.0),
+            )
+            .returning(MovieStat.average_rating, MovieStat.reviews_count)
+        )
+        row = (await self.db.execute(stmt)).first()
+        if row is None:
+            # Статистики фильма еще нет: агрегаты считаются по отзывам один
+            # раз, запись отзыва в этой транзакции уже учтена
+            stmt = stat_aggregates_upsert([movie_id]).returning(MovieStat.average_rating, MovieStat.reviews_count)
+            row = (await self.db.execute(stmt)).first()
+        return (row[0], row[1]) if row is not None else (0.0, 0)
+    
+    async def apply_favorite(self, movie_id: int, count_delta: int) -> int:
+        """Учесть добавление (+1) или удаление (-1) фильма из избранного;
+        как и apply_review, вызывается до commit записи избранного.
+        Возвращает favorites_count."""
+        count = func.coalesce(MovieStat.favorites_count, 0) + count_delta
+        stmt = (
+            update(MovieStat.__table__)
+            .where(MovieStat.movie_id == movie_id)
+            .values(favorites_count=case((count > 0, count), else_=0))
+            .returning(MovieStat.favorites_count)
+        )
+        favorites_count = (await self.db.execute(stmt)).scalar()
+        if favorites_count is None:
+            stmt = stat_aggregates_upsert([movie_id]).returning(MovieStat.favorites_count)
+            favorites_count = (await self.db.execute(stmt)).scalar()
+        return favorites_count or 0
     
     async def update_average_rating(self, movie_id: int, average_rating: float) -> Optional[MovieStat]:
         stat = await self.get_by_movie_id(movie_id)
@@ -88,4 +156,61 @@ class MovieStatRepository:
             await self.db.commit()
             await self.db.refresh(stat)
         
-        return stat
\ No newline at end of file
+        return stat
+
+
+# ==================== ПЕРЕСЧЕТ АГРЕГАТОВ ====================
+
+AGGREGATE_COLUMNS = ("rating_sum", "reviews_count", "average_rating", "favorites_count")
+
+
+def _totals(column, *aggregates, movie_ids: Optional[Sequence[int]] = None):
+    stmt = select(column.label("movie_id"), *aggregates).group_by(column)
+    if movie_ids is not None:
+        stmt = stmt.where(column.in_(movie_ids))
+    return stmt.subquery()
+
+
+def stat_aggregates_upsert(movie_ids: Optional[Sequence[int]] = None):
+    """INSERT ... SELECT агрегатов по таблицам reviews и favorites (для
+    всех фильмов или movie_ids) с ON CONFLICT DO UPDATE. Обновляются только
+    строки, где агрегаты разошлись с исходными таблицами."""
+    table = MovieStat.__table__
+    reviews = _totals(
+        Review.movie_id,
+        func.sum(Review.rating).label("rating_sum"),
+        func.count().label("reviews_count"),
+        movie_ids=movie_ids,
+    )
+    favorites = _totals(Favorite.movie_id, func.count().label("favorites_count"), movie_ids=movie_ids)
+    rating_sum = func.coalesce(reviews.c.rating_sum, 0.0)
+    reviews_count = func.coalesce(reviews.c.reviews_count, 0)
+    source = (
+        select(
+            Movie.id,
+            rating_sum,
+            reviews_count,
+            case((reviews_count > 0, rating_sum / reviews_count), else_=0.0),
+            func.coalesce(favorites.c.favorites_count, 0),
+        )
+        .outerjoin(reviews, reviews.c.movie_id == Movie.id)
+        .outerjoin(favorites, favorites.c.movie_id == Movie.id)
+        # WHERE обязателен: без него SQLite путает ON CONFLICT с ON соединения
+        .where(Movie.id.in_(movie_ids) if movie_ids is not None else true())
+    )
+    stmt = insert(table).from_select(["movie_id", *AGGREGATE_COLUMNS], source)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.movie_id],
+        set_={column: stmt.excluded[column] for column in AGGREGATE_COLUMNS},
+        where=or_(*(table.c[column].is_distinct_from(stmt.excluded[column]) for column in AGGREGATE_COLUMNS)),
+    )
+
+
+def rebuild_stat_aggregates(
+    db: Union[Session, Connection],
+    movie_ids: Optional[Sequence[int]] = None,
+) -> int:
+    """Пересчитать агрегаты оценок и избранного одним запросом (скрипт
+    восстановления); возвращает число созданных и исправленных строк
+    статистики. Транзакцию не фиксирует."""
+    return db.execute(stat_aggregates_upsert(movie_ids)).rowcount
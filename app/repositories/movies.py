@@ -1,14 +1,14 @@
 # app/repositories/movies.py
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, or_, func, desc
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 
 from app.models.movies import Movie
-from app.models.movie_picks import MoviePick
-from app.models.picks import Pick
 from app.models.users import User
 from app.repositories.base import BaseRepository
+from app.repositories.genres import movie_ids_with_genre
+from app.repositories.upserts import link_movie_pick
 
 class MovieRepository(BaseRepository[Movie]):
     def __init__(self, db: AsyncSession):
@@ -23,7 +23,7 @@ class MovieRepository(BaseRepository[Movie]):
     async def get_by_genre(self, genre: str, skip: int = 0, limit: int = 100) -> List[Movie]:
         result = await self.db.execute(
             select(Movie)
-            .filter(Movie.genre.ilike(f"%{genre}%"))
+            .filter(Movie.id.in_(movie_ids_with_genre(genre)))
             .offset(skip)
             .limit(limit)
         )
@@ -66,30 +66,8 @@ class MovieRepository(BaseRepository[Movie]):
         return result.scalars().unique().all()
     
     async def add_pick_to_movie(self, movie_id: int, pick_id: int) -> bool:
-        # Проверяем, существует ли уже связь
-        query = select(MoviePick).where(
-            and_(MoviePick.movie_id == movie_id, MoviePick.pick_id == pick_id)
-        )
-        result = await self.db.execute(query)
-        existing = result.scalar_one_or_none()
-        
-        if existing:
-            return False  # Связь уже существует
-        
-        # Проверяем существование фильма и подборки
-        movie_stmt = select(Movie).where(Movie.id == movie_id)
-        movie_result = await self.db.execute(movie_stmt)
-        movie = movie_result.scalar_one_or_none()
-        
-        pick_stmt = select(Pick).where(Pick.id == pick_id)
-        pick_result = await self.db.execute(pick_stmt)
-        pick = pick_result.scalar_one_or_none()
-        
-        if not movie or not pick:
-            return False
-        
-        # Создаем новую связь
-        movie_pick = MoviePick(movie_id=movie_id, pick_id=pick_id)
-        self.db.add(movie_pick)
+        # Один INSERT ... SELECT ... ON CONFLICT DO NOTHING вместо трех проверок:
+        # False, если связь уже есть или фильма/подборки не существует
+        added = await self.db.run_sync(lambda session: link_movie_pick(session, movie_id, pick_id))
         await self.db.commit()
-        return True
\ No newline at end of file
+        return added
\ No newline at end of file
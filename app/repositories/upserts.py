@@ -0,0 +1,136 @@
+# app/repositories/upserts.py
+"""Идемпотентная запись каталога через INSERT ... ON CONFLICT (SQLite).
+
+Вместо SELECT-проверки перед вставкой строки пишутся одним запросом, а
+конфликт по естественному ключу решает сама база:
+    movies       natural_key (нормализованные название + год) и id
+    picks        slug
+    movie_picks  пара (movie_id, pick_id)
+    users        username
+
+Это вдвое сокращает число запросов и не дает дублей при параллельной
+записи. Функции синхронные (Session или Connection), из асинхронного
+кода вызываются через AsyncSession.run_sync.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import exists, literal, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.movie_picks import MoviePick
+from app.models.movies import Movie, movie_natural_key
+from app.models.picks import Pick
+from app.models.users import User
+
+
+# ==================== ФИЛЬМЫ ====================
+
+def upsert_movies(
+    db: Union[Session, Connection],
+    rows: Sequence[dict],
+    update_columns: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """Вставить фильмы одним запросом; natural_key -> id записанных строк.
+
+    Без update_columns существующие фильмы (конфликт по natural_key или
+    id) пропускаются и в результат не попадают. С update_columns у
+    фильмов с тем же natural_key обновляются эти колонки, и в результат
+    попадают все строки. Все строки должны содержать одинаковый набор
+    ключей (требование executemany).
+    """
+    if not rows:
+        return {}
+    rows = [{**row, "natural_key": movie_natural_key(row["title"], row.get("year"))} for row in rows]
+    stmt = insert(Movie.__table__)
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Movie.natural_key],
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing()
+    result = db.execute(stmt.returning(Movie.natural_key, Movie.id), rows)
+    return dict(result.all())
+
+
+# ==================== ПОДБОРКИ ====================
+
+def upsert_picks(db: Union[Session, Connection], picks: Sequence[dict], update: bool = False) -> Dict[str, int]:
+    """Создать недостающие подборки; slug -> id для всех переданных.
+
+    С update=True у существующих подборок обновляются name и description.
+    """
+    if not picks:
+        return {}
+    stmt = insert(Pick.__table__)
+    # Пустое по сути обновление slug = slug нужно, чтобы RETURNING вернул
+    # id и уже существующих подборок
+    set_ = {"slug": stmt.excluded.slug}
+    if update:
+        set_.update(name=stmt.excluded.name, description=stmt.excluded.description)
+    result = db.execute(
+        stmt.on_conflict_do_update(index_elements=[Pick.slug], set_=set_).returning(Pick.slug, Pick.id),
+        [{"description": None, "created_by": None, **pick} for pick in picks],
+    )
+    return dict(result.all())
+
+
+# ==================== СВЯЗИ ФИЛЬМ-ПОДБОРКА ====================
+
+def link_movie_picks(db: Union[Session, Connection], pairs: Iterable[Tuple[int, int]]) -> int:
+    """Добавить связи (movie_id, pick_id), уже существующие пропускаются.
+    Возвращает число добавленных связей."""
+    rows = [{"movie_id": movie_id, "pick_id": pick_id} for movie_id, pick_id in dict.fromkeys(pairs)]
+    if not rows:
+        return 0
+    result = db.execute(
+        insert(MoviePick.__table__).on_conflict_do_nothing().returning(MoviePick.movie_id),
+        rows,
+    )
+    return len(result.all())
+
+
+def link_movie_pick(db: Union[Session, Connection], movie_id: int, pick_id: int) -> bool:
+    """Добавить фильм в подборку одним запросом: INSERT ... SELECT с
+    проверкой существования фильма и подборки. False, если связь уже
+    есть или фильма/подборки нет."""
+    source = select(literal(movie_id), literal(pick_id)).where(
+        exists().where(Movie.id == movie_id),
+        exists().where(Pick.id == pick_id),
+    )
+    result = db.execute(
+        insert(MoviePick.__table__)
+        .from_select(["movie_id", "pick_id"], source)
+        .on_conflict_do_nothing()
+    )
+    return result.rowcount == 1
+
+
+def pick_pairs(movie_id: int, slugs: Iterable[str], pick_ids: Dict[str, int]) -> List[Tuple[int, int]]:
+    """Пары (movie_id, pick_id) для известных slug подборок"""
+    return [(movie_id, pick_ids[slug]) for slug in dict.fromkeys(slugs) if slug in pick_ids]
+
+
+# ==================== ПОЛЬЗОВАТЕЛИ ====================
+
+def insert_users(db: Union[Session, Connection], rows: Sequence[dict]) -> Dict[str, int]:
+    """Добавить пользователей одним запросом; username -> id добавленных.
+    Пользователи с уже занятым username (или email, если в схеме БД он
+    уникален) пропускаются."""
+    if not rows:
+        return {}
+    result = db.execute(
+        insert(User.__table__).on_conflict_do_nothing().returning(User.username, User.id),
+        [{"email": "", "is_active": True, "is_superuser": False, **row} for row in rows],
+    )
+    return dict(result.all())
+
+
+def existing_usernames(db: Union[Session, Connection], usernames: Iterable[str]) -> Set[str]:
+    """Какие из usernames уже заняты"""
+    usernames = list(usernames)
+    if not usernames:
+        return set()
+    return set(db.execute(select(User.username).where(User.username.in_(usernames))).scalars())
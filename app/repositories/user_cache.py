@@ -0,0 +1,41 @@
+# app/repositories/user_cache.py
+"""Кэш пользователей для аутентификации запросов.
+
+get_current_user на каждый запрос с токеном искал пользователя в БД.
+Теперь по subject токена (username) кэшируется неизменяемый снимок с
+полями, которых достаточно эндпоинтам; при изменении или удалении
+пользователя снимок сбрасывается, а короткий TTL ограничивает
+устаревание при изменениях в обход UserService.
+"""
+from dataclasses import dataclass
+
+from app.models.users import User
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    default_ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    username: str
+    is_superuser: bool
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_superuser=bool(user.is_superuser),
+            is_active=bool(user.is_active),
+        )
+
+
+def on_user_updated(username: str) -> None:
+    """Пользователь изменен или удален: сбрасываем снимок по его username"""
+    user_cache.invalidate(("user", username))
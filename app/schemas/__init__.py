@@ -1,10 +1,10 @@
 from .auth import Token, TokenData
 from .movies import (
-    MovieBase, MovieCreate, MovieUpdate, 
+    MovieBase, MovieCreate, MovieImportRecord, MovieUpdate, 
     MovieResponse, MovieDetailResponse, MovieInDB, MovieFilters
 )
 from .reviews import ReviewBase, ReviewCreate, ReviewResponse, ReviewUpdate
-from .users import UserBase, UserCreate, UserResponse, UserUpdate, UserInDB, User
+from .users import UserBase, UserCreate, UserImportRecord, UserResponse, UserUpdate, UserInDB, User
 from .roles import RoleBase, RoleCreate, RoleResponse, RoleUpdate, Role
 from .picks import PickBase, PickCreate, PickResponse, PickInDB
 
@@ -13,12 +13,14 @@ __all__ = [
     "TokenData",
     "UserBase",
     "UserCreate",
+    "UserImportRecord",
     "UserResponse", 
     "UserUpdate",
     "UserInDB",
     "User",
     "MovieBase",
     "MovieCreate",
+    "MovieImportRecord",
     "MovieUpdate",
     "MovieResponse",
     "MovieDetailResponse",
@@ -1,9 +1,12 @@
 # Создайте файл favorites.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from .movies import MovieInDB
 
+# Не больше IN_BATCH_SIZE (app.repositories.catalog): проверка идет одним запросом
+MAX_CHECK_IDS = 900
+
 class FavoriteBase(BaseModel):
     movie_id: int
 
@@ -17,4 +20,7 @@ class FavoriteInDB(FavoriteBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FavoriteCheckRequest(BaseModel):
+    movie_ids: List[int] = Field(max_length=MAX_CHECK_IDS)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -14,6 +14,35 @@ class MovieCreate(MovieBase):
     picks: List[str] = []
     created_by: Optional[int] = None
 
+class MovieImportRecord(MovieCreate):
+    """Запись файла импорта каталога (JSONL/CSV).
+
+    Допускается "poster" вместо poster_url и подборки строкой
+    "hits;classic" (так они хранятся в CSV).
+    """
+    id: Optional[int] = Field(default=None, gt=0)
+    title: str = Field(min_length=1)
+
+    @model_validator(mode='before')
+    @classmethod
+    def normalize_raw(cls, data):
+        if not isinstance(data, dict):
+            return data
+        # В CSV отсутствующее значение — пустая строка: применяем значения по умолчанию
+        data = {key: value for key, value in data.items() if value != ''}
+        if data.get('poster') and not data.get('poster_url'):
+            data['poster_url'] = data['poster']
+        return data
+
+    @field_validator('picks', mode='before')
+    @classmethod
+    def split_picks(cls, v):
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [slug for slug in v.replace(',', ';').split(';')]
+        return v
+
 class MovieUpdate(BaseModel):
     title: Optional[str] = None
     overview: Optional[str] = None
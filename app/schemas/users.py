@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime
 
@@ -17,6 +17,18 @@ class UserCreate(UserBase):
             return None
         return v
 
+class UserImportRecord(UserCreate):
+    """Пользователь из файла или запроса массового импорта"""
+    username: str = Field(..., min_length=1, max_length=150)
+    password: str = Field(..., min_length=1)
+    is_active: bool = True
+    is_superuser: bool = False
+    
+    @field_validator('username', mode='before')
+    @classmethod
+    def strip_username(cls, v):
+        return v.strip() if isinstance(v, str) else v
+
 class UserLogin(BaseModel):
     username: str
     password: str
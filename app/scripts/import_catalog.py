@@ -0,0 +1,97 @@
+# app/scripts/import_catalog.py
+"""Потоковый импорт каталога фильмов из JSONL или CSV.
+
+Запуск:
+    python app/scripts/import_catalog.py movies.jsonl
+    python app/scripts/import_catalog.py movies.csv --batch-size 5000 --dry-run
+    python app/scripts/import_catalog.py movies.jsonl --restart
+    python app/scripts/import_catalog.py movies.jsonl --workers 4
+
+Каждая пачка фиксируется вместе с контрольной точкой, поэтому
+прерванный импорт при повторном запуске продолжается с места остановки
+(--restart читает файл с начала). Неизменившиеся записи пропускаются.
+С --workers N разбор и проверку записей выполняют N процессов, в базу
+пишет по-прежнему один (0 — по числу ядер).
+
+JSONL — по одному JSON-объекту фильма на строку. CSV — заголовок с
+колонками title, year, genre, rating, overview, poster_url (или poster),
+id и picks (slug через ";").
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.database.database import engine, init_db
+from app.services.bulk_loader import DEFAULT_BATCH_SIZE
+from app.services.catalog_import import CatalogImporter, CatalogImportReport
+from app.utils.config import settings
+
+
+def print_progress(report: CatalogImportReport) -> None:
+    load = report.load
+    print(
+        f"\r  записей: {report.records_read:>9}  добавлено: {load.movies_inserted:>9}  "
+        f"пропущено: {load.movies_skipped + report.records_invalid:>7}  "
+        f"{report.records_per_second:>8.0f} зап/с",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Импорт каталога фильмов из JSONL/CSV")
+    parser.add_argument("path", type=Path, help="файл .jsonl или .csv")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="формат, если не следует из расширения")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="записей в одной пачке вставки")
+    parser.add_argument("--created-by", type=int, help="ID пользователя-автора фильмов")
+    parser.add_argument("--dry-run", action="store_true", help="проверить файл и откатить транзакцию")
+    parser.add_argument("--restart", action="store_true", help="не продолжать с контрольной точки")
+    parser.add_argument(
+        "--workers", type=int, default=settings.IMPORT_WORKERS,
+        help="процессов подготовки записей (0 — по числу ядер)",
+    )
+    args = parser.parse_args()
+
+    if not args.path.exists():
+        print(f"❌ Файл не найден: {args.path}", file=sys.stderr)
+        return 1
+
+    init_db()
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        importer = CatalogImporter(
+            conn,
+            batch_size=args.batch_size,
+            created_by=args.created_by,
+            autocommit=not args.dry_run,
+            resume=not args.restart,
+            workers=args.workers,
+        )
+        try:
+            report = importer.run(args.path, fmt=args.format, on_batch=print_progress)
+        except ValueError as e:
+            conn.rollback()
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        finally:
+            print(file=sys.stderr)
+        if args.dry_run:
+            conn.rollback()
+
+    for error in report.errors:
+        print(f"⚠️  строка {error.line}: {error.message}")
+    if report.records_invalid > len(report.errors):
+        print(f"⚠️  ... и еще {report.records_invalid - len(report.errors)} ошибок")
+
+    status = "🔎 Проверено (без записи)" if args.dry_run else "✅ Импортировано"
+    print(f"{status}: {report}")
+    print(f"⏱  Всего: {time.perf_counter() - started:.2f} с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
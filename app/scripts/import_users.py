@@ -0,0 +1,127 @@
+# app/scripts/import_users.py
+"""Массовый импорт пользователей с bcrypt-хешированием в пуле процессов.
+
+Запуск:
+    python app/scripts/import_users.py users.csv
+    python app/scripts/import_users.py users.jsonl --workers 8
+    python app/scripts/import_users.py --generate 10000 --credentials loadtest.csv --rounds 8
+
+CSV — заголовок с колонками username, password, email, is_active,
+is_superuser (обязательны первые две). JSONL — по одному JSON-объекту
+пользователя на строку. --generate создает N пользователей для
+нагрузочных тестов со случайными паролями; пароли можно сохранить в
+--credentials (CSV username,password). --rounds снижает стоимость
+bcrypt для таких пользователей, по умолчанию — как у приложения.
+"""
+import argparse
+import csv
+import json
+import secrets
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.database.database import engine, init_db
+from app.repositories.catalog_cache import on_user_changed
+from app.services.user_import import DEFAULT_USER_BATCH_SIZE, PasswordHasher, UserImporter, UserImportReport
+from app.utils.config import settings
+
+
+def read_users(path: Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                yield {key: value for key, value in row.items() if value not in ("", None)}
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def generate_users(count: int, prefix: str) -> List[dict]:
+    width = len(str(count))
+    return [
+        {
+            "username": f"{prefix}{i:0{width}d}",
+            "email": f"{prefix}{i:0{width}d}@loadtest.kinovzor.ru",
+            "password": secrets.token_urlsafe(12),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def print_progress(report: UserImportReport) -> None:
+    print(
+        f"\r  прочитано: {report.users_read:>8}  добавлено: {report.users_inserted:>8}  "
+        f"пропущено: {report.users_skipped + report.users_invalid:>6}  "
+        f"{report.users_per_second:>7.0f} польз./с",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Массовый импорт пользователей")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("path", type=Path, nargs="?", help="файл .csv или .jsonl")
+    source.add_argument("--generate", type=int, metavar="N", help="создать N пользователей для нагрузочных тестов")
+    parser.add_argument("--prefix", default="loadtest_", help="префикс username для --generate")
+    parser.add_argument("--credentials", type=Path, help="сохранить username,password созданных --generate")
+    parser.add_argument(
+        "--workers", type=int, default=settings.USER_IMPORT_WORKERS,
+        help="процессов bcrypt (0 — по числу ядер)",
+    )
+    parser.add_argument("--rounds", type=int, help="стоимость bcrypt (4-31), по умолчанию как у приложения")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_USER_BATCH_SIZE, help="пользователей в пачке")
+    args = parser.parse_args()
+
+    if args.path is not None and not args.path.exists():
+        print(f"❌ Файл не найден: {args.path}", file=sys.stderr)
+        return 1
+    if args.rounds is not None and not 4 <= args.rounds <= 31:
+        print("❌ --rounds должен быть от 4 до 31", file=sys.stderr)
+        return 1
+
+    if args.generate:
+        users = generate_users(args.generate, args.prefix)
+        if args.credentials:
+            with open(args.credentials, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["username", "password"])
+                writer.writerows((user["username"], user["password"]) for user in users)
+    else:
+        users = read_users(args.path)
+
+    init_db()
+    started = time.perf_counter()
+    with PasswordHasher(args.workers, rounds=args.rounds) as hasher, engine.connect() as conn:
+        print(f"Хеширование в {hasher.workers} процессах", file=sys.stderr)
+        try:
+            report = UserImporter(hasher, batch_size=args.batch_size).run(conn, users, on_batch=print_progress)
+        except ValueError as e:
+            # Уже зафиксированные пачки остаются, повторный запуск их пропустит
+            print(f"\n❌ {e}", file=sys.stderr)
+            return 1
+        finally:
+            print(file=sys.stderr)
+    on_user_changed()
+
+    for error in report.errors:
+        print(f"⚠️  запись {error.record}: {error.message}")
+    if report.users_invalid > len(report.errors):
+        print(f"⚠️  ... и еще {report.users_invalid - len(report.errors)} ошибок")
+
+    print(f"✅ Импортировано: {report}")
+    print(f"🔐 bcrypt: {report.hashes_per_second:.1f} хэшей/с")
+    if args.credentials and args.generate:
+        print(f"🔑 Пароли сохранены в {args.credentials}")
+    print(f"⏱  Всего: {time.perf_counter() - started:.2f} с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# app/scripts/reconcile_counters.py
+"""Сверка счетчиков /stats (таблица counters) с COUNT(*) по таблицам.
+
+Запуск (например, из cron):
+    python app/scripts/reconcile_counters.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+import app.models  # noqa: F401  (регистрация моделей для init_db)
+from app.database.counters import read_counters, reconcile_counters
+from app.database.database import engine, init_db
+
+
+def main() -> int:
+    init_db()
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        drift = reconcile_counters(conn)
+        counters = read_counters(conn)
+
+    for name, (old, new) in drift.items():
+        print(f"⚠️  {name}: {old} -> {new}")
+    print(f"✅ Счетчики: {', '.join(f'{name}={value}' for name, value in counters.items())}")
+    print(f"⏱  {time.perf_counter() - started:.2f} с, исправлено: {len(drift)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
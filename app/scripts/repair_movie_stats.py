@@ -0,0 +1,47 @@
+# app/scripts/repair_movie_stats.py
+"""Пересчет агрегатов movie_stats по таблицам reviews и favorites.
+
+Сумма и число оценок фильма и число добавлений в избранное ведутся
+приращениями при записи отзывов и избранного. Если эти таблицы менялись
+в обход приложения (SQL, импорт, старые версии),
+скрипт пересчитывает агрегаты одним INSERT ... SELECT ... ON CONFLICT:
+недостающие строки статистики создаются, разошедшиеся исправляются.
+
+Запуск:
+    python app/scripts/repair_movie_stats.py
+    python app/scripts/repair_movie_stats.py --movie-id 12 --movie-id 15
+    python app/scripts/repair_movie_stats.py --dry-run
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.database.database import engine, init_db
+from app.repositories.movie_stats import rebuild_stat_aggregates
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Пересчет агрегатов оценок и избранного фильмов")
+    parser.add_argument("--movie-id", type=int, action="append", dest="movie_ids", help="только этот фильм (можно несколько)")
+    parser.add_argument("--dry-run", action="store_true", help="только посчитать расхождения, без записи")
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        repaired = rebuild_stat_aggregates(conn, args.movie_ids)
+        if args.dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+
+    verb = "Расходится" if args.dry_run else "Исправлено"
+    print(f"✅ {verb} строк статистики: {repaired} ({time.perf_counter() - started:.2f} с)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+# app/seeds/__init__.py
+"""Начальные данные каталога в JSON-файлах этого пакета.
+
+    movies.json   фильмы с подборками (slug) и рецензиями
+    picks.json    подборки
+    reviews.json  тестовые рецензии
+
+Файлы читаются только командами заполнения БД через load_seed и не
+кэшируются: импорт модулей приложения не разбирает эти данные и не
+держит их в памяти рабочих процессов.
+"""
+import json
+from pathlib import Path
+from typing import List
+
+SEEDS_DIR = Path(__file__).resolve().parent
+
+
+def load_seed(name: str) -> List[dict]:
+    """Прочитать набор данных name (имя файла без .json)"""
+    with open(SEEDS_DIR / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,222 @@
+# app/services/bulk_loader.py
+"""Пакетная загрузка каталога одной транзакцией.
+
+Вместо SELECT-проверки, commit и refresh на каждый фильм загрузчик
+пишет фильмы, связи с подборками и жанрами пачками по batch_size строк
+через INSERT ... ON CONFLICT (app.repositories.upserts): уже
+существующие фильмы база пропускает сама, без предварительных SELECT.
+Память не зависит от числа записей, поэтому на вход годится и генератор
+из потокового импорта. Транзакцией управляет вызывающий код: все пачки
+фиксируются одним commit (и одним fsync). Полнотекстовый индекс
+обновляется одним INSERT ... SELECT на пачку вместо построчного триггера.
+"""
+import logging
+import time
+from datetime import datetime
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.engine import Connection
+
+from app.database.fts import bulk_movie_search_indexing
+from app.models.genres import MovieGenre
+from app.models.movies import Movie, movie_natural_key, updated_natural_key
+from app.models.picks import Pick
+from app.repositories.genres import get_or_create_genre_ids, set_movie_genres, split_genres
+from app.repositories.upserts import link_movie_picks, pick_pairs, upsert_movies
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+MOVIE_COLUMNS = ("id", "title", "overview", "year", "genre", "rating", "poster_url", "created_by", "created_at")
+MOVIE_DEFAULTS = {**dict.fromkeys(MOVIE_COLUMNS), "rating": 0.0}
+
+
+@dataclass
+class BulkLoadReport:
+    movies_inserted: int = 0
+    movies_skipped: int = 0
+    movies_updated: int = 0
+    picks_linked: int = 0
+    genres_linked: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_inserted(self) -> int:
+        return self.movies_inserted + self.movies_updated + self.picks_linked + self.genres_linked
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_inserted / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "BulkLoadReport") -> None:
+        """Прибавить счетчики другого отчета (время не суммируется)"""
+        self.movies_inserted += other.movies_inserted
+        self.movies_skipped += other.movies_skipped
+        self.movies_updated += other.movies_updated
+        self.picks_linked += other.picks_linked
+        self.genres_linked += other.genres_linked
+
+    def __str__(self) -> str:
+        updated = f", обновлено {self.movies_updated}" if self.movies_updated else ""
+        return (
+            f"фильмов: {self.movies_inserted} (пропущено {self.movies_skipped}{updated}), "
+            f"связей с подборками: {self.picks_linked}, с жанрами: {self.genres_linked}; "
+            f"{self.seconds:.2f} с, {self.rows_per_second:.0f} строк/с"
+        )
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def movie_row(movie: dict) -> dict:
+    """Значения колонок movies из словаря фильма"""
+    row = {column: movie[column] for column in MOVIE_COLUMNS if column in movie}
+    if "poster" in movie and "poster_url" not in row:
+        row["poster_url"] = movie["poster"]
+    return row
+
+
+class BulkMovieLoader:
+    """Загрузчик фильмов из словарей вида ALL_MOVIES в load_all_movies.py.
+
+    Поддерживаются ключи колонок Movie, "poster" как синоним poster_url
+    и "picks" со списком slug подборок. Фильмы с уже занятым id или
+    natural_key (название + год) пропускаются.
+    """
+
+    def __init__(self, connection: Connection, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.conn = connection
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _progress(report: BulkLoadReport, started: float, on_batch) -> None:
+        if on_batch is not None:
+            report.seconds = time.perf_counter() - started
+            on_batch(report)
+
+    def load(
+        self,
+        movies: Iterable[dict],
+        created_by: Optional[int] = None,
+        on_batch: Optional[Callable[[BulkLoadReport], None]] = None,
+    ) -> BulkLoadReport:
+        """Загрузить фильмы; on_batch вызывается после каждой пачки
+        с накопленным отчетом (для вывода прогресса)"""
+        started = time.perf_counter()
+        report = BulkLoadReport()
+
+        pick_ids: Dict[str, int] = dict(self.conn.execute(select(Pick.slug, Pick.id)).all())
+        next_id = (self.conn.execute(select(func.max(Movie.id))).scalar() or 0) + 1
+
+        with bulk_movie_search_indexing(self.conn) as index_for_search:
+            for batch in batched(movies, self.batch_size):
+                now = datetime.utcnow()
+                rows, picks = [], []
+                for movie in batch:
+                    # executemany требует одинаковый набор колонок во всех строках
+                    row = {**MOVIE_DEFAULTS, **movie_row(movie)}
+                    if row["id"] is None:
+                        row["id"] = next_id
+                    next_id = max(next_id, row["id"] + 1)
+                    if row["created_by"] is None:
+                        row["created_by"] = created_by
+                    if row["created_at"] is None:
+                        row["created_at"] = now
+                    rows.append(row)
+                    picks.append(movie.get("picks", []))
+
+                # Фильмы с занятым id или natural_key база пропустит сама
+                inserted_ids = set(upsert_movies(self.conn, rows).values())
+                report.movies_skipped += len(rows) - len(inserted_ids)
+                if not inserted_ids:
+                    self._progress(report, started, on_batch)
+                    continue
+
+                new_ids, pairs, genre_links = [], [], []
+                for row, slugs in zip(rows, picks):
+                    # discard: из строк с одинаковым id вставлена только первая
+                    if row["id"] in inserted_ids:
+                        inserted_ids.discard(row["id"])
+                        new_ids.append(row["id"])
+                        pairs.extend(pick_pairs(row["id"], slugs, pick_ids))
+                        genre_links.extend((row["id"], name) for name in split_genres(row["genre"]))
+
+                index_for_search(new_ids)
+                report.movies_inserted += len(new_ids)
+                report.picks_linked += link_movie_picks(self.conn, pairs)
+                if genre_links:
+                    genre_ids = get_or_create_genre_ids(self.conn, {name for _, name in genre_links})
+                    self.conn.execute(
+                        insert(MovieGenre),
+                        [{"movie_id": movie_id, "genre_id": genre_ids[name]} for movie_id, name in genre_links],
+                    )
+                report.genres_linked += len(genre_links)
+                self._progress(report, started, on_batch)
+
+        report.seconds = time.perf_counter() - started
+        logger.info(f"Пакетная загрузка каталога: {report}")
+        return report
+
+    def update(self, movies: List[dict]) -> BulkLoadReport:
+        """Обновить существующие фильмы (по id, а без id — по natural_key):
+        колонки из записи, жанры и недостающие связи с подборками"""
+        report = BulkLoadReport()
+        if not movies:
+            return report
+
+        keys = [movie_natural_key(movie["title"], movie.get("year")) for movie in movies if movie.get("id") is None]
+        ids_by_key = dict(
+            self.conn.execute(select(Movie.natural_key, Movie.id).where(Movie.natural_key.in_(keys))).all()
+        ) if keys else {}
+        pick_ids: Dict[str, int] = dict(self.conn.execute(select(Pick.slug, Pick.id)).all())
+
+        resolved = []
+        for movie in movies:
+            row = movie_row(movie)
+            movie_id = row.pop("id", None) or ids_by_key.get(movie_natural_key(movie["title"], movie.get("year")))
+            row.pop("created_at", None)
+            if movie_id is None:
+                report.movies_skipped += 1
+                continue
+            resolved.append((movie_id, movie, row))
+
+        # natural_key пересчитывается при изменении названия или года;
+        # недостающая часть ключа и прежний ключ (суффикс дублей) берутся из базы
+        keyed = [movie_id for movie_id, _, row in resolved if "title" in row or "year" in row]
+        stored = {
+            movie_id: (title, year, natural_key)
+            for movie_id, title, year, natural_key in self.conn.execute(
+                select(Movie.id, Movie.title, Movie.year, Movie.natural_key).where(Movie.id.in_(keyed))
+            )
+        } if keyed else {}
+
+        # Строки группируются по набору колонок: executemany требует одинаковый
+        groups: Dict[Tuple[str, ...], List[dict]] = {}
+        pairs, genre_rows = [], {}
+        for movie_id, movie, row in resolved:
+            if "title" in row or "year" in row:
+                title, year, natural_key = stored.get(movie_id, (None, None, None))
+                row["natural_key"] = updated_natural_key(
+                    natural_key, movie_id, row.get("title", title), row.get("year", year)
+                )
+            groups.setdefault(tuple(sorted(row)), []).append({"movie_id": movie_id, **row})
+            pairs.extend(pick_pairs(movie_id, movie.get("picks", []), pick_ids))
+            if "genre" in row:
+                genre_rows[movie_id] = row["genre"]
+
+        for rows in groups.values():
+            # Колонки SET берутся из ключей параметров
+            self.conn.execute(update(Movie.__table__).where(Movie.id == bindparam("movie_id")), rows)
+            report.movies_updated += len(rows)
+        report.picks_linked += link_movie_picks(self.conn, pairs)
+        for movie_id, genre in genre_rows.items():
+            set_movie_genres(self.conn, movie_id, genre)
+            report.genres_linked += len(split_genres(genre))
+        return report
@@ -0,0 +1,376 @@
+# app/services/catalog_import.py
+"""Потоковый импорт каталога из JSONL/CSV.
+
+Файл читается пачками по batch_size записей. Пачка проходит разбор
+JSON, валидацию и нормализацию подборок и жанров (prepare_chunk), а
+затем пакетную вставку BulkMovieLoader. В памяти находится ограниченное
+число пачек, поэтому расход памяти не зависит от размера файла.
+
+Подготовка пачек нагружает процессор, а писать в SQLite может только
+одно соединение. При workers > 1 пачки готовят процессы
+ProcessPoolExecutor, а пишет их по-прежнему одно соединение в исходном
+порядке. Одновременно в работе не больше queue_size пачек: пока
+запись отстает, файл дальше не читается.
+
+Каждая пачка фиксируется отдельной транзакцией вместе с контрольной
+точкой (import_checkpoints): позицией в файле и sha256 прочитанной
+части. Повторный запуск проверяет хэш начала файла и продолжает с
+контрольной точки; если начало изменилось — читает файл заново.
+Записи, хэш которых совпадает с сохраненным в import_record_hashes,
+пропускаются без обращения к movies, поэтому повторный импорт почти
+не изменившегося каталога сводится к чтению файла.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Deque, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.engine import Connection, Row
+
+from app.models.movies import movie_natural_key
+from app.repositories.genres import split_genres
+from app.repositories.imports import get_checkpoint, get_record_hashes, save_checkpoint, save_record_hashes
+from app.schemas.movies import MovieImportRecord
+from app.services.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoadReport, BulkMovieLoader, batched
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# Сколько ошибок сохранять в отчете (остальные только считаются)
+MAX_REPORTED_ERRORS = 20
+
+_CHUNK_SIZE = 1 << 20
+
+
+def detect_format(path: Path) -> str:
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Неизвестный формат файла {path.name}: ожидается .jsonl или .csv")
+
+
+def record_key(movie: dict) -> str:
+    """Ключ записи каталога для таблицы хэшей"""
+    if movie.get("id") is not None:
+        return f"id:{movie['id']}"
+    return f"key:{movie_natural_key(movie['title'], movie.get('year'))}"
+
+
+def record_hash(movie: dict) -> str:
+    payload = json.dumps(movie, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class RecordError:
+    line: int
+    message: str
+
+
+# Сырая запись: номер первой строки и текст JSON (JSONL) или словарь (CSV)
+RawRecord = Tuple[int, Union[str, dict]]
+# Позиция в файле после пачки: смещение, строка, sha256 прочитанного
+Snapshot = Tuple[int, int, str]
+
+
+@dataclass
+class PreparedChunk:
+    """Пачка, готовая к записи: (ключ, хэш, фильм) и ошибки (строка, текст)"""
+    movies: List[Tuple[str, str, dict]] = field(default_factory=list)
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+# ==================== ПОДГОТОВКА ЗАПИСЕЙ ====================
+# Функции уровня модуля: выполняются и в процессах-обработчиках
+
+def parse_record(raw: Union[str, dict]) -> dict:
+    if not isinstance(raw, str):
+        return raw
+    try:
+        record = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"некорректный JSON: {e.msg}")
+    if not isinstance(record, dict):
+        raise ValueError("ожидается JSON-объект")
+    return record
+
+
+def validate_record(raw: dict) -> MovieImportRecord:
+    try:
+        return MovieImportRecord.model_validate(raw)
+    except ValidationError as e:
+        first = e.errors()[0]
+        field_name = ".".join(str(part) for part in first["loc"]) or "запись"
+        raise ValueError(f"{field_name}: {first['msg']}")
+
+
+def normalize_record(record: MovieImportRecord) -> dict:
+    """Подборки — slug в нижнем регистре без повторов, жанры — через ", " """
+    movie = record.model_dump(exclude_none=True)
+    movie["title"] = movie["title"].strip()
+    movie["genre"] = ", ".join(split_genres(movie["genre"]))
+    movie["picks"] = list(dict.fromkeys(
+        slug.strip().lower() for slug in record.picks if slug.strip()
+    ))
+    return movie
+
+
+def prepare_chunk(chunk: List[RawRecord]) -> PreparedChunk:
+    """Разобрать, проверить и нормализовать пачку сырых записей"""
+    prepared = PreparedChunk()
+    for line_no, raw in chunk:
+        try:
+            movie = normalize_record(validate_record(parse_record(raw)))
+        except ValueError as e:
+            prepared.errors.append((line_no, str(e)))
+            continue
+        prepared.movies.append((record_key(movie), record_hash(movie), movie))
+    return prepared
+
+
+@dataclass
+class CatalogImportReport:
+    load: BulkLoadReport = field(default_factory=BulkLoadReport)
+    records_read: int = 0
+    records_invalid: int = 0
+    records_unchanged: int = 0
+    resumed_from_line: int = 0
+    errors: List[RecordError] = field(default_factory=list)
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_read / self.load.seconds if self.load.seconds else 0.0
+
+    def __str__(self) -> str:
+        resumed = f"продолжено со строки {self.resumed_from_line}, " if self.resumed_from_line else ""
+        return (
+            f"{resumed}прочитано записей: {self.records_read}, с ошибками: {self.records_invalid}, "
+            f"без изменений: {self.records_unchanged}; {self.load}"
+        )
+
+
+class _Position:
+    """Сколько файла прочитано: байты/строки и sha256 прочитанного"""
+
+    def __init__(self):
+        self.offset = 0
+        self.line = 0
+        self.hasher = hashlib.sha256()
+
+    def consume(self, raw: bytes) -> None:
+        self.offset += len(raw)
+        self.line += raw.count(b"\n")
+        self.hasher.update(raw)
+
+    @property
+    def digest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def snapshot(self) -> Snapshot:
+        return self.offset, self.line, self.digest
+
+
+class CatalogImporter:
+    """Импорт файла каталога через соединение connection.
+
+    При autocommit=False транзакцией управляет вызывающий код (например,
+    для пробного прогона с откатом), контрольные точки попадают в ту же
+    транзакцию. workers — число процессов подготовки пачек (0 — по числу
+    ядер, 1 — все в текущем процессе), queue_size — сколько пачек может
+    быть в работе одновременно (по умолчанию 2 * workers).
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        created_by: Optional[int] = None,
+        autocommit: bool = True,
+        resume: bool = True,
+        workers: int = 1,
+        queue_size: Optional[int] = None,
+    ):
+        self.conn = connection
+        self.loader = BulkMovieLoader(connection, batch_size=batch_size)
+        self.batch_size = batch_size
+        self.created_by = created_by
+        self.autocommit = autocommit
+        self.resume = resume
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = max(1, queue_size or 2 * self.workers)
+        self.report = CatalogImportReport()
+        self.position = _Position()
+
+    def _error(self, line: int, message: str) -> None:
+        self.report.records_invalid += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(RecordError(line, message))
+        logger.debug(f"Строка {line} пропущена: {message}")
+
+    # ==================== ЧТЕНИЕ С КОНТРОЛЬНОЙ ТОЧКИ ====================
+
+    def _skip_to(self, f: BinaryIO, checkpoint: Optional[Row]) -> None:
+        """Прочитать начало файла до контрольной точки, сверяя его хэш.
+
+        Если начало файла изменилось (или файл стал короче), чтение
+        начинается сначала: неизменные записи отсеет таблица хэшей.
+        """
+        if checkpoint is None or not self.resume:
+            return
+        remaining = checkpoint.position
+        while remaining > 0:
+            chunk = f.read(min(remaining, _CHUNK_SIZE))
+            if not chunk:
+                break
+            self.position.consume(chunk)
+            remaining -= len(chunk)
+
+        if remaining == 0 and self.position.digest == checkpoint.prefix_hash:
+            self.report.resumed_from_line = self.position.line
+            logger.info(f"Импорт продолжается со строки {self.position.line}")
+            return
+
+        logger.warning("Начало файла изменилось после контрольной точки: импорт с начала")
+        f.seek(0)
+        self.position = _Position()
+
+    def _lines(self, f: BinaryIO) -> Iterator[str]:
+        for raw in f:
+            self.position.consume(raw)
+            yield raw.decode("utf-8-sig")
+
+    # ==================== ЭТАПЫ КОНВЕЙЕРА ====================
+
+    def parse(self, f: BinaryIO, fmt: str) -> Iterator[RawRecord]:
+        """Сырые записи файла с номером их первой строки.
+
+        Строки JSONL отдаются текстом (json.loads выполняет обработчик),
+        CSV разбирается здесь же: запись может занимать несколько строк.
+        """
+        lines = self._lines(f)
+        if fmt == "csv":
+            if self.position.offset == 0:
+                header = next(csv.reader(lines), None)
+            else:
+                # Возобновление: заголовок читается отдельно, позиция не меняется
+                at = f.tell()
+                f.seek(0)
+                header = next(csv.reader([f.readline().decode("utf-8-sig")]), None)
+                f.seek(at)
+            if not header:
+                return
+            reader = csv.reader(lines)
+            while True:
+                line_no = self.position.line + 1
+                values = next(reader, None)
+                if values is None:
+                    return
+                if not any(values):
+                    continue
+                self.report.records_read += 1
+                yield line_no, dict(zip(header, values))
+
+        while True:
+            line_no = self.position.line + 1
+            line = next(lines, None)
+            if line is None:
+                return
+            if not line.strip():
+                continue
+            self.report.records_read += 1
+            yield line_no, line
+
+    def chunks(self, f: BinaryIO, fmt: str) -> Iterator[Tuple[List[RawRecord], Snapshot]]:
+        """Пачки сырых записей с позицией файла после каждой: генератор
+        parse ленив и дальше последней записи пачки файл еще не читал"""
+        for chunk in batched(self.parse(f, fmt), self.batch_size):
+            yield chunk, self.position.snapshot()
+
+    def prepare(
+        self, chunks: Iterator[Tuple[List[RawRecord], Snapshot]]
+    ) -> Iterator[Tuple[PreparedChunk, Snapshot]]:
+        """Подготовленные пачки в порядке чтения.
+
+        При workers > 1 пачки готовит пул процессов; очередь ожидающих
+        результатов ограничена queue_size, и пока первая пачка в ней не
+        забрана на запись, следующие не читаются.
+        """
+        if self.workers <= 1:
+            for chunk, snapshot in chunks:
+                yield prepare_chunk(chunk), snapshot
+            return
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        pending: Deque = deque()
+        try:
+            for chunk, snapshot in chunks:
+                pending.append((pool.submit(prepare_chunk, chunk), snapshot))
+                if len(pending) >= self.queue_size:
+                    future, snapshot = pending.popleft()
+                    yield future.result(), snapshot
+            while pending:
+                future, snapshot = pending.popleft()
+                yield future.result(), snapshot
+        finally:
+            # Ошибка записи или прерывание: незапущенные пачки отменяются
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _load_batch(self, prepared: PreparedChunk) -> None:
+        """Новые записи вставить, изменившиеся обновить, неизменные пропустить"""
+        for line_no, message in prepared.errors:
+            self._error(line_no, message)
+        stored = get_record_hashes(self.conn, [key for key, _, _ in prepared.movies])
+        fresh, changed, hashes = [], [], {}
+        for key, content_hash, movie in prepared.movies:
+            if stored.get(key) == content_hash or hashes.get(key) == content_hash:
+                self.report.records_unchanged += 1
+                continue
+            hashes[key] = content_hash
+            (changed if key in stored else fresh).append(movie)
+
+        if fresh:
+            self.report.load.add(self.loader.load(fresh, created_by=self.created_by))
+        if changed:
+            self.report.load.add(self.loader.update(changed))
+        save_record_hashes(self.conn, hashes)
+
+    # ==================== ЗАПУСК ====================
+
+    def run(
+        self,
+        path: Path,
+        fmt: Optional[str] = None,
+        on_batch: Optional[Callable[[CatalogImportReport], None]] = None,
+    ) -> CatalogImportReport:
+        path = Path(path)
+        fmt = fmt or detect_format(path)
+        source = str(path.resolve())
+        started = time.perf_counter()
+
+        with open(path, "rb") as f:
+            self._skip_to(f, get_checkpoint(self.conn, source))
+            for prepared, snapshot in self.prepare(self.chunks(f, fmt)):
+                self._load_batch(prepared)
+                # Позиция — конец этой пачки, а не прочитанного вперед
+                save_checkpoint(self.conn, source, fmt, *snapshot)
+                if self.autocommit:
+                    self.conn.commit()
+                self.report.load.seconds = time.perf_counter() - started
+                if on_batch is not None:
+                    on_batch(self.report)
+
+        save_checkpoint(self.conn, source, fmt, *self.position.snapshot(), status="completed")
+        if self.autocommit:
+            self.conn.commit()
+        self.report.load.seconds = time.perf_counter() - started
+        logger.info(f"Импорт каталога из {path.name}: {self.report}")
+        return self.report
@@ -0,0 +1,65 @@
+# app/services/counters.py
+"""Периодическая сверка счетчиков /stats (app.database.counters).
+
+Триггеры держат счетчики точными при обычной записи. Сверка раз в
+COUNTERS_RECONCILE_SECONDS исправляет редкие расхождения (INSERT OR
+REPLACE, снятые триггеры, ручные правки). Она стоит нескольких COUNT(*),
+поэтому идет в фоне, а не на каждый запрос. Запускается в lifespan
+приложения; для cron есть app/scripts/reconcile_counters.py.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.counters import reconcile_counters
+from app.database.database import async_engine
+from app.repositories.catalog_cache import catalog_cache
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CounterReconciler:
+    """Фоновая сверка счетчиков раз в interval секунд (0 — отключена)"""
+
+    def __init__(self, interval: float, engine: AsyncEngine = async_engine):
+        self.interval = interval
+        self.engine = engine
+        self._task: Optional[asyncio.Task] = None
+
+    async def reconcile(self) -> Dict[str, Tuple[int, int]]:
+        """Сверить счетчики сейчас; возвращает исправленные"""
+        async with self.engine.begin() as conn:
+            drift = await conn.run_sync(reconcile_counters)
+        if drift:
+            details = ", ".join(f"{name}: {old} -> {new}" for name, (old, new) in drift.items())
+            logger.warning(f"Счетчики исправлены при сверке: {details}")
+            catalog_cache.invalidate(("stats",))
+        return drift
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reconcile()
+            except Exception:
+                logger.exception("Сверка счетчиков не удалась, повтор в следующий раз")
+
+    def start(self) -> None:
+        """Запустить периодическую сверку в текущем event loop"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="counters-reconcile")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+counter_reconciler = CounterReconciler(settings.COUNTERS_RECONCILE_SECONDS)
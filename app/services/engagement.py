@@ -0,0 +1,174 @@
+# app/services/engagement.py
+"""Запись действий с фильмами и фоновая свертка аналитики
+(app.repositories.engagement).
+
+EngagementRecorder копит действия в памяти по ключу (фильм, вид, час) и
+сбрасывает их одной транзакцией раз в ENGAGEMENT_FLUSH_SECONDS или по
+достижении ENGAGEMENT_MAX_PENDING действий — как счетчик просмотров,
+запросы в базу сами не пишут. При аварийном завершении теряются
+действия с последнего сброса.
+
+EngagementRollup раз в ENGAGEMENT_ROLLUP_SECONDS сворачивает часы в дни
+и месяцы и уплотняет старые данные. Первый запуск после старта процесса
+пересчитывает все дни, для которых еще хранятся часовые корзины, дальше —
+только вчерашний и текущий день.
+
+Обе задачи запускаются в lifespan приложения.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.database import async_engine
+from app.repositories.catalog_cache import catalog_cache
+from app.repositories.engagement import (
+    KINDS,
+    EventKey,
+    compact_engagement,
+    hour_bucket,
+    record_events,
+    retention_cutoffs,
+    rollup_engagement,
+)
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    """Текущее время UTC без часового пояса, как хранятся корзины"""
+    return datetime.utcnow()
+
+
+class EngagementRecorder:
+    """Буфер действий с фильмами с пачечной записью"""
+
+    def __init__(self, flush_interval: float, max_pending: int, engine: AsyncEngine = async_engine):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.engine = engine
+        # Меняется только из event loop и без await внутри, без блокировок
+        self._pending: Dict[EventKey, int] = {}
+        self._total = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, movie_id: int, kind: str, count: int = 1) -> None:
+        """Учесть действие kind (view, favorite, review) в текущем часе"""
+        if kind not in KINDS:
+            raise ValueError(f"Неизвестный вид действия: {kind}")
+        key = (movie_id, kind, hour_bucket(utcnow()))
+        self._pending[key] = self._pending.get(key, 0) + count
+        self._total += count
+        if self._wakeup is not None and self._total >= self.max_pending:
+            self._wakeup.set()
+
+    @property
+    def total_pending(self) -> int:
+        return self._total
+
+    async def flush(self) -> int:
+        """Записать накопленные действия; возвращает их число"""
+        async with self._flush_lock:
+            events, self._pending, self._total = self._pending, {}, 0
+            if not events:
+                return 0
+            try:
+                async with self.engine.begin() as conn:
+                    await conn.run_sync(record_events, events)
+            except Exception:
+                logger.exception("Не удалось записать действия, повтор при следующем сбросе")
+                for key, count in events.items():
+                    self._pending[key] = self._pending.get(key, 0) + count
+                    self._total += count
+                return 0
+            catalog_cache.invalidate_prefix("trending")
+            return sum(events.values())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Запустить периодический сброс в текущем event loop"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="engagement-flush")
+
+    async def stop(self) -> None:
+        """Остановить периодический сброс и записать остаток"""
+        if self._task is not None:
+            # Как в ViewCounter.stop: идущий сброс сначала дописывается
+            async with self._flush_lock:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+            self._wakeup = None
+        flushed = await self.flush()
+        if flushed:
+            logger.info(f"Записано действий при остановке: {flushed}")
+
+
+class EngagementRollup:
+    """Периодическая свертка корзин и уплотнение (0 — отключена)"""
+
+    def __init__(self, interval: float, engine: AsyncEngine = async_engine):
+        self.interval = interval
+        self.engine = engine
+        self._caught_up = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """Свернуть и уплотнить сейчас; возвращает число затронутых строк"""
+        now = now or utcnow()
+        if self._caught_up:
+            since = (now - timedelta(days=1)).date()
+        else:
+            since = retention_cutoffs(now)["hourly"].date()
+        async with self.engine.begin() as conn:
+            rolled = await conn.run_sync(rollup_engagement, since)
+            compacted = await conn.run_sync(compact_engagement, now)
+        self._caught_up = True
+        catalog_cache.invalidate_prefix("trending")
+        return {"rolled": rolled, "compacted": compacted}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run()
+            except Exception:
+                logger.exception("Свертка аналитики не удалась, повтор в следующий раз")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Запустить периодическую свертку в текущем event loop"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="engagement-rollup")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+engagement_recorder = EngagementRecorder(
+    flush_interval=settings.ENGAGEMENT_FLUSH_SECONDS,
+    max_pending=settings.ENGAGEMENT_MAX_PENDING,
+)
+engagement_rollup = EngagementRollup(settings.ENGAGEMENT_ROLLUP_SECONDS)
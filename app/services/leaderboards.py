@@ -0,0 +1,133 @@
+# app/services/leaderboards.py
+"""Обновление рейтингов фильмов (app.repositories.leaderboards).
+
+Фоновая задача раз в LEADERBOARD_UPDATE_SECONDS перечитывает фильмы,
+помеченные хуками записи, и переставляет их в списках, а раз в
+LEADERBOARD_REFRESH_SECONDS (или когда список области исчерпал запас)
+пересчитывает все списки. Полный пересчет читает весь каталог и
+сортирует его, поэтому выполняется в потоке на синхронном движке и не
+держит event loop; готовые списки подменяются целиком.
+
+Задача запускается в lifespan приложения. Без нее (скрипты, тесты)
+эндпоинт строит и обновляет списки сам при запросе.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.database import async_engine, engine
+from app.repositories.leaderboards import (
+    LeaderboardStore,
+    leaderboards,
+    load_global_mean,
+    load_movies,
+    rank_movies,
+)
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Столько помеченных фильмов дешевле пересчитать полностью
+MAX_INCREMENTAL = 5000
+
+
+class LeaderboardRefresher:
+    """Приращенное и полное обновление хранилища рейтингов"""
+
+    def __init__(
+        self,
+        store: LeaderboardStore,
+        update_interval: float,
+        refresh_interval: float,
+        sync_engine: Engine = engine,
+        engine: AsyncEngine = async_engine,
+    ):
+        self.store = store
+        self.update_interval = update_interval
+        self.refresh_interval = refresh_interval
+        self.sync_engine = sync_engine
+        self.engine = engine
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _rank_all(self):
+        with self.sync_engine.connect() as conn:
+            mean = load_global_mean(conn)
+            movies = load_movies(conn)
+        return mean, rank_movies(movies, mean, self.store.capacity)
+
+    async def rebuild(self) -> None:
+        """Пересчитать все списки"""
+        async with self._lock:
+            started = time.perf_counter()
+            mean, ranked = await asyncio.to_thread(self._rank_all)
+            self.store.install(mean, ranked)
+            logger.info(f"Рейтинги пересчитаны за {time.perf_counter() - started:.2f} с")
+
+    async def update(self) -> int:
+        """Применить пометки хуков; возвращает число перечитанных фильмов"""
+        if not self.store.built or self.store.rebuild_needed:
+            await self.rebuild()
+        async with self._lock:
+            dirty = self.store.take_dirty()
+            if not dirty:
+                return 0
+            if len(dirty) > MAX_INCREMENTAL:
+                self.store.mark_dirty()
+            else:
+                try:
+                    async with self.engine.connect() as conn:
+                        movies = await conn.run_sync(load_movies, list(dirty))
+                except Exception:
+                    self.store.mark_many_dirty(dirty)
+                    raise
+                self.store.apply(dirty, movies)
+        if self.store.rebuild_needed:
+            await self.rebuild()
+        return len(dirty)
+
+    async def ensure_fresh(self) -> None:
+        """Для эндпоинта: построить списки при первом запросе; без фоновой
+        задачи — и применить накопленные пометки"""
+        if not self.store.built or (self._task is None and (self.store.has_dirty or self.store.rebuild_needed)):
+            await self.update()
+
+    async def _run(self) -> None:
+        last_rebuild = time.monotonic()
+        while True:
+            await asyncio.sleep(self.update_interval)
+            try:
+                if self.refresh_interval > 0 and time.monotonic() - last_rebuild >= self.refresh_interval:
+                    self.store.mark_dirty()
+                    last_rebuild = time.monotonic()
+                await self.update()
+            except Exception:
+                logger.exception("Не удалось обновить рейтинги, повтор в следующий раз")
+
+    def start(self) -> None:
+        """Запустить периодическое обновление в текущем event loop"""
+        if self._task is None or self._task.done():
+            # Lock привязывается к циклу при первом ожидании, поэтому
+            # создается заново при запуске
+            self._lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run(), name="leaderboards-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+leaderboard_refresher = LeaderboardRefresher(
+    leaderboards,
+    update_interval=settings.LEADERBOARD_UPDATE_SECONDS,
+    refresh_interval=settings.LEADERBOARD_REFRESH_SECONDS,
+)
@@ -1,78 +1,101 @@
 # app/services/movie_stats.py
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.movie_stats import MovieStat as MovieStatModel
 from app.repositories.movie_stats import MovieStatRepository
 from app.schemas.movie_stats import MovieStatCreate, MovieStatUpdate, MovieStat, MovieStatWithMovie
 from app.exceptions.base import NotFoundException, ConflictException
+from app.repositories.catalog_cache import catalog_cache, on_movie_stat_changed
+from app.services.engagement import engagement_recorder
+from app.services.view_counter import view_counter
 
 class MovieStatService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.repository = MovieStatRepository(db)
-    
-    def get_movie_stat(self, stat_id: int) -> Optional[MovieStat]:
-        stat = self.repository.get_by_id(stat_id)
+
+    @staticmethod
+    def _to_schema(stat: MovieStatModel, with_movie: bool = False):
+        """Статистика с учетом просмотров, еще не записанных в базу"""
+        schema = MovieStatWithMovie if with_movie else MovieStat
+        data = schema.model_validate(stat)
+        data.views_count = (stat.views_count or 0) + view_counter.pending(stat.movie_id)
+        if with_movie and stat.movie is not None:
+            data.movie_title = stat.movie.title
+            data.movie_release_year = stat.movie.year
+        return data
+
+    async def get_movie_stat(self, stat_id: int) -> MovieStatWithMovie:
+        stat = await self.repository.get_by_id(stat_id, with_movie=True)
         if not stat:
             raise NotFoundException("Статистика не найдена")
-        return stat
-    
-    def get_movie_stat_by_movie(self, movie_id: int) -> Optional[MovieStat]:
-        stat = self.repository.get_by_movie_id(movie_id)
+        return self._to_schema(stat, with_movie=True)
+
+    async def get_movie_stat_by_movie(self, movie_id: int) -> MovieStatWithMovie:
+        stat = await self.repository.get_by_movie_id(movie_id, with_movie=True)
         if not stat:
             raise NotFoundException("Статистика для этого фильма не найдена")
-        return stat
-    
-    def get_all_movie_stats(self, skip: int = 0, limit: int = 100) -> List[MovieStat]:
-        return self.repository.get_all(skip, limit)
-    
-    def get_all_movie_stats_with_movies(self, skip: int = 0, limit: int = 100) -> List[MovieStatWithMovie]:
-        stats = self.repository.get_with_movies(skip, limit)
-        result = []
-        for stat in stats:
-            stat_dict = {**stat.__dict__}
-            if hasattr(stat, 'movie'):
-                stat_dict['movie_title'] = stat.movie.title
-                stat_dict['movie_release_year'] = stat.movie.release_year
-            result.append(MovieStatWithMovie(**stat_dict))
-        return result
-    
-    def create_movie_stat(self, stat: MovieStatCreate) -> MovieStat:
+        return self._to_schema(stat, with_movie=True)
+
+    async def get_all_movie_stats(self, skip: int = 0, limit: int = 100) -> List[MovieStat]:
+        return [self._to_schema(stat) for stat in await self.repository.get_all(skip, limit)]
+
+    async def get_all_movie_stats_with_movies(self, skip: int = 0, limit: int = 100) -> List[MovieStatWithMovie]:
+        stats = await self.repository.get_with_movies(skip, limit)
+        return [self._to_schema(stat, with_movie=True) for stat in stats]
+
+    async def create_movie_stat(self, stat: MovieStatCreate) -> MovieStat:
         # Проверяем существование статистики для этого фильма
-        existing_stat = self.repository.get_by_movie_id(stat.movie_id)
+        existing_stat = await self.repository.get_by_movie_id(stat.movie_id)
         if existing_stat:
             raise ConflictException("Статистика для этого фильма уже существует")
-        
-        new_stat = self.repository.create(stat)
+
+        new_stat = await self.repository.create(stat)
         if not new_stat:
             raise NotFoundException("Фильм не найден")
-        
-        return new_stat
-    
-    def update_movie_stat(self, stat_id: int, stat: MovieStatUpdate) -> MovieStat:
-        db_stat = self.repository.get_by_id(stat_id)
-        if not db_stat:
-            raise NotFoundException("Статистика не найдена")
-        
-        updated_stat = self.repository.update(stat_id, stat)
+
+        on_movie_stat_changed(new_stat.movie_id)
+        return self._to_schema(new_stat)
+
+    async def update_movie_stat(self, stat_id: int, stat: MovieStatUpdate) -> MovieStat:
+        updated_stat = await self.repository.update(stat_id, stat)
         if not updated_stat:
             raise NotFoundException("Статистика не найдена")
-        
-        return updated_stat
-    
-    def delete_movie_stat(self, stat_id: int) -> bool:
-        db_stat = self.repository.get_by_id(stat_id)
+
+        on_movie_stat_changed(updated_stat.movie_id)
+        return self._to_schema(updated_stat)
+
+    async def delete_movie_stat(self, stat_id: int) -> bool:
+        db_stat = await self.repository.get_by_id(stat_id)
         if not db_stat:
             raise NotFoundException("Статистика не найдена")
-        
-        return self.repository.delete(stat_id)
-    
-    def increment_views(self, movie_id: int) -> MovieStat:
-        stat = self.repository.increment_views(movie_id)
-        if not stat:
-            raise NotFoundException("Статистика для этого фильма не найдена")
-        return stat
-    
-    def update_average_rating(self, movie_id: int, average_rating: float) -> MovieStat:
-        stat = self.repository.update_average_rating(movie_id, average_rating)
+
+        on_movie_stat_changed(db_stat.movie_id)
+        return await self.repository.delete(stat_id)
+
+    async def increment_views(self, movie_id: int) -> MovieStat:
+        """Учесть просмотр: приращение копится в памяти и записывается
+        в базу пачкой (app.services.view_counter).
+
+        Ответ строится из кэшированного снимка статистики, поэтому
+        просмотр обычно не обращается к базе вовсе. views_count снимка —
+        просмотры без учтенных этим процессом, они прибавляются при ответе.
+        """
+        key = ("movie_stat", movie_id)
+        snapshot = catalog_cache.get(key)
+        if snapshot is None:
+            stat = await self.repository.get_by_movie_id(movie_id)
+            if not stat:
+                raise NotFoundException("Статистика для этого фильма не найдена")
+            snapshot = self._to_schema(stat)
+            snapshot.views_count -= view_counter.counted(movie_id)
+            catalog_cache.set(key, snapshot)
+        view_counter.add(movie_id)
+        engagement_recorder.add(movie_id, "view")
+        return snapshot.model_copy(update={"views_count": snapshot.views_count + view_counter.counted(movie_id)})
+
+    async def update_average_rating(self, movie_id: int, average_rating: float) -> MovieStat:
+        stat = await self.repository.update_average_rating(movie_id, average_rating)
         if not stat:
             raise NotFoundException("Статистика для этого фильма не найдена")
-        return stat
\ No newline at end of file
+        on_movie_stat_changed(movie_id)
+        return self._to_schema(stat)
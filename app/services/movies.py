@@ -1,11 +1,14 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func, desc
+from sqlalchemy import select, or_, desc
 
 from app.models.movies import Movie
-from app.models.reviews import Review
+from app.models.movie_stats import MovieStat
 from app.models.picks import Pick
 from app.models.movie_picks import MoviePick
+from app.exceptions import ConflictError
+from app.repositories.genres import movie_ids_with_genre, set_movie_genres
+from app.repositories.upserts import link_movie_picks, upsert_movies
 from app.schemas.movies import MovieCreate, MovieUpdate, MovieFilters
 
 
@@ -30,7 +33,7 @@ class MovieService:
                 )
             
             if filters.genre and filters.genre != 'all':
-                stmt = stmt.where(Movie.genre == filters.genre)
+                stmt = stmt.where(Movie.id.in_(movie_ids_with_genre(filters.genre)))
             
             if filters.min_rating:
                 stmt = stmt.where(Movie.rating >= filters.min_rating)
@@ -70,26 +73,27 @@ class MovieService:
         movie_dict = movie_data.dict(exclude={'picks'})
         movie_dict['created_by'] = created_by
         
-        # Создаем фильм
-        movie = Movie(**movie_dict)
-        self.db.add(movie)
-        await self.db.flush()
+        # Создаем фильм; дубликат (то же название и год) отсекает natural_key
+        created = await self.db.run_sync(lambda session: upsert_movies(session, [movie_dict]))
+        if not created:
+            raise ConflictError(f"Фильм '{movie_data.title}' ({movie_data.year}) уже существует")
+        movie_id = next(iter(created.values()))
         
-        # Добавляем подборки если указаны
+        # Добавляем подборки если указаны (slug'и разрешаем одним запросом)
+        pick_ids = []
         if movie_data.picks:
-            for pick_slug in movie_data.picks:
-                pick_stmt = select(Pick).where(Pick.slug == pick_slug)
-                pick_result = await self.db.execute(pick_stmt)
-                pick = pick_result.scalar_one_or_none()
-                
-                if pick:
-                    movie_pick = MoviePick(movie_id=movie.id, pick_id=pick.id)
-                    self.db.add(movie_pick)
+            pick_ids = (await self.db.execute(
+                select(Pick.id).where(Pick.slug.in_(movie_data.picks))
+            )).scalars().all()
+        
+        def link(session):
+            link_movie_picks(session, [(movie_id, pick_id) for pick_id in pick_ids])
+            set_movie_genres(session, movie_id, movie_data.genre)
         
+        await self.db.run_sync(link)
         await self.db.commit()
-        await self.db.refresh(movie)
         
-        return movie
+        return await self.db.get(Movie, movie_id)
     
     async def update_movie(self, movie_id: int, movie_update: MovieUpdate) -> Optional[Movie]:
         """Обновить фильм"""
@@ -135,9 +139,11 @@ class MovieService:
         return result.scalars().all()
     
     async def update_movie_rating(self, movie_id: int) -> Optional[float]:
-        """Обновить средний рейтинг фильма на основе рецензий"""
-        # Получаем средний рейтинг из рецензий
-        stmt = select(func.avg(Review.rating)).where(Review.movie_id == movie_id)
+        """Обновить рейтинг фильма по агрегатам оценок из movie_stats
+        (они ведутся при записи отзывов, AVG по отзывам не нужен)"""
+        stmt = select(MovieStat.average_rating).where(
+            MovieStat.movie_id == movie_id, MovieStat.reviews_count > 0
+        )
         result = await self.db.execute(stmt)
         avg_rating = result.scalar()
         
@@ -6,12 +6,25 @@ from sqlalchemy import select, func, desc
 from app.models.reviews import Review
 from app.models.movies import Movie
 from app.models.users import User
+from app.repositories.movie_stats import MovieStatRepository
 from app.schemas.reviews import ReviewCreate, ReviewUpdate
+from app.services.engagement import engagement_recorder
 
 class ReviewService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    async def _apply_rating(self, movie_id: int, rating_delta: float, count_delta: int) -> None:
+        """Агрегаты оценок и рейтинг фильма — в транзакции записи отзыва"""
+        await self.db.flush()
+        average_rating, reviews_count = await MovieStatRepository(self.db).apply_review(
+            movie_id, rating_delta, count_delta
+        )
+        if reviews_count:
+            movie = await self.db.get(Movie, movie_id)
+            if movie:
+                movie.rating = round(average_rating, 1)
+    
     async def get_reviews(self, skip: int = 0, limit: int = 100, 
                          movie_id: Optional[int] = None,
                          user_id: Optional[int] = None) -> List[Review]:
@@ -71,13 +84,10 @@ class ReviewService:
         )
         
         self.db.add(review)
+        await self._apply_rating(movie_id, review.rating, 1)
         await self.db.commit()
         await self.db.refresh(review)
-        
-        # Обновляем средний рейтинг фильма
-        from .movies import MovieService
-        movie_service = MovieService(self.db)
-        await movie_service.update_movie_rating(movie_id)
+        engagement_recorder.add(movie_id, "review")
         
         return review
     
@@ -90,20 +100,18 @@ class ReviewService:
             return None
         
         update_data = review_update.dict(exclude_unset=True)
+        old_rating = review.rating
         
         # Обновляем поля
         for key, value in update_data.items():
             if hasattr(review, key):
                 setattr(review, key, value)
         
+        if review.rating != old_rating:
+            await self._apply_rating(review.movie_id, review.rating - old_rating, 0)
         await self.db.commit()
         await self.db.refresh(review)
         
-        # Обновляем средний рейтинг фильма
-        from .movies import MovieService
-        movie_service = MovieService(self.db)
-        await movie_service.update_movie_rating(review.movie_id)
-        
         return review
     
     async def delete_review(self, review_id: int) -> bool:
@@ -114,14 +122,8 @@ class ReviewService:
         if not review:
             return False
         
-        movie_id = review.movie_id
-        
         await self.db.delete(review)
+        await self._apply_rating(review.movie_id, -review.rating, -1)
         await self.db.commit()
         
-        # Обновляем средний рейтинг фильма
-        from .movies import MovieService
-        movie_service = MovieService(self.db)
-        await movie_service.update_movie_rating(movie_id)
-        
         return True
\ No newline at end of file
@@ -0,0 +1,267 @@
+# app/services/user_import.py
+"""Массовый импорт пользователей с хешированием паролей в пуле процессов.
+
+bcrypt стоит сотни миллисекунд CPU на пароль, поэтому при импорте
+тысяч пользователей время уходит на хеширование, а не на запись.
+PasswordHasher раздает пароли процессам ProcessPoolExecutor порциями,
+UserImporter пишет пользователей пачками через INSERT ... ON CONFLICT
+DO NOTHING. Уже существующие username отсеиваются до хеширования, так
+что повторный импорт того же файла не тратит CPU.
+
+Хэши только bcrypt (pwd_context приложения). rounds позволяет снизить
+стоимость для нагрузочных тестов; verify_password проверяет такие хэши,
+так как стоимость записана в самом хэше.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
+from pydantic import ValidationError
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.repositories.upserts import existing_usernames, insert_users
+from app.schemas.users import UserImportRecord
+from app.services.bulk_loader import batched
+from app.utils.config import settings
+from app.utils.security import get_password_hash, pwd_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_BATCH_SIZE = 500
+
+# Сколько ошибок сохранять в отчете (остальные только считаются)
+MAX_REPORTED_ERRORS = 20
+
+
+# ==================== ХЕШИРОВАНИЕ ====================
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """bcrypt-хэш пароля; rounds — стоимость (по умолчанию как в pwd_context)"""
+    if rounds is None:
+        return get_password_hash(password)
+    return pwd_context.handler("bcrypt").using(rounds=rounds).hash(password)
+
+
+def hash_password_chunk(passwords: List[str], rounds: Optional[int] = None) -> List[str]:
+    """Порция паролей для одного процесса пула"""
+    return [hash_password(password, rounds) for password in passwords]
+
+
+class PasswordHasher:
+    """Пул процессов для bcrypt; workers=0 — по числу ядер.
+
+    В скриптах используется как контекстный менеджер: при выходе пул
+    закрывается. Приложение держит один пул (password_hasher) на все
+    запросы: start/stop вызываются в lifespan, как у view_counter.
+    """
+
+    def __init__(self, workers: int = 0, rounds: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.rounds = rounds
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "PasswordHasher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def stop(self) -> None:
+        """close без блокировки event loop: ожидание процессов уходит в поток"""
+        await asyncio.to_thread(self.close)
+
+    def _submit(self, passwords: Sequence[str]):
+        # Пул создается при первом использовании, если start не вызывали
+        self.start()
+        # По несколько порций на процесс: меньше пересылок между
+        # процессами, а нагрузка все равно выравнивается
+        size = max(1, -(-len(passwords) // (self.workers * 4)))
+        return [
+            self._pool.submit(hash_password_chunk, list(passwords[i:i + size]), self.rounds)
+            for i in range(0, len(passwords), size)
+        ]
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Хэши паролей в том же порядке"""
+        return [hashed for future in self._submit(passwords) for hashed in future.result()]
+
+    async def hash_many_async(self, passwords: Sequence[str]) -> List[str]:
+        """hash_many без блокировки event loop"""
+        chunks = await asyncio.gather(*(asyncio.wrap_future(future) for future in self._submit(passwords)))
+        return [hashed for chunk in chunks for hashed in chunk]
+
+
+def hash_passwords(passwords: Sequence[str], workers: int = 0) -> List[str]:
+    """Захешировать несколько паролей параллельно (для скриптов заполнения БД)"""
+    if len(passwords) <= 1:
+        return [hash_password(password) for password in passwords]
+    with PasswordHasher(workers) as hasher:
+        return hasher.hash_many(passwords)
+
+
+# ==================== ИМПОРТ ====================
+
+@dataclass
+class UserImportError:
+    record: int
+    message: str
+
+
+@dataclass
+class UserImportReport:
+    users_read: int = 0
+    users_inserted: int = 0
+    users_skipped: int = 0
+    users_invalid: int = 0
+    hash_seconds: float = 0.0
+    seconds: float = 0.0
+    errors: List[UserImportError] = field(default_factory=list)
+
+    @property
+    def hashes_per_second(self) -> float:
+        return self.users_inserted / self.hash_seconds if self.hash_seconds else 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        return self.users_inserted / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "read": self.users_read,
+            "inserted": self.users_inserted,
+            "skipped": self.users_skipped,
+            "invalid": self.users_invalid,
+            "hash_seconds": round(self.hash_seconds, 3),
+            "seconds": round(self.seconds, 3),
+            "hashes_per_second": round(self.hashes_per_second, 1),
+            "users_per_second": round(self.users_per_second, 1),
+            "errors": [{"record": error.record, "message": error.message} for error in self.errors],
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"прочитано: {self.users_read}, добавлено: {self.users_inserted}, "
+            f"пропущено: {self.users_skipped}, с ошибками: {self.users_invalid}; "
+            f"{self.seconds:.2f} с ({self.hash_seconds:.2f} с хеширование), "
+            f"{self.users_per_second:.0f} польз./с"
+        )
+
+
+class UserImporter:
+    """Импорт пользователей пачками по batch_size с хешированием в hasher"""
+
+    def __init__(self, hasher: PasswordHasher, batch_size: int = DEFAULT_USER_BATCH_SIZE):
+        self.hasher = hasher
+        self.batch_size = batch_size
+        self.report = UserImportReport()
+        self._position = 0
+
+    def validate(self, records: Iterable[Union[dict, UserImportRecord]]) -> Iterable[UserImportRecord]:
+        for raw in records:
+            self._position += 1
+            self.report.users_read += 1
+            if isinstance(raw, UserImportRecord):
+                yield raw
+                continue
+            try:
+                yield UserImportRecord.model_validate(raw)
+            except ValidationError as e:
+                first = e.errors()[0]
+                field_name = ".".join(str(part) for part in first["loc"]) or "запись"
+                self.report.users_invalid += 1
+                if len(self.report.errors) < MAX_REPORTED_ERRORS:
+                    self.report.errors.append(UserImportError(self._position, f"{field_name}: {first['msg']}"))
+
+    def _fresh(self, db: Union[Session, Connection], batch: List[UserImportRecord]) -> List[UserImportRecord]:
+        """Записи пачки с незанятыми username (повторы внутри пачки отброшены)"""
+        taken = existing_usernames(db, {record.username for record in batch})
+        fresh = {}
+        for record in batch:
+            if record.username in taken or record.username in fresh:
+                self.report.users_skipped += 1
+            else:
+                fresh[record.username] = record
+        return list(fresh.values())
+
+    def _insert(self, db: Union[Session, Connection], records: List[UserImportRecord], hashes: List[str]) -> None:
+        rows = [
+            {
+                "username": record.username,
+                "email": record.email or "",
+                "password_hash": password_hash,
+                "is_active": record.is_active,
+                "is_superuser": record.is_superuser,
+            }
+            for record, password_hash in zip(records, hashes)
+        ]
+        inserted = insert_users(db, rows)
+        self.report.users_inserted += len(inserted)
+        # Занятые между проверкой и вставкой (или по email) пропускаются базой
+        self.report.users_skipped += len(rows) - len(inserted)
+
+    def _hash(self, records: List[UserImportRecord]) -> List[str]:
+        started = time.perf_counter()
+        hashes = self.hasher.hash_many([record.password for record in records])
+        self.report.hash_seconds += time.perf_counter() - started
+        return hashes
+
+    def run(
+        self,
+        connection: Connection,
+        records: Iterable[Union[dict, UserImportRecord]],
+        autocommit: bool = True,
+        on_batch: Optional[Callable[[UserImportReport], None]] = None,
+    ) -> UserImportReport:
+        """Импорт через синхронное соединение (CLI); каждая пачка
+        фиксируется отдельно, если autocommit"""
+        started = time.perf_counter()
+        for batch in batched(self.validate(records), self.batch_size):
+            fresh = self._fresh(connection, batch)
+            if fresh:
+                self._insert(connection, fresh, self._hash(fresh))
+            if autocommit:
+                connection.commit()
+            self.report.seconds = time.perf_counter() - started
+            if on_batch is not None:
+                on_batch(self.report)
+        self.report.seconds = time.perf_counter() - started
+        logger.info(f"Импорт пользователей: {self.report}")
+        return self.report
+
+    async def run_async(self, db: AsyncSession, records: Iterable[Union[dict, UserImportRecord]]) -> UserImportReport:
+        """Импорт из API: хеширование не блокирует event loop, а на его
+        время соединение с БД возвращается в пул"""
+        started = time.perf_counter()
+        for batch in batched(self.validate(records), self.batch_size):
+            fresh = await db.run_sync(lambda session: self._fresh(session, batch))
+            await db.commit()
+            if not fresh:
+                continue
+            hash_started = time.perf_counter()
+            hashes = await self.hasher.hash_many_async([record.password for record in fresh])
+            self.report.hash_seconds += time.perf_counter() - hash_started
+            await db.run_sync(lambda session: self._insert(session, fresh, hashes))
+            await db.commit()
+        self.report.seconds = time.perf_counter() - started
+        logger.info(f"Импорт пользователей: {self.report}")
+        return self.report
+
+
+# Общий пул для импорта через API
+password_hasher = PasswordHasher(settings.USER_IMPORT_WORKERS)
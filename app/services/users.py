@@ -6,6 +6,7 @@ from passlib.context import CryptContext
 
 from app.models.users import User
 from app.models.roles import Role
+from app.repositories.user_cache import on_user_updated
 from app.schemas.users import UserCreate, UserUpdate, UserInDB
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -83,6 +84,8 @@ class UserService:
         if not user:
             return None
         
+        # Снимок в кэше аутентификации хранится по прежнему username
+        previous_username = user.username
         update_data = user_update.dict(exclude_unset=True)
         
         # Обрабатываем пароль отдельно
@@ -102,6 +105,7 @@ class UserService:
                 setattr(user, key, value)
         
         await self.db.commit()
+        on_user_updated(previous_username)
         await self.db.refresh(user)
         
         return user
@@ -112,8 +116,10 @@ class UserService:
         user = result.scalar_one_or_none()
         
         if user:
+            username = user.username
             await self.db.delete(user)
             await self.db.commit()
+            on_user_updated(username)
             return True
         
         return False
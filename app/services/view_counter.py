@@ -0,0 +1,158 @@
+# app/services/view_counter.py
+"""Счетчик просмотров с отложенной записью (write-behind).
+
+Раньше каждый просмотр читал строку movie_stats, увеличивал views_count
+в Python и фиксировал транзакцию: три обращения к базе, потерянные
+приращения при параллельных запросах и fsync на каждый просмотр.
+
+Теперь просмотры копятся в памяти процесса (movie_id -> число) и
+сбрасываются в базу одной транзакцией пачечного
+UPDATE ... SET views_count = views_count + ?:
+    по таймеру    фоновая задача раз в VIEW_COUNTER_FLUSH_SECONDS
+                  (запускается в lifespan приложения)
+    по размеру    когда накопилось VIEW_COUNTER_MAX_PENDING просмотров,
+                  та же задача будится раньше срока
+    при остановке последний сброс в lifespan
+
+Запросы только меняют словарь в памяти и сами в базу не пишут: сброс
+идет в фоновой задаче на своем соединении, пока соединения запросов
+заняты чтением. Без запущенной задачи (скрипты) нужно вызывать flush.
+
+counted(movie_id) — все просмотры фильма, учтенные этим процессом
+(записанные и ожидающие): по нему эндпоинт досчитывает кэшированный
+снимок статистики, не читая базу на каждый просмотр.
+
+При аварийном завершении процесса теряются просмотры, накопленные с
+последнего сброса (не больше интервала). Если сброс не удался, просмотры
+возвращаются в буфер и уходят со следующим.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import AsyncSessionLocal
+from app.repositories.leaderboards import leaderboards
+from app.repositories.movie_stats import MovieStatRepository
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Буфер просмотров фильмов с периодическим сбросом в movie_stats"""
+
+    def __init__(
+        self,
+        flush_interval: float,
+        max_pending: int,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.session_factory = session_factory
+        # Буфер меняется только из event loop и без await внутри, поэтому
+        # без блокировок
+        self._pending: Dict[int, int] = {}
+        self._total = 0
+        # Отправленные в базу просмотры (с начала работы процесса)
+        self._flushed: Dict[int, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ==================== БУФЕР ====================
+
+    def add(self, movie_id: int, count: int = 1) -> int:
+        """Учесть просмотры; возвращает число несохраненных просмотров фильма"""
+        pending = self._pending.get(movie_id, 0) + count
+        self._pending[movie_id] = pending
+        self._total += count
+        if self._wakeup is not None and self.should_flush:
+            self._wakeup.set()
+        return pending
+
+    def pending(self, movie_id: int) -> int:
+        """Просмотры фильма, еще не записанные в базу"""
+        return self._pending.get(movie_id, 0)
+
+    def counted(self, movie_id: int) -> int:
+        """Все просмотры фильма, учтенные процессом: записанные и ожидающие"""
+        return self._flushed.get(movie_id, 0) + self._pending.get(movie_id, 0)
+
+    @property
+    def total_pending(self) -> int:
+        return self._total
+
+    @property
+    def should_flush(self) -> bool:
+        return self._total >= self.max_pending
+
+    def _take(self) -> Dict[int, int]:
+        increments, self._pending, self._total = self._pending, {}, 0
+        for movie_id, count in increments.items():
+            self._flushed[movie_id] = self._flushed.get(movie_id, 0) + count
+        return increments
+
+    def _put_back(self, increments: Dict[int, int]) -> None:
+        for movie_id, count in increments.items():
+            self._flushed[movie_id] -= count
+            self.add(movie_id, count)
+
+    # ==================== СБРОС ====================
+
+    async def flush(self) -> int:
+        """Записать накопленные просмотры; возвращает их число"""
+        async with self._flush_lock:
+            increments = self._take()
+            if not increments:
+                return 0
+            try:
+                async with self.session_factory() as db:
+                    await MovieStatRepository(db).add_views(increments)
+            except Exception:
+                logger.exception("Не удалось записать просмотры, повтор при следующем сбросе")
+                self._put_back(increments)
+                return 0
+            leaderboards.mark_many_dirty(increments)
+            return sum(increments.values())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Запустить периодический сброс в текущем event loop"""
+        if self._task is None or self._task.done():
+            # Event привязывается к циклу, поэтому создается при запуске
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="view-counter-flush")
+
+    async def stop(self) -> None:
+        """Остановить периодический сброс и записать остаток"""
+        if self._task is not None:
+            # Отмена посреди записи потеряла бы уже взятые из буфера
+            # просмотры: идущий сброс сначала дописывается
+            async with self._flush_lock:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+            self._wakeup = None
+        flushed = await self.flush()
+        if flushed:
+            logger.info(f"Записано просмотров при остановке: {flushed}")
+
+
+view_counter = ViewCounter(
+    flush_interval=settings.VIEW_COUNTER_FLUSH_SECONDS,
+    max_pending=settings.VIEW_COUNTER_MAX_PENDING,
+)
@@ -11,13 +11,86 @@ class Settings:
     DEBUG: bool = True
     
     # Параметры базы данных
-    DATABASE_URL: str = f"sqlite:///{BASE_DIR}/movies.db"
+    DATABASE_URL: str = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/movies.db")
+    
+    # Профиль SQLite, применяется к каждому соединению (app/database/sqlite.py)
+    SQLITE_TUNING: bool = os.getenv("SQLITE_TUNING", "1") == "1"
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KIB: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    SQLITE_FOREIGN_KEYS: bool = os.getenv("SQLITE_FOREIGN_KEYS", "0") == "1"
+    
+    # Каталог шаблонных снимков БД для быстрого сброса (app/database/snapshots.py)
+    DB_TEMPLATES_DIR: str = os.getenv("DB_TEMPLATES_DIR", str(BASE_DIR / ".db_templates"))
+    
+    # Пул соединений
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
     
     # JWT настройки
     JWT_SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Кэш чтения каталога (в памяти процесса)
+    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", "1024"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    
+    # Кэш пользователей для get_current_user (снимки по subject токена)
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "4096"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    
+    # HTTP-кэширование ответов каталога (клиент перепроверяет по ETag)
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+    
+    # Пул потоков для bcrypt (логин/регистрация) и допуск задач в него
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+    PASSWORD_HASH_RETRY_AFTER: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+    
+    # Импорт каталога: процессы подготовки пачек (0 — по числу ядер)
+    IMPORT_WORKERS: int = int(os.getenv("IMPORT_WORKERS", "1"))
+    
+    # Массовый импорт пользователей: процессы bcrypt (0 — по числу ядер)
+    # и предел числа пользователей в одном запросе к API
+    USER_IMPORT_WORKERS: int = int(os.getenv("USER_IMPORT_WORKERS", "0"))
+    USER_IMPORT_MAX_USERS: int = int(os.getenv("USER_IMPORT_MAX_USERS", "1000"))
+    
+    # Счетчик просмотров: сброс накопленных в памяти просмотров в базу
+    # раз в столько секунд или по достижении стольких просмотров
+    VIEW_COUNTER_FLUSH_SECONDS: float = float(os.getenv("VIEW_COUNTER_FLUSH_SECONDS", "5"))
+    VIEW_COUNTER_MAX_PENDING: int = int(os.getenv("VIEW_COUNTER_MAX_PENDING", "1000"))
+    
+    # Сверка счетчиков /stats с COUNT(*) раз в столько секунд (0 — отключена)
+    COUNTERS_RECONCILE_SECONDS: float = float(os.getenv("COUNTERS_RECONCILE_SECONDS", "3600"))
+    
+    # Рейтинги фильмов (app/repositories/leaderboards.py): длина досок и
+    # запас списков, веса байесовского рейтинга, приращенное обновление
+    # раз в LEADERBOARD_UPDATE_SECONDS и полный пересчет раз в
+    # LEADERBOARD_REFRESH_SECONDS (0 — только по необходимости)
+    LEADERBOARD_SIZE: int = int(os.getenv("LEADERBOARD_SIZE", "100"))
+    LEADERBOARD_SLACK: int = int(os.getenv("LEADERBOARD_SLACK", "50"))
+    LEADERBOARD_PRIOR_VOTES: float = float(os.getenv("LEADERBOARD_PRIOR_VOTES", "10"))
+    LEADERBOARD_FAVORITE_WEIGHT: float = float(os.getenv("LEADERBOARD_FAVORITE_WEIGHT", "0.5"))
+    LEADERBOARD_VIEW_WEIGHT: float = float(os.getenv("LEADERBOARD_VIEW_WEIGHT", "0.05"))
+    LEADERBOARD_UPDATE_SECONDS: float = float(os.getenv("LEADERBOARD_UPDATE_SECONDS", "5"))
+    LEADERBOARD_REFRESH_SECONDS: float = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "3600"))
+    
+    # Аналитика действий (app/repositories/engagement.py): сброс буфера
+    # событий, свертка часов в дни и месяцы и сроки хранения журнала,
+    # часовых и дневных корзин (месячные хранятся всегда)
+    ENGAGEMENT_FLUSH_SECONDS: float = float(os.getenv("ENGAGEMENT_FLUSH_SECONDS", "10"))
+    ENGAGEMENT_MAX_PENDING: int = int(os.getenv("ENGAGEMENT_MAX_PENDING", "1000"))
+    ENGAGEMENT_ROLLUP_SECONDS: float = float(os.getenv("ENGAGEMENT_ROLLUP_SECONDS", "300"))
+    ENGAGEMENT_RAW_RETENTION_DAYS: int = int(os.getenv("ENGAGEMENT_RAW_RETENTION_DAYS", "7"))
+    ENGAGEMENT_HOURLY_RETENTION_DAYS: int = int(os.getenv("ENGAGEMENT_HOURLY_RETENTION_DAYS", "14"))
+    ENGAGEMENT_DAILY_RETENTION_DAYS: int = int(os.getenv("ENGAGEMENT_DAILY_RETENTION_DAYS", "400"))
+    
     # CORS настройки
     CORS_ORIGINS: List[str] = ["*"]
     
@@ -1,22 +1,17 @@
 # app/utils/data_loader.py
 import logging
-import hashlib
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.database.database import SessionLocal
 from app.models.movies import Movie
-from app.models.picks import Pick
-from app.models.movie_picks import MoviePick
 from app.models.users import User
+from app.repositories.upserts import link_movie_picks, pick_pairs, upsert_picks
+from app.seeds import load_seed
+from app.services.user_import import hash_passwords
 
 logger = logging.getLogger(__name__)
 
-def get_password_hash(password: str) -> str:
-    """Простая функция для хэширования пароля (для демо-целей)"""
-    # В реальном приложении используйте: from passlib.context import CryptContext
-    # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    # return pwd_context.hash(password)
-    return hashlib.sha256(password.encode()).hexdigest()
+MOVIE_FIELDS = ("title", "year", "rating", "genre", "poster_url", "overview")
 
 def load_initial_movies():
     """Загрузка начальных фильмов в БД"""
@@ -27,12 +22,14 @@ def load_initial_movies():
         
         if user_count == 0:
             logger.info("👤 Создание тестовых пользователей...")
+            # bcrypt, три пароля параллельно
+            admin_hash, user_hash, moderator_hash = hash_passwords(["1234"] * 3)
             
             # Создаем администратора
             admin = User(
                 username="admin",
                 email="admin@kinovzor.ru",
-                password_hash=get_password_hash("1234"),  # Исправлено: password_hash вместо hashed_password
+                password_hash=admin_hash,
                 is_active=True,
                 is_superuser=True
             )
@@ -42,7 +39,7 @@ def load_initial_movies():
             user = User(
                 username="user",
                 email="user@kinovzor.ru",
-                password_hash=get_password_hash("1234"),  # Исправлено
+                password_hash=user_hash,
                 is_active=True,
                 is_superuser=False
             )
@@ -52,7 +49,7 @@ def load_initial_movies():
             moderator = User(
                 username="moderator",
                 email="moderator@kinovzor.ru",
-                password_hash=get_password_hash("1234"),  # Исправлено
+                password_hash=moderator_hash,
                 is_active=True,
                 is_superuser=False
             )
@@ -79,546 +76,30 @@ def load_initial_movies():
         
         logger.info("🔄 Загрузка начальных данных...")
         
-        # Основные фильмы из вашего списка
+        # Фильмы, подборки и связи между ними из app/seeds
+        seed_movies = load_seed("movies")
         initial_movies = [
             Movie(
-                title="Побег из Шоушенка",
-                year=1994,
-                rating=9.3,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film1/200/300",
-                overview="Банкир Энди Дюфрейн, обвинённый в убийстве жены и её любовника, попадает в тюрьму Шоушенк.",
+                **{field: movie_data[field] for field in MOVIE_FIELDS},
                 created_by=created_by_id
-            ),
-            Movie(
-                title="Тёмный рыцарь",
-                year=2008,
-                rating=9.0,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film2/200/300",
-                overview="Бэтмен вступает в смертельную игру с Джокером, чья цель — погрузить город в хаос.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Начало",
-                year=2010,
-                rating=8.8,
-                genre="Фантастика",
-                poster_url="https://picsum.photos/seed/film3/200/300",
-                overview="Профессиональный вор, специализирующийся на проникновении в сны, получает шанс на искупление.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Интерстеллар",
-                year=2014,
-                rating=8.6,
-                genre="Фантастика",
-                poster_url="https://picsum.photos/seed/film4/200/300",
-                overview="Команда исследователей отправляется через червоточину в поисках нового дома для человечества.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Форрест Гамп",
-                year=1994,
-                rating=8.9,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film5/200/300",
-                overview="История простодушного Форреста, который становится свидетелем важнейших событий в истории США.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Матрица",
-                year=1999,
-                rating=8.7,
-                genre="Фантастика",
-                poster_url="https://picsum.photos/seed/film6/200/300",
-                overview="Программист Нео узнаёт, что реальность — всего лишь симуляция, созданная машинами.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Однажды в… Голливуде",
-                year=2019,
-                rating=7.7,
-                genre="Комедия",
-                poster_url="https://picsum.photos/seed/film7/200/300",
-                overview="Актёр Рик Далтон и его дублёр Клифф Бут пытаются найти себя в меняющемся Голливуде 60-х.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Паразиты",
-                year=2019,
-                rating=8.5,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film8/200/300",
-                overview="Бедная семья постепенно захватывает места в доме богатых, притворяясь специалистами.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Бегущий по лезвию 2049",
-                year=2017,
-                rating=8.0,
-                genre="Фантастика",
-                poster_url="https://picsum.photos/seed/film9/200/300",
-                overview="Новый бегущий по лезвию раскрывает тайну, способную изменить отношения людей и репликантов.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Криминальное чтиво",
-                year=1994,
-                rating=8.9,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film10/200/300",
-                overview="Переплетающиеся истории гангстеров, боксёра и грабителей в Лос-Анджелесе.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Крёстный отец",
-                year=1972,
-                rating=9.2,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film11/200/300",
-                overview="Сага о мафиозном клане Корлеоне и передаче власти от отца к сыну.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Крёстный отец 2",
-                year=1974,
-                rating=9.0,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film12/200/300",
-                overview="Параллельная история молодого Вито и взросления Майкла Корлеоне.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Список Шиндлера",
-                year=1993,
-                rating=9.0,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film13/200/300",
-                overview="Немецкий промышленник спасает сотни евреев во время Холокоста.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Зелёная миля",
-                year=1999,
-                rating=9.0,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film14/200/300",
-                overview="Тюремный надзиратель встречает осуждённого с необычным даром.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Властелин колец: Братство Кольца",
-                year=2001,
-                rating=8.8,
-                genre="Фэнтези",
-                poster_url="https://picsum.photos/seed/film15/200/300",
-                overview="Хоббит Фродо отправляется в опасное путешествие, чтобы уничтожить Кольцо Всевластья.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Властелин колец: Две крепости",
-                year=2002,
-                rating=8.8,
-                genre="Фэнтези",
-                poster_url="https://picsum.photos/seed/film16/200/300",
-                overview="Братство распалось, но борьба с силами Саурона продолжается на разных фронтах.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Властелин колец: Возвращение короля",
-                year=2003,
-                rating=8.9,
-                genre="Фэнтези",
-                poster_url="https://picsum.photos/seed/film17/200/300",
-                overview="Финальная битва за Средиземье и последняя попытка уничтожить Кольцо.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Бойцовский клуб",
-                year=1999,
-                rating=8.8,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film18/200/300",
-                overview="Офисный работник создаёт подпольный клуб, где мужчины избивают друг друга ради ощущения жизни.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Пираты Карибского моря: Проклятие Чёрной жемчужины",
-                year=2003,
-                rating=8.0,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film19/200/300",
-                overview="Экстравагантный капитан Джек Воробей ввязывается в приключение с проклятыми пиратами.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Гладиатор",
-                year=2000,
-                rating=8.5,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film20/200/300",
-                overview="Римский полководец становится рабом и выходит на арену, чтобы отомстить за семью.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Титаник",
-                year=1997,
-                rating=8.0,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film21/200/300",
-                overview="История любви на фоне крушения легендарного лайнера «Титаник».",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Индиана Джонс: В поисках утраченного ковчега",
-                year=1981,
-                rating=8.4,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film22/200/300",
-                overview="Археолог Индиана Джонс пытается опередить нацистов в поисках Ковчега Завета.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Назад в будущее",
-                year=1985,
-                rating=8.5,
-                genre="Фантастика",
-                poster_url="https://picsum.photos/seed/film23/200/300",
-                overview="Подросток Марти МакФлай случайно отправляется в прошлое на машине времени.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Терминатор 2: Судный день",
-                year=1991,
-                rating=8.5,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film24/200/300",
-                overview="Киборг из будущего должен защитить мальчика Джона Коннора от более совершенной машины убийства.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Чужой",
-                year=1979,
-                rating=8.4,
-                genre="Ужасы",
-                poster_url="https://picsum.photos/seed/film25/200/300",
-                overview="Экипаж космического корабля сталкивается с неизвестной формой жизни.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Чужие",
-                year=1986,
-                rating=8.3,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film26/200/300",
-                overview="Рипли возвращается на планету, где впервые столкнулся с ксеноморфом, но теперь там целая колония.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Город Бога",
-                year=2002,
-                rating=8.6,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film27/200/300",
-                overview="История роста преступности в трущобах Рио-де-Жанейро глазами подростков.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Красота по-американски",
-                year=1999,
-                rating=8.4,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film28/200/300",
-                overview="Кризис среднего возраста толкает главного героя на попытку изменить свою жизнь.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Большой Лебовски",
-                year=1998,
-                rating=8.1,
-                genre="Комедия",
-                poster_url="https://picsum.photos/seed/film29/200/300",
-                overview="Флегматичный Чувак оказывается втянутым в детективную историю из-за ошибки с личностью.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Амели",
-                year=2001,
-                rating=8.3,
-                genre="Комедия",
-                poster_url="https://picsum.photos/seed/film30/200/300",
-                overview="Застенчивая Амели решает тайно помогать людям вокруг и менять их жизнь к лучшему.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Молчание ягнят",
-                year=1991,
-                rating=8.6,
-                genre="Триллер",
-                poster_url="https://picsum.photos/seed/film31/200/300",
-                overview="Молодая агент ФБР обращается за помощью к заключённому маньяку Ганнибалу Лектеру.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Семь",
-                year=1995,
-                rating=8.6,
-                genre="Триллер",
-                poster_url="https://picsum.photos/seed/film32/200/300",
-                overview="Два детектива охотятся за серийным убийцей, вдохновляющимся семью смертными грехами.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Престиж",
-                year=2006,
-                rating=8.5,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film33/200/300",
-                overview="Два фокусника превращают соперничество в разрушительную одержимость.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Остров проклятых",
-                year=2010,
-                rating=8.1,
-                genre="Триллер",
-                poster_url="https://picsum.photos/seed/film34/200/300",
-                overview="Маршал США прибывает в психиатрическую клинику на острове, чтобы расследовать исчезновение пациентки.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="В джазе только девушки",
-                year=1959,
-                rating=8.5,
-                genre="Комедия",
-                poster_url="https://picsum.photos/seed/film35/200/300",
-                overview="Два музыканта переодеваются женщинами, чтобы скрыться от гангстеров.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Таксист",
-                year=1976,
-                rating=8.3,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film36/200/300",
-                overview="Одинокий таксист постепенно теряет связь с реальностью на фоне ночного Нью-Йорка.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Пролетая над гнездом кукушки",
-                year=1975,
-                rating=8.7,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film37/200/300",
-                overview="Харизматичный заключённый попадает в психиатрическую клинику и сталкивается с жестким порядком.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Ла-Ла Ленд",
-                year=2016,
-                rating=8.0,
-                genre="Мюзикл",
-                poster_url="https://picsum.photos/seed/film38/200/300",
-                overview="Джазовый музыкант и актриса пытаются построить карьеру и сохранить отношения.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Безумный Макс: Дорога ярости",
-                year=2015,
-                rating=8.1,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film39/200/300",
-                overview="В постапокалиптической пустыне беглецы пытаются уйти от тирана на боевой фуре.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Социальная сеть",
-                year=2010,
-                rating=7.7,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film40/200/300",
-                overview="История создания Facebook и конфликта между его основателями.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Гравитация",
-                year=2013,
-                rating=7.7,
-                genre="Фантастика",
-                poster_url="https://picsum.photos/seed/film41/200/300",
-                overview="Двое астронавтов пытаются выжить после катастрофы на орбите Земли.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Выживший",
-                year=2015,
-                rating=7.8,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film42/200/300",
-                overview="Охотник Хью Гласс, оставленный умирать, пытается добраться до тех, кто его предал.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Джанго освобождённый",
-                year=2012,
-                rating=8.4,
-                genre="Вестерн",
-                poster_url="https://picsum.photos/seed/film43/200/300",
-                overview="Освобождённый раб объединяется с охотником за головами, чтобы спасти жену.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Мстители: Финал",
-                year=2019,
-                rating=8.4,
-                genre="Боевик",
-                poster_url="https://picsum.photos/seed/film44/200/300",
-                overview="Герои объединяются, чтобы исправить последствия щелчка Таноса.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Храброе сердце",
-                year=1995,
-                rating=8.3,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film45/200/300",
-                overview="Шотландский воин Уильям Уоллес поднимает восстание против английской короны.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Лица со шрамами",
-                year=1983,
-                rating=8.3,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film46/200/300",
-                overview="Иммигрант Тони Монтана поднимается на вершину криминального мира Майами.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Реквием по мечте",
-                year=2000,
-                rating=8.3,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film47/200/300",
-                overview="История нескольких людей, чьи мечты разрушаются под тяжестью зависимостей.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Под покровом ночи",
-                year=2016,
-                rating=7.5,
-                genre="Триллер",
-                poster_url="https://picsum.photos/seed/film48/200/300",
-                overview="Героиня читает мрачный роман бывшего мужа, который отражает их прошлое.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Преступление и наказание (советская экранизация)",
-                year=1969,
-                rating=7.9,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film49/200/300",
-                overview="Экранизация романа Достоевского о преступлении, раскаянии и поиске смысла.",
-                created_by=created_by_id
-            ),
-            Movie(
-                title="Нефть",
-                year=2007,
-                rating=8.1,
-                genre="Драма",
-                poster_url="https://picsum.photos/seed/film50/200/300",
-                overview="Амбициозный нефтяник строит империю и теряет остатки человечности.",
-                created_by=created_by_id
-            ),
+            )
+            for movie_data in seed_movies
         ]
         
-         # Добавляем фильмы в БД
+        # Добавляем фильмы в БД (flush назначает id для связей с подборками)
         session.add_all(initial_movies)
-        session.commit()
+        session.flush()
         
         # Создаем подборки если их нет
-        picks_data = [
-            {"name": "Хиты", "slug": "hits", "description": "Самые популярные фильмы"},
-            {"name": "Новинки", "slug": "new", "description": "Новые поступления"},
-            {"name": "Классика", "slug": "classic", "description": "Великие классические фильмы"},
-        ]
-        
-        picks = {}
-        for pick_data in picks_data:
-            pick = session.query(Pick).filter(Pick.slug == pick_data["slug"]).first()
-            if not pick:
-                pick = Pick(**pick_data)
-                session.add(pick)
-                session.commit()
-            picks[pick.slug] = pick
+        picks = upsert_picks(session, load_seed("picks"))
         
-        # Добавляем фильмы в подборки на основе вашего списка
-        movie_picks = [
-            (1, ["hits", "classic"]),     # Побег из Шоушенка
-            (2, ["hits"]),                # Тёмный рыцарь
-            (3, ["hits", "new"]),         # Начало
-            (4, ["hits", "new"]),         # Интерстеллар
-            (5, ["classic"]),             # Форрест Гамп
-            (6, ["classic"]),             # Матрица
-            (7, ["new"]),                 # Однажды в… Голливуде
-            (8, ["hits", "new"]),         # Паразиты
-            (9, ["new"]),                 # Бегущий по лезвию 2049
-            (10, ["classic"]),            # Криминальное чтиво
-            (11, ["classic", "hits"]),    # Крёстный отец
-            (12, ["classic"]),            # Крёстный отец 2
-            (13, ["classic", "hits"]),    # Список Шиндлера
-            (14, ["hits", "classic"]),    # Зелёная миля
-            (15, ["hits", "classic"]),    # Властелин колец: Братство Кольца
-            (16, ["classic"]),            # Властелин колец: Две крепости
-            (17, ["hits", "classic"]),    # Властелин колец: Возвращение короля
-            (18, ["classic"]),            # Бойцовский клуб
-            (19, ["hits"]),               # Пираты Карибского моря
-            (20, ["classic"]),            # Гладиатор
-            (21, ["classic", "hits"]),    # Титаник
-            (22, ["classic"]),            # Индиана Джонс
-            (23, ["classic"]),            # Назад в будущее
-            (24, ["classic", "hits"]),    # Терминатор 2
-            (25, ["classic"]),            # Чужой
-            (26, ["classic"]),            # Чужие
-            (27, ["hits"]),               # Город Бога
-            (28, ["classic"]),            # Красота по-американски
-            (29, ["classic"]),            # Большой Лебовски
-            (30, ["hits"]),               # Амели
-            (31, ["classic"]),            # Молчание ягнят
-            (32, ["classic", "hits"]),    # Семь
-            (33, ["hits"]),               # Престиж
-            (34, ["hits"]),               # Остров проклятых
-            (35, ["classic"]),            # В джазе только девушки
-            (36, ["classic"]),            # Таксист
-            (37, ["classic"]),            # Пролетая над гнездом кукушки
-            (38, ["new"]),                # Ла-Ла Ленд
-            (39, ["hits", "new"]),        # Безумный Макс: Дорога ярости
-            (40, ["new"]),                # Социальная сеть
-            (41, ["new"]),                # Гравитация
-            (42, ["new"]),                # Выживший
-            (43, ["hits"]),               # Джанго освобождённый
-            (44, ["hits", "new"]),        # Мстители: Финал
-            (45, ["classic"]),            # Храброе сердце
-            (46, ["classic"]),            # Лица со шрамами
-            (47, ["hits"]),               # Реквием по мечте
-            (48, ["new"]),                # Под покровом ночи
-            (49, ["classic"]),            # Преступление и наказание
-            (50, ["hits"]),               # Нефть
-        ]
-        
-        for movie_id, pick_slugs in movie_picks:
-            for slug in pick_slugs:
-                pick = picks.get(slug)
-                if pick:
-                    # Проверяем, не добавлен ли уже фильм в эту подборку
-                    existing = session.query(MoviePick).filter(
-                        MoviePick.movie_id == movie_id,
-                        MoviePick.pick_id == pick.id
-                    ).first()
-                    if not existing:
-                        movie_pick = MoviePick(movie_id=movie_id, pick_id=pick.id)
-                        session.add(movie_pick)
+        # Добавляем фильмы в подборки; уже существующие связи пропускаются
+        # через ON CONFLICT DO NOTHING
+        link_movie_picks(session, [
+            pair
+            for movie, movie_data in zip(initial_movies, seed_movies)
+            for pair in pick_pairs(movie.id, movie_data["picks"], picks)
+        ])
         
         session.commit()
         
@@ -668,33 +149,7 @@ def add_test_reviews():
         movies = session.query(Movie).limit(10).all()
         
         # Тестовые рецензии
-        test_reviews = [
-            {
-                "text": "Фильм о силе надежды и достоинства, который мягко подводит к мощному катарсису и долго не отпускает после финала.",
-                "rating": 9.5,
-                "author_name": "Киноман"
-            },
-            {
-                "text": "Один из тех редких случаев, когда душевность и драматизм идеально уравновешены.",
-                "rating": 9.0,
-                "author_name": "Критик"
-            },
-            {
-                "text": "Нолан превращает супергеройский фильм в мрачную криминальную драму с одним из лучших злодеев в истории кино.",
-                "rating": 9.2,
-                "author_name": "Рецензент"
-            },
-            {
-                "text": "Интеллектуальный блокбастер, который предлагает зрителю собрать головоломку из снов и воспоминаний.",
-                "rating": 8.8,
-                "author_name": "Кинообозреватель"
-            },
-            {
-                "text": "Космическая драма о родительской любви и цене прогресса, совмещающая научные идеи и искренние эмоции.",
-                "rating": 8.7,
-                "author_name": "Научный журналист"
-            },
-        ]
+        test_reviews = load_seed("reviews")
         
         reviews = []
         for i, movie in enumerate(movies):
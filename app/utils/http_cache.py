@@ -0,0 +1,71 @@
+# app/utils/http_cache.py
+"""Условные GET-запросы: ETag / If-None-Match.
+
+Ответ рендерится в байты один раз (render_json) и в таком виде кладется
+в кэш вместе с ETag, поэтому повторный запрос неизменившейся страницы
+не сериализует JSON заново, а при совпадении ETag отдает пустой 304.
+Last-Modified не отдается: время рендера записи кэша не совпадает со
+временем изменения данных, и If-Modified-Since мог бы отдать 304 на
+устаревшую версию. Строгий ETag от содержимого этого лишен.
+"""
+import hashlib
+import json
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.utils.config import settings
+
+
+class RenderedJSON(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def render_json(payload: Any) -> RenderedJSON:
+    """Сериализовать ответ и вычислить строгий ETag по его содержимому"""
+    body = json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return RenderedJSON(
+        body=body,
+        etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+    )
+
+
+def public_cache_control() -> str:
+    return f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+
+
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Для If-None-Match используется слабое сравнение
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+def conditional_response(
+    request: Request,
+    rendered: RenderedJSON,
+    cache_control: Optional[str] = None,
+) -> Response:
+    """200 с телом или 304 без тела, если у клиента актуальная версия"""
+    headers = {
+        "ETag": rendered.etag,
+        "Cache-Control": cache_control or public_cache_control(),
+    }
+    if cache_control == PRIVATE_CACHE_CONTROL:
+        headers["Vary"] = "Authorization"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
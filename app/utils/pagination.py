@@ -0,0 +1,76 @@
+# app/utils/pagination.py
+"""Keyset (cursor) пагинация.
+
+Курсор — непрозрачная base64-строка с ключом сортировки последней
+записи страницы. Следующая страница выбирается условием
+``(k1, k2, ...) < (v1, v2, ...)`` по индексу, поэтому глубокие страницы
+стоят столько же, сколько первая (в отличие от OFFSET).
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import String, literal, tuple_, type_coerce
+from sqlalchemy.sql import Select
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """Курсор поврежден или относится к другой сортировке"""
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError("Некорректный курсор") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Некорректный курсор")
+    return values
+
+
+def keyset_paginate(
+    stmt: Select,
+    key_columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """Добавить к запросу сортировку по ключу (по убыванию), условие курсора и LIMIT.
+
+    Ключевые колонки сравниваются и возвращаются в "сыром" виде, как они
+    хранятся в SQLite: даты, записанные CURRENT_TIMESTAMP и SQLAlchemy,
+    имеют разный текстовый формат, и сравнение с распарсенным datetime
+    ломало бы порядок внутри одной секунды.
+    """
+    raw_columns = [type_coerce(column, String) for column in key_columns]
+
+    if cursor:
+        values = decode_cursor(cursor, len(raw_columns))
+        stmt = stmt.where(
+            tuple_(*raw_columns) < tuple_(*[literal(value, String) for value in values])
+        )
+
+    return (
+        stmt.add_columns(*[column.label(f"cursor_{i}") for i, column in enumerate(raw_columns)])
+        .order_by(*[column.desc() for column in key_columns])
+        .limit(limit + 1)
+    )
+
+
+def split_page(rows: Sequence[Any], limit: int, key_size: int) -> Tuple[List[Any], Optional[str]]:
+    """Разделить результат keyset-запроса на объекты страницы и курсор следующей"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1][-key_size:]) if has_more else None
+    return [row[0] for row in rows], next_cursor
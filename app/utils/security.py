@@ -3,15 +3,32 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.utils.config import settings
+from app.utils.worker_pool import BoundedExecutor
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt занимает CPU на сотни миллисекунд, поэтому из async-кода
+# хеширование выполняется в отдельном ограниченном пуле
+password_pool = BoundedExecutor(
+    "password-hash",
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """verify_password в пуле; PoolSaturatedError при перегрузке"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """get_password_hash в пуле; PoolSaturatedError при перегрузке"""
+    return await password_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,90 @@
+# app/utils/worker_pool.py
+"""Ограниченный пул потоков для CPU-тяжелых задач из async-кода.
+
+Задача выполняется вне event loop, а число принятых задач (выполняемые +
+ожидающие в очереди) ограничено: при переполнении новая задача сразу
+отклоняется, и вызывающий код может ответить 503, а не копить очередь.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class PoolSaturatedError(RuntimeError):
+    """Все рабочие потоки заняты и очередь заполнена"""
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, workers: int, queue_limit: int, samples: int = 1024):
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Последние замеры ожидания в очереди для перцентилей, мс
+        self._waits: "deque[float]" = deque(maxlen=samples)
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_ms_total = 0.0
+        self.run_ms_total = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Выполнить func(*args) в пуле или сразу отклонить при переполнении"""
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise PoolSaturatedError(f"Пул {self.name} перегружен")
+            self._in_flight += 1
+            self.submitted += 1
+
+        enqueued_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                self._record(started_at - enqueued_at, finished_at - started_at)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _record(self, wait: float, run: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.wait_ms_total += wait * 1000
+            self.run_ms_total += run * 1000
+            self._waits.append(wait * 1000)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self._in_flight,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": completed,
+                "failed": self.failed,
+                "wait_ms_avg": round(self.wait_ms_total / completed, 2) if completed else 0.0,
+                "wait_ms_p95": round(waits[int(len(waits) * 0.95)], 2) if waits else 0.0,
+                "wait_ms_max": round(waits[-1], 2) if waits else 0.0,
+                "run_ms_avg": round(self.run_ms_total / completed, 2) if completed else 0.0,
+            }
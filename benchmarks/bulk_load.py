@@ -0,0 +1,68 @@
+"""Бенчмарк загрузки каталога: построчные commit против BulkMovieLoader.
+
+Построчная загрузка (как раньше в load_all_movies.py) меряется на
+небольшом каталоге, пакетная — на полном размере.
+
+Запуск:
+    python benchmarks/bulk_load.py [размер каталога] [размер для построчной загрузки]
+"""
+import sys
+import time
+
+from common import PICKS, synthetic_movies, temp_database
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import Movie, MoviePick, Pick
+from app.services.bulk_loader import BulkMovieLoader
+
+
+def load_row_by_row(engine, movies) -> float:
+    """Прежняя схема: проверка, commit и refresh на каждый фильм и связь"""
+    started = time.perf_counter()
+    with Session(engine) as session:
+        picks_map = {pick.slug: pick.id for pick in session.query(Pick).all()}
+        for movie_data in movies:
+            if session.query(Movie).filter(Movie.id == movie_data["id"]).first():
+                continue
+            movie = Movie(**{k: v for k, v in movie_data.items() if k != "picks"})
+            session.add(movie)
+            session.commit()
+            session.refresh(movie)
+            for slug in movie_data["picks"]:
+                existing = session.query(MoviePick).filter(
+                    MoviePick.movie_id == movie.id,
+                    MoviePick.pick_id == picks_map[slug],
+                ).first()
+                if not existing:
+                    session.add(MoviePick(movie_id=movie.id, pick_id=picks_map[slug]))
+            session.commit()
+    return time.perf_counter() - started
+
+
+def run(size: int, row_size: int):
+    print(f"{'способ':<12} | {'фильмов':>8} | {'секунд':>7} | {'фильмов/с':>10} | {'строк/с':>9}")
+
+    with temp_database() as engine:
+        with engine.begin() as conn:
+            conn.execute(insert(Pick.__table__), PICKS)
+        seconds = load_row_by_row(engine, list(synthetic_movies(row_size)))
+        # фильм + 2 подборки + жанры (в среднем 1.5)
+        print(f"{'построчно':<12} | {row_size:>8} | {seconds:>7.2f} | {row_size / seconds:>10.0f} | {row_size * 4.5 / seconds:>9.0f}")
+
+    with temp_database() as engine:
+        with engine.begin() as conn:
+            conn.execute(insert(Pick.__table__), PICKS)
+            report = BulkMovieLoader(conn).load(synthetic_movies(size))
+        print(
+            f"{'пакетно':<12} | {report.movies_inserted:>8} | {report.seconds:>7.2f} | "
+            f"{report.movies_inserted / report.seconds:>10.0f} | {report.rows_per_second:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+    )
@@ -0,0 +1,56 @@
+"""Бенчмарк чтения каталога: N+1 запрос подборок против пакетной загрузки.
+
+Запуск:
+    python benchmarks/catalog_queries.py [размер каталога ...]
+"""
+import sys
+
+from common import QueryCounter, async_engine_for, best_of, run_async, seed_catalog, temp_database
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Movie, MoviePick, Pick
+from app.repositories.catalog import CatalogRepository
+
+
+async def list_movies_n_plus_one(db: AsyncSession):
+    """Прежняя реализация GET /movies: отдельный запрос подборок на каждый фильм"""
+    result = []
+    for movie in (await db.execute(select(Movie))).scalars().all():
+        picks = (await db.execute(
+            select(Pick.name)
+            .join(MoviePick, MoviePick.pick_id == Pick.id)
+            .where(MoviePick.movie_id == movie.id)
+        )).all()
+        result.append({"id": movie.id, "picks": [p[0] for p in picks]})
+    return result
+
+
+def run(sizes):
+    print(f"{'фильмов':>8} | {'N+1: запросов':>13} {'мс':>9} | {'пакетно: запросов':>17} {'мс':>9}")
+    for size in sizes:
+        with temp_database() as engine:
+            seed_catalog(engine, size)
+            async_engine = async_engine_for(engine)
+            row = [size]
+            for loader in (
+                list_movies_n_plus_one,
+                lambda db: CatalogRepository(db).fetch(select(Movie)),
+            ):
+                async def load():
+                    async with AsyncSession(async_engine) as db:
+                        await loader(db)
+
+                def once():
+                    run_async(load())
+
+                with QueryCounter(async_engine.sync_engine) as counter:
+                    once()
+                row += [counter.count, best_of(once)]
+            run_async(async_engine.dispose())
+            print(f"{row[0]:>8} | {row[1]:>13} {row[2]:>9.1f} | {row[3]:>17} {row[4]:>9.1f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000])
@@ -0,0 +1,115 @@
+"""Общие помощники для бенчмарков: временная БД, синтетический каталог, счетчик запросов."""
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.base import Base
+from app.models import Movie, MoviePick, Pick, User  # noqa: F401
+from app.models.favorites import Favorite  # noqa: F401
+from app.services.bulk_loader import BulkMovieLoader
+
+GENRES = ["Драма", "Боевик", "Фантастика", "Комедия", "Триллер", "Криминал", "Мелодрама"]
+# Словарь для описаний, чтобы полнотекстовому поиску было что различать
+WORDS = [
+    "ограбление", "детектив", "космос", "любовь", "война", "семья", "месть",
+    "побег", "тюрьма", "город", "дорога", "тайна", "остров", "мечта", "банк",
+    "корабль", "робот", "школа", "деревня", "зима", "лето", "поезд", "музыка",
+    "художник", "шпион", "королева", "пустыня", "океан", "гонка", "дракон",
+]
+PICKS = [
+    {"id": 1, "name": "Хиты", "slug": "hits"},
+    {"id": 2, "name": "Новинки", "slug": "new"},
+    {"id": 3, "name": "Классика", "slug": "classic"},
+]
+
+
+@contextmanager
+def temp_database():
+    """Временная файловая SQLite БД со всеми таблицами приложения"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{tmp_dir}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+def async_engine_for(engine):
+    """Асинхронный движок (aiosqlite) к той же БД, что и engine"""
+    return create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+
+
+# Один event loop на весь бенчмарк: соединения aiosqlite привязаны к циклу
+_runner = asyncio.Runner()
+
+
+def run_async(coro):
+    """Выполнить корутину в общем event loop бенчмарка"""
+    return _runner.run(coro)
+
+
+def synthetic_movies(count: int, seed: int = 42):
+    """Генератор синтетических записей каталога"""
+    rnd = random.Random(seed)
+    text_rnd = random.Random(seed + 1)
+    started = datetime(2020, 1, 1)
+    for movie_id in range(1, count + 1):
+        yield {
+            "id": movie_id,
+            "title": f"Фильм {movie_id}",
+            "overview": f"Синтетическое описание фильма номер {movie_id}: "
+                        + " ".join(text_rnd.sample(WORDS, 6)),
+            "year": rnd.randint(1950, 2024),
+            "genre": ", ".join(rnd.sample(GENRES, rnd.randint(1, 2))),
+            "rating": round(rnd.uniform(5.0, 9.5), 1),
+            "poster_url": f"https://picsum.photos/seed/film{movie_id}/200/300",
+            "created_at": started + timedelta(minutes=movie_id),
+            "picks": rnd.sample([p["slug"] for p in PICKS], 2),
+        }
+
+
+def seed_catalog(engine, count: int):
+    """Заполнить БД синтетическим каталогом (по 2 подборки на фильм)"""
+    with engine.begin() as conn:
+        conn.execute(insert(Pick.__table__), PICKS)
+        return BulkMovieLoader(conn, batch_size=5000).load(synthetic_movies(count))
+
+
+class QueryCounter:
+    """Подсчет SQL запросов, отправленных через движок"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время выполнения func за repeat попыток, в миллисекундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
@@ -0,0 +1,88 @@
+"""Бенчмарк отзывчивости event loop под нагрузкой на БД.
+
+Параллельно с тяжелыми запросами поиска (без кэша) опрашивается /health.
+Пока запросы к SQLite выполняются в потоке aiosqlite, event loop свободен
+и задержка /health остается порядка миллисекунд; при синхронной сессии
+каждый запрос блокировал бы цикл целиком.
+
+Запуск:
+    python benchmarks/concurrency.py [размер каталога]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from common import async_engine_for, run_async, seed_catalog, temp_database
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import get_async_db
+from main import app
+
+CONCURRENCY = 16
+QUERIES = ["ограбление", "космос", "тюрьма", "дракон"]
+
+
+async def ping_health(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def search_load(client: httpx.AsyncClient, requests: int) -> float:
+    async def worker(worker_id: int):
+        for i in range(requests // CONCURRENCY):
+            query = QUERIES[(worker_id + i) % len(QUERIES)]
+            response = await client.get("/api/v1/search", params={"q": query})
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(i) for i in range(CONCURRENCY)])
+    return (time.perf_counter() - started) * 1000
+
+
+async def measure(requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        pinger = asyncio.create_task(ping_health(client, stop))
+        await asyncio.sleep(0.2)
+        elapsed = await search_load(client, requests)
+        stop.set()
+        return elapsed, await pinger
+
+
+def run(size: int, requests: int = 160):
+    with temp_database() as engine:
+        seed_catalog(engine, size)
+        async_engine = async_engine_for(engine)
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_db
+        try:
+            elapsed, latencies = run_async(measure(requests))
+        finally:
+            app.dependency_overrides.clear()
+            run_async(async_engine.dispose())
+
+    latencies.sort()
+    print(f"каталог: {size} фильмов, {requests} запросов /search, параллельно {CONCURRENCY}")
+    print(f"поиск: {elapsed:.0f} мс всего, {requests / elapsed * 1000:.0f} запросов/с")
+    print(
+        f"/health во время нагрузки: медиана {statistics.median(latencies):.1f} мс, "
+        f"p95 {latencies[int(len(latencies) * 0.95)]:.1f} мс, максимум {latencies[-1]:.1f} мс"
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,57 @@
+"""Бенчмарк условных GET: полный ответ каталога против 304 по If-None-Match.
+
+Запуск:
+    python benchmarks/conditional_get.py [размер каталога]
+"""
+import sys
+
+from common import async_engine_for, best_of, seed_catalog, temp_database
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import get_async_db
+from app.repositories.catalog_cache import catalog_cache
+from main import app
+
+REQUESTS = 200
+
+
+def run(size: int):
+    with temp_database() as engine:
+        seed_catalog(engine, size)
+        session_factory = async_sessionmaker(async_engine_for(engine), expire_on_commit=False)
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_db
+        catalog_cache.clear()
+        try:
+            with TestClient(app) as client:
+                first = client.get("/api/v1/movies", params={"limit": 100})
+                etag = first.headers["etag"]
+
+                def full():
+                    for _ in range(REQUESTS):
+                        client.get("/api/v1/movies", params={"limit": 100})
+
+                def not_modified():
+                    for _ in range(REQUESTS):
+                        client.get(
+                            "/api/v1/movies",
+                            params={"limit": 100},
+                            headers={"If-None-Match": etag},
+                        )
+
+                print(f"каталог: {size} фильмов, страница 100 фильмов, {REQUESTS} запросов")
+                print(f"{'ответ':>6} | {'байт тела':>10} | {'мс':>9}")
+                print(f"{200:>6} | {len(first.content):>10} | {best_of(full, 3):>9.1f}")
+                print(f"{304:>6} | {0:>10} | {best_of(not_modified, 3):>9.1f}")
+        finally:
+            app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
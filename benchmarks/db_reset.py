@@ -0,0 +1,68 @@
+"""Бенчмарк сброса БД: пересоздание с заполнением против шаблонного снимка.
+
+Сравниваются три способа получить заполненную БД с каталогом заданного
+размера:
+    пересоздание   create_all + заполнение (как раньше в reset_db_and_seed.py)
+    в файл         копия шаблона онлайн-API резервного копирования
+    в память       копия шаблона в БД в памяти (фикстура на тест)
+
+Запуск:
+    python benchmarks/db_reset.py [размер каталога ...]
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+from common import PICKS, best_of, synthetic_movies
+
+from sqlalchemy import create_engine, insert, text
+
+from app.database.base import Base
+from app.database.snapshots import DatabaseTemplate
+from app.models import Pick
+from app.services.bulk_loader import BulkMovieLoader
+
+
+def catalog_template(directory: Path, count: int) -> DatabaseTemplate:
+    def seed(conn):
+        conn.execute(insert(Pick.__table__), PICKS)
+        BulkMovieLoader(conn, batch_size=5000).load(synthetic_movies(count))
+
+    return DatabaseTemplate(f"bench{count}", seed=seed, seed_data=lambda: {"movies": count}, directory=directory)
+
+
+def rebuild(path: Path, template: DatabaseTemplate) -> None:
+    path.unlink(missing_ok=True)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        template.seed(conn)
+    engine.dispose()
+
+
+def run(sizes):
+    print(f"{'фильмов':>8} | {'пересоздание, мс':>16} | {'в файл, мс':>10} | {'в память, мс':>12} | {'шаблон, МБ':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for size in sizes:
+            template = catalog_template(tmp / "templates", size)
+            template.build()
+            target = tmp / "reset.db"
+
+            rebuild_ms = best_of(lambda: rebuild(target, template), repeat=1)
+            restore_ms = best_of(lambda: template.restore(target))
+            memory_ms = best_of(lambda: template.clone_in_memory().close())
+
+            engine = template.memory_engine()
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT count(*) FROM movies")).scalar() == size
+            engine.dispose()
+
+            print(
+                f"{size:>8} | {rebuild_ms:>16.0f} | {restore_ms:>10.1f} | "
+                f"{memory_ms:>12.1f} | {template.path.stat().st_size / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [50, 5000, 50000])
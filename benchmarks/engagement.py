@@ -0,0 +1,114 @@
+"""Бенчмарк аналитики действий: запись пачками и чтение окон из сверток.
+
+Запись: N просмотров по одному INSERT с фиксацией на каждый против
+одного сброса буфера (record_events: журнал + часовые корзины).
+
+Чтение: топ-20 по просмотрам за 24 часа и за 7 дней на истории
+событий за 14 дней — GROUP BY по журналу, где каждое событие — строка
+(как при записи без буфера), против часовых корзин (24h) и дневных
+сверток (7d).
+
+Запуск:
+    python benchmarks/engagement.py [событий в истории ...]
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+
+from common import async_engine_for, best_of, run_async, seed_catalog, temp_database
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.engagement import EngagementEvent
+from app.repositories.engagement import hour_bucket, record_events, rollup_engagement, trending
+
+MOVIES = 1000
+WRITES = 2000
+HISTORY_DAYS = 14
+
+
+def write_per_event(engine, now: datetime) -> None:
+    for _ in range(WRITES):
+        with engine.begin() as conn:
+            conn.execute(insert(EngagementEvent.__table__), {
+                "movie_id": random.randint(1, MOVIES), "kind": "view", "count": 1, "occurred_at": now,
+            })
+
+
+def write_batched(engine, now: datetime) -> None:
+    events = {}
+    for _ in range(WRITES):
+        key = (random.randint(1, MOVIES), "view", hour_bucket(now))
+        events[key] = events.get(key, 0) + 1
+    with engine.begin() as conn:
+        record_events(conn, events)
+
+
+def fill_history(engine, total: int, now: datetime) -> None:
+    """История: total просмотров за HISTORY_DAYS дней, записанных по
+    одному событию на строку (как без буфера), и корзины по ним"""
+    rnd = random.Random(7)
+    seconds = HISTORY_DAYS * 24 * 3600
+    with engine.begin() as conn:
+        for start in range(0, total, 50000):
+            conn.execute(insert(EngagementEvent.__table__), [
+                {
+                    "movie_id": int(rnd.paretovariate(1.2)) % MOVIES + 1,
+                    "kind": "view",
+                    "count": 1,
+                    "occurred_at": now - timedelta(seconds=rnd.randrange(seconds)),
+                }
+                for _ in range(min(50000, total - start))
+            ])
+        conn.execute(text(
+            "INSERT INTO engagement_hourly (bucket, movie_id, views, favorites, reviews) "
+            "SELECT strftime('%Y-%m-%d %H:00:00.000000', occurred_at), movie_id, sum(count), 0, 0 "
+            "FROM engagement_events GROUP BY 1, 2"
+        ))
+        rollup_engagement(conn, (now - timedelta(days=HISTORY_DAYS)).date())
+
+
+async def raw_top(db: AsyncSession, since: datetime):
+    return (await db.execute(
+        select(EngagementEvent.movie_id, func.sum(EngagementEvent.count).label("views"))
+        .where(EngagementEvent.occurred_at >= since, EngagementEvent.kind == "view")
+        .group_by(EngagementEvent.movie_id)
+        .order_by(func.sum(EngagementEvent.count).desc())
+        .limit(20)
+    )).all()
+
+
+def run(sizes):
+    now = datetime.utcnow()
+    with temp_database() as engine:
+        seed_catalog(engine, MOVIES)
+        per_event_ms = best_of(lambda: write_per_event(engine, now), repeat=1)
+        batched_ms = best_of(lambda: write_batched(engine, now), repeat=1)
+        print(f"запись {WRITES} просмотров: по одному {per_event_ms:.0f} мс, пачкой {batched_ms:.1f} мс")
+
+    print(f"{'событий':>9} | {'журнал 24h':>10} | {'часы 24h':>8} | {'журнал 7d':>9} | {'дни 7d':>7}  (мс)")
+    for size in sizes:
+        with temp_database() as engine:
+            seed_catalog(engine, MOVIES)
+            fill_history(engine, size, now)
+            async_engine = async_engine_for(engine)
+
+            def measure(query):
+                async def once():
+                    async with AsyncSession(async_engine) as db:
+                        return await query(db)
+                return best_of(lambda: run_async(once()), repeat=3)
+
+            try:
+                raw_day = measure(lambda db: raw_top(db, now - timedelta(hours=23)))
+                hourly = measure(lambda db: trending(db, "24h", "views", 20, now))
+                raw_week = measure(lambda db: raw_top(db, now - timedelta(days=6)))
+                daily = measure(lambda db: trending(db, "7d", "views", 20, now))
+            finally:
+                run_async(async_engine.dispose())
+            print(f"{size:>9} | {raw_day:>10.2f} | {hourly:>8.2f} | {raw_week:>9.2f} | {daily:>7.2f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,112 @@
+"""Бенчмарк времени импорта приложения (холодный старт рабочего процесса).
+
+Модуль импортируется в отдельном процессе с python -X importtime, из
+отчета берутся собственное и накопленное время каждого модуля. Из
+нескольких запусков берется лучший (первый, прогревочный, компилирует
+.pyc и не учитывается). Выводятся самые дорогие модули приложения и
+сторонних пакетов.
+
+Бенчмарк проверочный: код возврата 1, если импорт дольше --budget-ms,
+собственное время какого-либо модуля app.* больше --module-budget-ms
+или при импорте читаются начальные данные (app/seeds).
+
+Запуск:
+    python benchmarks/import_time.py [--target main] [--budget-ms 3000]
+"""
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Импорт приложения не должен загружать данные начального заполнения
+FORBIDDEN_MODULES = ("app.utils.data_loader",)
+FORBIDDEN_FILES = ("seeds/movies.json", "seeds/picks.json", "seeds/reviews.json")
+
+
+@dataclass
+class ModuleCost:
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(target: str) -> Dict[str, ModuleCost]:
+    """Стоимость импорта модулей по отчету -X importtime"""
+    code = (
+        "import builtins, io\n"
+        "_open = io.open\n"
+        "def _tracked(file, *args, **kwargs):\n"
+        f"    if str(file).endswith({FORBIDDEN_FILES!r}):\n"
+        "        raise SystemExit(f'seed read on import: {file}')\n"
+        "    return _open(file, *args, **kwargs)\n"
+        "builtins.open = io.open = _tracked\n"
+        f"import {target}\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        costs[name] = ModuleCost(name, int(self_us), int(cumulative_us))
+    return costs
+
+
+def best_run(target: str, runs: int) -> Dict[str, ModuleCost]:
+    measure(target)
+    return min((measure(target) for _ in range(runs)), key=lambda costs: costs[target].cumulative_us)
+
+
+def print_table(title: str, modules: List[ModuleCost]) -> None:
+    print(f"\n{title}")
+    print(f"  {'модуль':<45} | {'своё, мс':>9} | {'всего, мс':>9}")
+    for module in modules:
+        print(f"  {module.name:<45} | {module.self_us / 1000:>9.1f} | {module.cumulative_us / 1000:>9.1f}")
+
+
+def run(target: str, runs: int, budget_ms: float, module_budget_ms: float, top: int) -> int:
+    costs = best_run(target, runs)
+    total_ms = costs[target].cumulative_us / 1000
+    ours = [cost for name, cost in costs.items() if name.split(".")[0] in ("app", target)]
+    theirs = [cost for name, cost in costs.items() if name.split(".")[0] not in ("app", target)]
+
+    print(f"import {target}: {total_ms:.0f} мс (лучший из {runs}), модулей: {len(costs)}")
+    print_table("Модули приложения по собственному времени:", sorted(ours, key=lambda c: -c.self_us)[:top])
+    print_table("Сторонние модули по собственному времени:", sorted(theirs, key=lambda c: -c.self_us)[:top])
+
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"import {target} занимает {total_ms:.0f} мс (бюджет {budget_ms:.0f} мс)")
+    for cost in ours:
+        if cost.name != target and cost.self_us / 1000 > module_budget_ms:
+            failures.append(f"{cost.name}: {cost.self_us / 1000:.1f} мс (бюджет {module_budget_ms:.0f} мс)")
+    failures.extend(f"{name} импортируется при старте приложения" for name in FORBIDDEN_MODULES if name in costs)
+
+    print()
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Время импорта в пределах бюджета")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="main", help="импортируемый модуль")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=3000)
+    parser.add_argument("--module-budget-ms", type=float, default=50)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(run(args.target, args.runs, args.budget_ms, args.module_budget_ms, args.top))
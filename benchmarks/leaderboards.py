@@ -0,0 +1,85 @@
+"""Бенчмарк рейтингов: сортировка в SQL на каждый запрос против списков в памяти.
+
+На каталогах разного размера со случайной статистикой сравнивается
+страница (20 фильмов) доски top-rated по жанру:
+    SQL          ORDER BY байесовского рейтинга по всем фильмам жанра
+                 с LIMIT на каждый запрос
+    в памяти     срез предрасчитанного списка (LeaderboardStore.page)
+Отдельно замеряются обновление 100 помеченных фильмов и полный пересчет.
+
+Запуск:
+    python benchmarks/leaderboards.py [число фильмов ...]
+"""
+import sys
+
+from common import best_of, seed_catalog, temp_database
+
+from sqlalchemy import func, select, text
+
+from app.models.genres import Genre, MovieGenre
+from app.models.movie_stats import MovieStat
+from app.models.movies import Movie
+from app.repositories.leaderboards import LeaderboardStore, load_global_mean, load_movies, rank_movies
+from app.utils.config import settings
+
+GENRE = "драма"
+PAGE = 20
+DIRTY = 100
+
+
+def fill_stats(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO movie_stats (movie_id, views_count, rating_sum, reviews_count, favorites_count) "
+            "SELECT id, abs(random()) % 10000, 0, abs(random()) % 50, abs(random()) % 200 FROM movies"
+        ))
+        conn.execute(text("UPDATE movie_stats SET rating_sum = reviews_count * (1 + abs(random()) % 900 / 100.0)"))
+        conn.execute(text("ANALYZE"))
+
+
+def sql_page(conn, mean: float):
+    prior_votes = settings.LEADERBOARD_PRIOR_VOTES
+    favorites = settings.LEADERBOARD_FAVORITE_WEIGHT * MovieStat.favorites_count
+    score = (
+        (prior_votes * mean + MovieStat.rating_sum + favorites * 10.0)
+        / (prior_votes + MovieStat.reviews_count + favorites)
+        + settings.LEADERBOARD_VIEW_WEIGHT * func.log10(1 + MovieStat.views_count)
+    )
+    stmt = (
+        select(Movie.id, Movie.title, score.label("score"))
+        .join(MovieStat, MovieStat.movie_id == Movie.id)
+        .join(MovieGenre, MovieGenre.movie_id == Movie.id)
+        .join(Genre, Genre.id == MovieGenre.genre_id)
+        .where(Genre.name == GENRE.capitalize())
+        .order_by(score.desc(), Movie.id)
+        .limit(PAGE)
+    )
+    return conn.execute(stmt).all()
+
+
+def run(sizes):
+    print(f"{'фильмов':>8} | {'SQL, мс':>8} | {'в памяти, мс':>12} | {'100 помеченных, мс':>18} | {'пересчет, мс':>12}")
+    for size in sizes:
+        with temp_database() as engine:
+            seed_catalog(engine, size)
+            fill_stats(engine)
+            store = LeaderboardStore(settings.LEADERBOARD_SIZE, settings.LEADERBOARD_SLACK)
+            with engine.connect() as conn:
+                mean = load_global_mean(conn)
+
+                def rebuild():
+                    store.install(mean, rank_movies(load_movies(conn), mean, store.capacity))
+
+                rebuild_ms = best_of(rebuild, repeat=1)
+                assert [row.id for row in sql_page(conn, mean)] == [
+                    item["id"] for item in store.page("top-rated", ("genre", GENRE), 0, PAGE)
+                ]
+                sql_ms = best_of(lambda: sql_page(conn, mean), repeat=5)
+                memory_ms = best_of(lambda: store.page("top-rated", ("genre", GENRE), 0, PAGE), repeat=5)
+                dirty = list(range(1, size + 1, max(1, size // DIRTY)))[:DIRTY]
+                update_ms = best_of(lambda: store.apply(dirty, load_movies(conn, dirty)), repeat=3)
+            print(f"{size:>8} | {sql_ms:>8.2f} | {memory_ms:>12.3f} | {update_ms:>18.2f} | {rebuild_ms:>12.0f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
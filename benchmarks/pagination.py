@@ -0,0 +1,60 @@
+"""Бенчмарк пагинации каталога: OFFSET/LIMIT против keyset-курсора на разной глубине.
+
+Запуск:
+    python benchmarks/pagination.py [размер каталога]
+"""
+import sys
+
+from common import async_engine_for, best_of, run_async, seed_catalog, temp_database
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Movie
+from app.repositories.catalog import MOVIE_PAGE_KEY, CatalogRepository
+
+PAGE_SIZE = 24
+
+
+async def collect_cursors(repository: CatalogRepository):
+    """Курсоры всех страниц заранее, чтобы мерить только саму выборку"""
+    cursors = [None]
+    while True:
+        _, next_cursor = await repository.list_movies(PAGE_SIZE, cursor=cursors[-1])
+        if not next_cursor:
+            return cursors
+        cursors.append(next_cursor)
+
+
+def run(size: int):
+    with temp_database() as engine:
+        seed_catalog(engine, size)
+        async_engine = async_engine_for(engine)
+        db = AsyncSession(async_engine)
+        repository = CatalogRepository(db)
+        cursors = run_async(collect_cursors(repository))
+
+        print(f"каталог: {size} фильмов, страниц: {len(cursors)}")
+        print(f"{'страница':>9} | {'OFFSET, мс':>11} | {'курсор, мс':>11}")
+        for page in (0, len(cursors) // 10, len(cursors) // 2, len(cursors) - 1):
+            def offset_page():
+                run_async(repository.fetch(
+                    select(Movie)
+                    .order_by(*[desc(column) for column in MOVIE_PAGE_KEY])
+                    .offset(page * PAGE_SIZE)
+                    .limit(PAGE_SIZE)
+                ))
+                db.expunge_all()
+
+            def keyset_page():
+                run_async(repository.list_movies(PAGE_SIZE, cursor=cursors[page]))
+                db.expunge_all()
+
+            print(f"{page + 1:>9} | {best_of(offset_page, 5):>11.2f} | {best_of(keyset_page, 5):>11.2f}")
+
+        run_async(db.close())
+        run_async(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
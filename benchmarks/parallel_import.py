@@ -0,0 +1,84 @@
+"""Бенчмарк многопроцессного импорта: масштабирование по числу обработчиков.
+
+Один и тот же синтетический JSONL-файл импортируется в новую БД с
+разным числом процессов подготовки пачек (разбор JSON, валидация,
+нормализация). Запись в SQLite остается однопоточной, поэтому рост
+упирается в скорость писателя: отдельной колонкой выводится скорость
+одной подготовки пачек без записи — потолок для обработчиков.
+
+Запуск:
+    python benchmarks/parallel_import.py [--rows 1000000] [--workers 1 2 4 8]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from common import PICKS, synthetic_movies, temp_database
+
+from sqlalchemy import insert
+
+from app.models import Pick
+from app.services.catalog_import import CatalogImporter
+
+
+def write_jsonl(path: Path, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for movie in synthetic_movies(count):
+            movie.pop("created_at")
+            f.write(json.dumps(movie, ensure_ascii=False) + "\n")
+
+
+def prepare_only(path: Path, workers: int) -> float:
+    """Секунды на чтение и подготовку всех пачек без записи в БД"""
+    importer = CatalogImporter(connection=None, workers=workers)
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        for _ in importer.prepare(importer.chunks(f, "jsonl")):
+            pass
+    return time.perf_counter() - started
+
+
+def import_file(path: Path, workers: int):
+    with temp_database() as engine:
+        with engine.connect() as conn:
+            conn.execute(insert(Pick.__table__), PICKS)
+            conn.commit()
+            return CatalogImporter(conn, workers=workers).run(path)
+
+
+def default_workers():
+    cores = os.cpu_count() or 1
+    return sorted({1, 2, cores // 2 or 1, cores})
+
+
+def run(rows: int, workers_list):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "catalog.jsonl"
+        print(f"Генерация {rows} записей...")
+        write_jsonl(path, rows)
+        print(f"Файл: {path.stat().st_size / 2**20:.0f} МБ, ядер: {os.cpu_count()}\n")
+
+        print(
+            f"{'процессов':>9} | {'подготовка, с':>13} | {'импорт, с':>9} | "
+            f"{'записей/с':>10} | {'ускорение':>9}"
+        )
+        baseline = None
+        for workers in workers_list:
+            prepare_seconds = prepare_only(path, workers)
+            report = import_file(path, workers)
+            baseline = baseline or report.load.seconds
+            print(
+                f"{workers:>9} | {prepare_seconds:>13.2f} | {report.load.seconds:>9.2f} | "
+                f"{report.records_per_second:>10.0f} | {baseline / report.load.seconds:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = parser.parse_args()
+    run(args.rows, args.workers)
@@ -0,0 +1,38 @@
+"""Бенчмарк хеширования паролей bcrypt в пуле процессов.
+
+Пароли хешируются PasswordHasher с разным числом процессов, по времени
+считается скорость и оценка времени создания 10 000 пользователей.
+
+Запуск:
+    python benchmarks/password_hashing.py [--passwords 200] [--rounds 12] [--workers 1 2 4]
+"""
+import argparse
+import os
+import time
+
+import common  # noqa: F401  (путь к пакету app)
+
+from app.services.user_import import PasswordHasher
+
+
+def run(count: int, rounds: int, workers_list):
+    passwords = [f"password-{i}" for i in range(count)]
+    print(f"bcrypt rounds={rounds}, паролей: {count}, ядер: {os.cpu_count()}\n")
+    print(f"{'процессов':>9} | {'секунд':>7} | {'хэшей/с':>8} | {'10k польз., с':>13}")
+    for workers in workers_list:
+        with PasswordHasher(workers, rounds=rounds) as hasher:
+            hasher.hash_many(passwords[:workers])  # запуск процессов не учитывается
+            started = time.perf_counter()
+            hasher.hash_many(passwords)
+            seconds = time.perf_counter() - started
+        print(f"{workers:>9} | {seconds:>7.2f} | {count / seconds:>8.1f} | {10000 * seconds / count:>13.0f}")
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passwords", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, cores // 2 or 1, cores}))
+    args = parser.parse_args()
+    run(args.passwords, args.rounds, args.workers)
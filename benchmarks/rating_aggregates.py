@@ -0,0 +1,87 @@
+"""Бенчмарк записи отзыва: пересчет AVG против приращения агрегатов.
+
+У одного фильма накапливаются отзывы; на каждом размере измеряется
+время добавления еще одного отзыва двумя способами:
+    AVG        вставка, затем SELECT avg(rating) по всем отзывам фильма
+               и обновление рейтинга (как было)
+    агрегаты   вставка и UPDATE суммы/числа оценок в той же транзакции
+               (MovieStatRepository.apply_review)
+При приращениях время записи не зависит от числа отзывов фильма.
+
+Запуск:
+    python benchmarks/rating_aggregates.py [число отзывов ...]
+"""
+import random
+import sys
+
+from common import async_engine_for, best_of, run_async, seed_catalog, temp_database
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.movies import Movie
+from app.models.reviews import Review
+from app.repositories.movie_stats import MovieStatRepository, rebuild_stat_aggregates
+
+MOVIE_ID = 1
+REPEAT = 50
+
+
+async def add_review_avg(session_factory) -> None:
+    async with session_factory() as db:
+        db.add(Review(movie_id=MOVIE_ID, text="бенчмарк", rating=random.uniform(1, 10)))
+        await db.commit()
+        average = (await db.execute(select(func.avg(Review.rating)).where(Review.movie_id == MOVIE_ID))).scalar()
+        movie = await db.get(Movie, MOVIE_ID)
+        movie.rating = round(float(average), 1)
+        await db.commit()
+
+
+async def add_review_aggregates(session_factory) -> None:
+    async with session_factory() as db:
+        rating = random.uniform(1, 10)
+        db.add(Review(movie_id=MOVIE_ID, text="бенчмарк", rating=rating))
+        await db.flush()
+        average, _ = await MovieStatRepository(db).apply_review(MOVIE_ID, rating, 1)
+        movie = await db.get(Movie, MOVIE_ID)
+        movie.rating = round(average, 1)
+        await db.commit()
+
+
+def fill_reviews(engine, total: int) -> None:
+    with engine.begin() as conn:
+        have = conn.execute(select(func.count()).select_from(Review)).scalar()
+        rows = [{"movie_id": MOVIE_ID, "text": "отзыв", "rating": random.uniform(1, 10)} for _ in range(total - have)]
+        if rows:
+            conn.execute(insert(Review.__table__), rows)
+        rebuild_stat_aggregates(conn, [MOVIE_ID])
+        conn.execute(text("ANALYZE"))
+
+
+def run(sizes):
+    print(f"{'отзывов':>8} | {'AVG, мс':>8} | {'агрегаты, мс':>12}")
+    with temp_database() as engine:
+        seed_catalog(engine, 10)
+        async_engine = async_engine_for(engine)
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        try:
+            for size in sizes:
+                fill_reviews(engine, size)
+
+                def avg_path():
+                    for _ in range(REPEAT):
+                        run_async(add_review_avg(session_factory))
+
+                def aggregate_path():
+                    for _ in range(REPEAT):
+                        run_async(add_review_aggregates(session_factory))
+
+                avg_ms = best_of(avg_path, repeat=1) / REPEAT
+                aggregate_ms = best_of(aggregate_path, repeat=1) / REPEAT
+                print(f"{size:>8} | {avg_ms:>8.2f} | {aggregate_ms:>12.2f}")
+        finally:
+            run_async(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100, 10000, 100000, 500000])
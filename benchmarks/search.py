@@ -0,0 +1,52 @@
+"""Бенчмарк поиска: ILIKE-просмотр таблицы против индекса FTS5.
+
+ILIKE с LIMIT останавливается на первых 20 совпадениях в порядке таблицы,
+поэтому на частых словах он быстр, но без ранжирования; редкие и
+отсутствующие слова заставляют его просматривать всю таблицу.
+
+Запуск:
+    python benchmarks/search.py [размер каталога ...]
+"""
+import sys
+
+from common import async_engine_for, best_of, run_async, seed_catalog, temp_database
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Movie
+from app.repositories.catalog import CatalogRepository
+
+QUERIES = ["Фильм 4242", "ограбление", "косм", "тюрьма побег", "шпион дракон океан", "несуществующее"]
+LIMIT = 20
+
+
+async def search_ilike(db: AsyncSession, query: str):
+    """Прежняя реализация /search: ILIKE по названию"""
+    pattern = f"%{query}%"
+    return await CatalogRepository(db).fetch(
+        select(Movie).where(or_(Movie.title.ilike(pattern), Movie.overview.ilike(pattern))).limit(LIMIT)
+    )
+
+
+async def search_fts(db: AsyncSession, query: str):
+    return await CatalogRepository(db).search(query, LIMIT)
+
+
+def run(sizes):
+    print(f"{'фильмов':>8} | {'запрос':<20} | {'ILIKE, мс':>10} | {'FTS5, мс':>9}")
+    for size in sizes:
+        with temp_database() as engine:
+            seed_catalog(engine, size)
+            async_engine = async_engine_for(engine)
+            db = AsyncSession(async_engine)
+            for query in QUERIES:
+                ilike_ms = best_of(lambda: run_async(search_ilike(db, query)), 5)
+                fts_ms = best_of(lambda: run_async(search_fts(db, query)), 5)
+                print(f"{size:>8} | {query:<20} | {ilike_ms:>10.2f} | {fts_ms:>9.2f}")
+            run_async(db.close())
+            run_async(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
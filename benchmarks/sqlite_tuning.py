@@ -0,0 +1,98 @@
+"""Бенчмарк профиля SQLite: смешанная нагрузка чтение/запись до и после настройки.
+
+Несколько потоков параллельно читают страницы каталога и пишут отзывы
+(примерно как запросы API). Сравниваются настройки SQLite по умолчанию
+(rollback journal, synchronous=FULL) и профиль из app/database/sqlite.py.
+
+Запуск:
+    python benchmarks/sqlite_tuning.py [потоков] [секунд]
+"""
+import random
+import sys
+import threading
+import time
+
+from common import seed_catalog, temp_database
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.database.sqlite import SQLiteProfile, apply_sqlite_profile
+from app.models import Movie, Review, User
+
+CATALOG_SIZE = 20000
+WRITE_SHARE = 0.2
+
+
+def worker(engine, stop: threading.Event, stats: dict, seed: int):
+    rnd = random.Random(seed)
+    reads = writes = errors = 0
+    while not stop.is_set():
+        try:
+            if rnd.random() < WRITE_SHARE:
+                with engine.begin() as conn:
+                    conn.execute(insert(Review.__table__).values(
+                        movie_id=rnd.randint(1, CATALOG_SIZE),
+                        user_id=1,
+                        text="Синтетический отзыв",
+                        rating=rnd.randint(1, 10),
+                    ))
+                writes += 1
+            else:
+                with engine.connect() as conn:
+                    min_rating = round(rnd.uniform(5.0, 9.0), 1)
+                    conn.execute(
+                        select(Movie.id, Movie.title)
+                        .where(Movie.rating >= min_rating)
+                        .order_by(Movie.rating.desc())
+                        .limit(24)
+                    ).all()
+                reads += 1
+        except OperationalError:
+            errors += 1
+    with stats["lock"]:
+        stats["reads"] += reads
+        stats["writes"] += writes
+        stats["errors"] += errors
+
+
+def run_profile(profile, threads: int, seconds: float) -> dict:
+    with temp_database() as engine:
+        seed_catalog(engine, CATALOG_SIZE)
+        with engine.begin() as conn:
+            conn.execute(insert(User.__table__).values(id=1, username="bench", email="b@x", password_hash="-"))
+        engine.dispose()
+        if profile is not None:
+            apply_sqlite_profile(engine, profile)
+
+        stats = {"reads": 0, "writes": 0, "errors": 0, "lock": threading.Lock()}
+        stop = threading.Event()
+        pool = [
+            threading.Thread(target=worker, args=(engine, stop, stats, seed))
+            for seed in range(threads)
+        ]
+        for thread in pool:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in pool:
+            thread.join()
+        return stats
+
+
+def run(threads: int, seconds: float):
+    print(f"каталог: {CATALOG_SIZE} фильмов, потоков: {threads}, записей: {WRITE_SHARE:.0%}, {seconds:.0f} с")
+    print(f"{'профиль':<12} | {'чтений/с':>9} | {'записей/с':>9} | {'ошибок':>7}")
+    for name, profile in (("по умолчанию", None), ("настроенный", SQLiteProfile())):
+        stats = run_profile(profile, threads, seconds)
+        print(
+            f"{name:<12} | {stats['reads'] / seconds:>9.0f} | "
+            f"{stats['writes'] / seconds:>9.0f} | {stats['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
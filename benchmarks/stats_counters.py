@@ -0,0 +1,64 @@
+"""Бенчмарк /stats: COUNT(*) по таблицам против таблицы counters.
+
+В БД добавляются отзывы и пользователи; на каждом размере сравнивается
+прежний подсчет (COUNT(*) по movies, reviews, users) с чтением счетчиков,
+которые ведут триггеры. Заодно проверяется, что счетчики совпадают с
+COUNT(*).
+
+Запуск:
+    python benchmarks/stats_counters.py [число отзывов ...]
+"""
+import sys
+
+from common import best_of, seed_catalog, temp_database
+
+from sqlalchemy import func, insert, select
+
+from app.database.counters import read_counters
+from app.models.movies import Movie
+from app.models.reviews import Review
+from app.models.users import User
+
+
+def count_all(conn) -> dict:
+    return {
+        "movies": conn.scalar(select(func.count()).select_from(Movie)),
+        "reviews": conn.scalar(select(func.count()).select_from(Review)),
+        "users": conn.scalar(select(func.count()).select_from(User)),
+    }
+
+
+def grow(engine, reviews: int) -> None:
+    with engine.begin() as conn:
+        have = conn.scalar(select(func.count()).select_from(Review))
+        conn.execute(
+            insert(Review.__table__),
+            [{"movie_id": i % 1000 + 1, "text": "отзыв", "rating": 7.0} for i in range(have, reviews)],
+        )
+        users = conn.scalar(select(func.count()).select_from(User))
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"username": f"user{i}", "email": f"user{i}@bench", "password_hash": "x"}
+                for i in range(users, reviews // 10)
+            ],
+        )
+
+
+def run(sizes):
+    print(f"{'отзывов':>9} | {'COUNT(*), мс':>12} | {'counters, мс':>12}")
+    with temp_database() as engine:
+        seed_catalog(engine, 1000)
+        for size in sizes:
+            grow(engine, size)
+            with engine.connect() as conn:
+                counted = count_all(conn)
+                stored = read_counters(conn)
+                assert all(stored[name] == value for name, value in counted.items()), (stored, counted)
+                count_ms = best_of(lambda: count_all(conn), repeat=5)
+                counters_ms = best_of(lambda: read_counters(conn), repeat=5)
+            print(f"{size:>9} | {count_ms:>12.2f} | {counters_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
@@ -0,0 +1,66 @@
+"""Бенчмарк потокового импорта: пиковая память и скорость в зависимости от размера файла.
+
+Пиковая память меряется tracemalloc (он замедляет Python-код, поэтому
+скорость без него выводится отдельным прогоном). Повторный импорт того
+же файла идет без контрольной точки (resume=False), как после правки
+начала файла: все записи читаются и отсеиваются по хэшу.
+
+Запуск:
+    python benchmarks/streaming_import.py [размер файла ...]
+"""
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from common import PICKS, synthetic_movies, temp_database
+
+from sqlalchemy import insert
+
+from app.models import Pick
+from app.services.catalog_import import CatalogImporter
+
+
+def write_jsonl(path: Path, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for movie in synthetic_movies(count):
+            movie.pop("created_at")
+            f.write(json.dumps(movie, ensure_ascii=False) + "\n")
+
+
+def import_file(path: Path, trace: bool):
+    """Импорт в новую БД; возвращает отчет, пик памяти и время повторного импорта"""
+    with temp_database() as engine:
+        with engine.connect() as conn:
+            conn.execute(insert(Pick.__table__), PICKS)
+            conn.commit()
+            if trace:
+                tracemalloc.start()
+            report = CatalogImporter(conn).run(path)
+            peak = tracemalloc.get_traced_memory()[1] if trace else 0
+            tracemalloc.stop()
+            reimport = CatalogImporter(conn, resume=False).run(path)
+    return report, peak, reimport.load.seconds
+
+
+def run(sizes):
+    print(
+        f"{'записей':>8} | {'файл, МБ':>9} | {'пик памяти, МБ':>15} | {'секунд':>7} | "
+        f"{'записей/с':>10} | {'повторно, с':>11}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            path = Path(tmp_dir) / f"catalog_{size}.jsonl"
+            write_jsonl(path, size)
+            _, peak, _ = import_file(path, trace=True)
+            report, _, reimport_seconds = import_file(path, trace=False)
+            print(
+                f"{size:>8} | {path.stat().st_size / 2**20:>9.1f} | {peak / 2**20:>15.2f} | "
+                f"{report.load.seconds:>7.2f} | {report.records_per_second:>10.0f} | {reimport_seconds:>11.2f}"
+            )
+            path.unlink()
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10000, 50000, 200000])
@@ -0,0 +1,90 @@
+"""Бенчмарк счетчика просмотров: запись на каждый просмотр против буфера.
+
+Параллельные клиенты вызывают PATCH /movie-stats/movie/{id}/increment-views
+для нескольких фильмов. Сравниваются сброс после каждого просмотра
+(транзакция и fsync на просмотр, как было) и буфер с пачечным UPDATE
+в фоновой задаче. После остановки проверяется, что ни один просмотр не
+потерян.
+
+Запуск:
+    python benchmarks/view_counter.py [--requests 3000] [--movies 20]
+"""
+import argparse
+import asyncio
+import time
+
+from common import async_engine_for, run_async, seed_catalog, temp_database
+
+import httpx
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import get_async_db
+from app.models.movie_stats import MovieStat
+from app.services.view_counter import view_counter
+from main import app
+
+CONCURRENCY = 16
+
+
+async def load(requests: int, movies: int, per_view: bool) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(worker_id: int):
+            for i in range(requests // CONCURRENCY):
+                movie_id = (worker_id + i) % movies + 1
+                response = await client.patch(f"/api/v1/movie-stats/movie/{movie_id}/increment-views")
+                response.raise_for_status()
+                if per_view:
+                    await view_counter.flush()
+
+        view_counter.start()
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(i) for i in range(CONCURRENCY)])
+        await view_counter.stop()
+        return time.perf_counter() - started
+
+
+def measure(engine, per_view: bool, requests: int, movies: int):
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM movie_stats"))
+        conn.execute(insert(MovieStat.__table__), [{"movie_id": i} for i in range(1, movies + 1)])
+
+    async_engine = async_engine_for(engine)
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_db
+    view_counter.session_factory = session_factory
+    try:
+        seconds = run_async(load(requests, movies, per_view))
+    finally:
+        app.dependency_overrides.clear()
+        run_async(async_engine.dispose())
+
+    with engine.connect() as conn:
+        stored = conn.execute(text("SELECT sum(views_count) FROM movie_stats")).scalar()
+    return seconds, stored
+
+
+def run(requests: int, movies: int):
+    requests -= requests % CONCURRENCY
+    print(f"{requests} просмотров {movies} фильмов, параллельно {CONCURRENCY}\n")
+    print(f"{'режим':>22} | {'секунд':>7} | {'просмотров/с':>12} | {'в базе':>7}")
+    with temp_database() as engine:
+        seed_catalog(engine, movies)
+        for label, per_view in (("запись на просмотр", True), ("буфер", False)):
+            seconds, stored = measure(engine, per_view, requests, movies)
+            assert stored == requests, f"потеряны просмотры: {stored} из {requests}"
+            print(f"{label:>22} | {seconds:>7.2f} | {requests / seconds:>12.0f} | {stored:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--movies", type=int, default=20)
+    args = parser.parse_args()
+    run(args.requests, args.movies)
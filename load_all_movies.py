@@ -9,10 +9,11 @@ from sqlalchemy import create_engine
 from app.database.base import Base
 from app.models.movies import Movie
 from app.models.picks import Pick
-from app.models.movie_picks import MoviePick
 from app.models.users import User
 from app.models.roles import Role
-import hashlib
+from app.repositories.upserts import upsert_picks
+from app.services.bulk_loader import BulkMovieLoader
+from app.utils.security import get_password_hash
 
 DATABASE_URL = "sqlite:///movies.db"
 engine = create_engine(DATABASE_URL)
@@ -549,8 +550,8 @@ def load_all_movies():
                 user = User(
                     username="admin",
                     email="admin@example.com",
-                    password_hash=hashlib.md5("admin123".encode()).hexdigest(),
-                    role_id=role.id
+                    password_hash=get_password_hash("admin123"),
+                    is_superuser=True
                 )
                 session.add(user)
                 session.commit()
@@ -564,67 +565,19 @@ def load_all_movies():
                 {"id": 3, "name": "Классика", "slug": "classic"},
             ]
             
-            picks_map = {}
-            for pick_data in picks_data:
-                pick = session.query(Pick).filter(Pick.slug == pick_data["slug"]).first()
-                if not pick:
-                    pick = Pick(
-                        id=pick_data["id"],
-                        name=pick_data["name"],
-                        slug=pick_data["slug"],
-                        description=f"Подборка фильмов: {pick_data['name']}"
-                        # creator_id можно не указывать, оно nullable
-                    )
-                    session.add(pick)
-                    session.commit()
-                    session.refresh(pick)
-                picks_map[pick_data["slug"]] = pick.id
-                print(f"Создана подборка: {pick.name} (ID: {pick.id})")
+            # Один INSERT ... ON CONFLICT(slug): существующие подборки не дублируются
+            picks_map = upsert_picks(session, [
+                {**pick_data, "description": f"Подборка фильмов: {pick_data['name']}"}
+                for pick_data in picks_data
+            ])
+            for slug, pick_id in picks_map.items():
+                print(f"Подборка: {slug} (ID: {pick_id})")
             
-            # 4. Загружаем фильмы
-            for movie_data in ALL_MOVIES:
-                # Проверяем, существует ли фильм
-                existing_movie = session.query(Movie).filter(Movie.id == movie_data["id"]).first()
-                
-                if existing_movie:
-                    print(f"Фильм '{movie_data['title']}' уже существует, пропускаем...")
-                    continue
-                
-                # Создаем фильм
-                movie = Movie(
-                    id=movie_data["id"],
-                    title=movie_data["title"],
-                    year=movie_data["year"],
-                    genre=movie_data["genre"],
-                    rating=movie_data["rating"],
-                    overview=movie_data["overview"],
-                    poster_url=movie_data["poster"],
-                    created_by=user.id
-                )
-                session.add(movie)
-                session.commit()
-                session.refresh(movie)
-                
-                # Добавляем связи с подборками
-                for pick_slug in movie_data.get("picks", []):
-                    if pick_slug in picks_map:
-                        # Проверяем, существует ли связь
-                        existing_link = session.query(MoviePick).filter(
-                            MoviePick.movie_id == movie.id,
-                            MoviePick.pick_id == picks_map[pick_slug]
-                        ).first()
-                        
-                        if not existing_link:
-                            movie_pick = MoviePick(
-                                movie_id=movie.id,
-                                pick_id=picks_map[pick_slug]
-                            )
-                            session.add(movie_pick)
-                
-                session.commit()
-                print(f"Загружен фильм: {movie_data['title']} (ID: {movie.id})")
+            # 4. Загружаем фильмы пакетно, одной транзакцией
+            report = BulkMovieLoader(session.connection()).load(ALL_MOVIES, created_by=user.id)
+            session.commit()
             
-            print(f"✅ Загружено {len(ALL_MOVIES)} фильмов!")
+            print(f"✅ Загружено: {report}")
             
             # Выводим статистику
             movie_count = session.query(Movie).count()
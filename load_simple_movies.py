@@ -12,9 +12,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import Boolean, Float, String, Text, create_engine, Table, Column, Integer, ForeignKey, DateTime
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
-import hashlib
 import logging
 
+from app.database.base import Base as AppBase
+import app.models  # noqa: F401  (регистрация моделей приложения в AppBase)
+from app.repositories.upserts import upsert_picks
+from app.services.bulk_loader import BulkMovieLoader
+from app.services.user_import import hash_passwords
+
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
@@ -24,10 +29,6 @@ Base = declarative_base()
 DATABASE_URL = "sqlite:///movies.db"
 engine = create_engine(DATABASE_URL)
 
-def get_password_hash(password: str) -> str:
-    """Простая функция для хэширования пароля (для демо-целей)"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
 # Определим простые модели прямо здесь для избежания конфликтов
 class SimpleUser(Base):
     __tablename__ = "users"
@@ -622,6 +623,8 @@ def create_test_users():
     with Session(engine) as session:
         try:
             users_created = []
+            # bcrypt, три пароля параллельно
+            admin_hash, user_hash, moderator_hash = hash_passwords(["1234"] * 3)
             
             # Создаем администратора
             admin = session.query(SimpleUser).filter(SimpleUser.username == "admin").first()
@@ -629,7 +632,7 @@ def create_test_users():
                 admin = SimpleUser(
                     username="admin",
                     email="admin@kinovzor.ru",
-                    password_hash=get_password_hash("1234"),
+                    password_hash=admin_hash,
                     is_active=True,
                     is_superuser=True
                 )
@@ -642,7 +645,7 @@ def create_test_users():
                 user = SimpleUser(
                     username="user",
                     email="user@kinovzor.ru",
-                    password_hash=get_password_hash("1234"),
+                    password_hash=user_hash,
                     is_active=True,
                     is_superuser=False
                 )
@@ -655,7 +658,7 @@ def create_test_users():
                 moderator = SimpleUser(
                     username="moderator",
                     email="moderator@kinovzor.ru",
-                    password_hash=get_password_hash("1234"),
+                    password_hash=moderator_hash,
                     is_active=True,
                     is_superuser=False
                 )
@@ -681,7 +684,7 @@ def create_test_users():
             return 1
 
 def create_picks(admin_id):
-    """Создает подборки"""
+    """Создает подборки (INSERT ... ON CONFLICT(slug), без предварительных SELECT)"""
     with Session(engine) as session:
         try:
             picks_data = [
@@ -690,26 +693,9 @@ def create_picks(admin_id):
                 {"name": "Классика", "slug": "classic", "description": "Великие классические фильмы"},
             ]
             
-            picks_created = []
-            
-            for pick_data in picks_data:
-                pick = session.query(SimplePick).filter(SimplePick.slug == pick_data["slug"]).first()
-                if not pick:
-                    pick = SimplePick(
-                        name=pick_data["name"],
-                        slug=pick_data["slug"],
-                        description=pick_data["description"],
-                        created_by=admin_id
-                    )
-                    session.add(pick)
-                    picks_created.append(pick_data["name"])
-            
+            picks = upsert_picks(session, [{**pick_data, "created_by": admin_id} for pick_data in picks_data])
             session.commit()
-            
-            if picks_created:
-                logger.info(f"✅ Созданы подборки: {', '.join(picks_created)}")
-            else:
-                logger.info("ℹ️ Все подборки уже существуют")
+            logger.info(f"✅ Подборки: {', '.join(picks)}")
             
         except Exception as e:
             session.rollback()
@@ -721,65 +707,20 @@ def load_movies_and_picks(admin_id):
     """Загружает фильмы и связывает их с подборками"""
     with Session(engine) as session:
         try:
-            # Получаем подборки из базы
-            picks = {}
-            for pick in session.query(SimplePick).all():
-                picks[pick.slug] = pick.id
-            
-            movies_loaded = 0
-            movie_picks_added = 0
-            
-            for movie_data in MOVIES:
-                # Проверяем существование
-                existing = session.query(SimpleMovie).filter(SimpleMovie.id == movie_data["id"]).first()
-                if existing:
-                    logger.info(f"⚠️ Фильм '{movie_data['title']}' уже существует, пропускаем...")
-                    continue
-                
-                # Создаем фильм
-                movie = SimpleMovie(
-                    id=movie_data["id"],
-                    title=movie_data["title"],
-                    year=movie_data["year"],
-                    genre=movie_data["genre"],
-                    rating=movie_data["rating"],
-                    overview=movie_data["overview"],
-                    poster_url=movie_data.get("poster_url") or movie_data.get("poster"),
-                    created_by=admin_id
-                )
-                session.add(movie)
-                session.flush()  # Получаем ID фильма
-                
-                # Добавляем связи с подборками если указаны
-                if "picks" in movie_data:
-                    for pick_slug in movie_data["picks"]:
-                        pick_id = picks.get(pick_slug)
-                        if pick_id:
-                            # Проверяем, не добавлен ли уже фильм в эту подборку
-                            existing = session.query(SimpleMoviePick).filter(
-                                SimpleMoviePick.movie_id == movie.id,
-                                SimpleMoviePick.pick_id == pick_id
-                            ).first()
-                            if not existing:
-                                movie_pick = SimpleMoviePick(movie_id=movie.id, pick_id=pick_id)
-                                session.add(movie_pick)
-                                movie_picks_added += 1
-                
-                movies_loaded += 1
-                if movies_loaded % 10 == 0:
-                    logger.info(f"✅ Загружено {movies_loaded} фильмов...")
-            
+            # Существующие фильмы (по id или названию с годом) пропускаются
+            # на стороне базы через ON CONFLICT DO NOTHING
+            report = BulkMovieLoader(session.connection()).load(MOVIES, created_by=admin_id)
             session.commit()
             
-            if movies_loaded > 0:
-                logger.info(f"✅ Загружено {movies_loaded} фильмов!")
+            if report.movies_inserted > 0:
+                logger.info(f"✅ Загружено {report.movies_inserted} фильмов!")
             else:
                 logger.info("ℹ️ Все фильмы уже загружены")
             
-            if movie_picks_added > 0:
-                logger.info(f"✅ Добавлено {movie_picks_added} связей фильмов с подборками")
+            if report.picks_linked > 0:
+                logger.info(f"✅ Добавлено {report.picks_linked} связей фильмов с подборками")
             
-            return movies_loaded
+            return report.movies_inserted
             
         except Exception as e:
             session.rollback()
@@ -851,6 +792,9 @@ def load_simple_movies():
         
         # Создаем таблицы
         logger.info("🔄 Создание таблиц...")
+        # Схема приложения (natural_key, полнотекстовый индекс и т.д.),
+        # затем недостающие таблицы простых моделей
+        AppBase.metadata.create_all(bind=engine)
         Base.metadata.create_all(bind=engine)
         logger.info("✅ Таблицы созданы")
         
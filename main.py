@@ -6,6 +6,12 @@ from pathlib import Path
 import logging
 from contextlib import asynccontextmanager
 
+from app.services.counters import counter_reconciler
+from app.services.engagement import engagement_recorder, engagement_rollup
+from app.services.leaderboards import leaderboard_refresher
+from app.services.user_import import password_hasher
+from app.services.view_counter import view_counter
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -29,10 +35,23 @@ async def lifespan(app: FastAPI):
     logger.info(f"Подключено {successfully_loaded} маршрутизаторов")
     logger.info("Документация доступна на /api/docs")
     logger.info("="*60)
+    view_counter.start()
+    counter_reconciler.start()
+    leaderboard_refresher.start()
+    engagement_recorder.start()
+    engagement_rollup.start()
+    password_hasher.start()
     
     yield
     
     # SHUTDOWN
+    await engagement_rollup.stop()
+    await leaderboard_refresher.stop()
+    await counter_reconciler.stop()
+    # Просмотры и действия, накопленные в памяти, записываются до остановки
+    await view_counter.stop()
+    await engagement_recorder.stop()
+    await password_hasher.stop()
     logger.info("КиноВзор API остановлен")
 
 # Инициализация FastAPI приложения с lifespan
@@ -72,6 +91,8 @@ if static_dir.exists():
 from app.api.auth import router as auth_router
 from app.api.users import router as users_router
 from app.api.main_api import router as main_api_router
+from app.api.movie_stats import router as movie_stats_router
+from app.api.leaderboards import router as leaderboards_router
 
 # Подключение маршрутов
 api_v1_prefix = "/api/v1"
@@ -112,7 +133,31 @@ try:
 except Exception as e:
     logger.error(f"❌ Ошибка при подключении main_api: {e}")
 
-logger.info(f"\n✓ Подключено {successfully_loaded}/3 маршрутизаторов\n")
+try:
+    # Статистика фильмов (просмотры, рейтинг)
+    app.include_router(
+        movie_stats_router,
+        prefix=f"{api_v1_prefix}",
+        tags=["Movie Stats"]
+    )
+    logger.info("✓ Маршрут movie_stats подключен")
+    successfully_loaded += 1
+except Exception as e:
+    logger.error(f"❌ Ошибка при подключении movie_stats: {e}")
+
+try:
+    # Рейтинги фильмов (топ-N из памяти)
+    app.include_router(
+        leaderboards_router,
+        prefix=f"{api_v1_prefix}",
+        tags=["Leaderboards"]
+    )
+    logger.info("✓ Маршрут leaderboards подключен")
+    successfully_loaded += 1
+except Exception as e:
+    logger.error(f"❌ Ошибка при подключении leaderboards: {e}")
+
+logger.info(f"\n✓ Подключено {successfully_loaded}/5 маршрутизаторов\n")
 
 # ============================================================================
 # ОСНОВНЫЕ МАРШРУТЫ
@@ -0,0 +1,37 @@
+"""backfill movie_stats favorites_count
+
+Revision ID: a1c3e5f7b9d0
+Revises: f9b1d3e5a7c8
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b9d0'
+down_revision: Union[str, Sequence[str], None] = 'f9b1d3e5a7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'movie_stats' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    # favorites_count теперь ведется приращениями при записи избранного,
+    # до этого колонка не заполнялась
+    op.execute(
+        """
+        UPDATE movie_stats SET
+            favorites_count = (SELECT count(*) FROM favorites WHERE favorites.movie_id = movie_stats.movie_id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
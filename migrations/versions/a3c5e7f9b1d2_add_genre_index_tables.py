@@ -0,0 +1,65 @@
+"""add genre index tables
+
+Revision ID: a3c5e7f9b1d2
+Revises: 7511ec33cdd0
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b1d2'
+down_revision: Union[str, Sequence[str], None] = '7511ec33cdd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    genres = op.create_table(
+        'genres',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_genres_id'), 'genres', ['id'], unique=False)
+    op.create_index(op.f('ix_genres_name'), 'genres', ['name'], unique=True)
+
+    movie_genres = op.create_table(
+        'movie_genres',
+        sa.Column('genre_id', sa.Integer(), nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['genre_id'], ['genres.id']),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id']),
+        sa.PrimaryKeyConstraint('genre_id', 'movie_id'),
+    )
+    op.create_index(op.f('ix_movie_genres_movie_id'), 'movie_genres', ['movie_id'], unique=False)
+
+    # Заполняем индекс жанров из строк movies.genre ("Драма, Криминал")
+    bind = op.get_bind()
+    movies = bind.execute(sa.text("SELECT id, genre FROM movies")).all()
+    names = {}
+    links = []
+    for movie_id, genre in movies:
+        for name in dict.fromkeys(g.strip() for g in (genre or "").split(",")):
+            if name:
+                names.setdefault(name, len(names) + 1)
+                links.append({'genre_id': names[name], 'movie_id': movie_id})
+
+    if names:
+        op.bulk_insert(genres, [{'id': genre_id, 'name': name} for name, genre_id in names.items()])
+    if links:
+        op.bulk_insert(movie_genres, links)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_movie_genres_movie_id'), table_name='movie_genres')
+    op.drop_table('movie_genres')
+    op.drop_index(op.f('ix_genres_name'), table_name='genres')
+    op.drop_index(op.f('ix_genres_id'), table_name='genres')
+    op.drop_table('genres')
@@ -0,0 +1,63 @@
+"""add engagement events and rollup tables
+
+Revision ID: b2d4f6a8c0e1
+Revises: a1c3e5f7b9d0
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c0e1'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f7b9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _totals():
+    return [
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.Column('favorites', sa.Integer(), nullable=False),
+        sa.Column('reviews', sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'engagement_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_engagement_events_occurred_at'), 'engagement_events', ['occurred_at'], unique=False)
+    for table, key, key_type in (
+        ('engagement_hourly', 'bucket', sa.DateTime()),
+        ('engagement_daily', 'day', sa.Date()),
+        ('engagement_monthly', 'month', sa.Date()),
+    ):
+        op.create_table(
+            table,
+            sa.Column(key, key_type, nullable=False),
+            sa.Column('movie_id', sa.Integer(), nullable=False),
+            *_totals(),
+            sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint(key, 'movie_id'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('engagement_monthly')
+    op.drop_table('engagement_daily')
+    op.drop_table('engagement_hourly')
+    op.drop_index(op.f('ix_engagement_events_occurred_at'), table_name='engagement_events')
+    op.drop_table('engagement_events')
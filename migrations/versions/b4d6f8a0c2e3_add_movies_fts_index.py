@@ -0,0 +1,88 @@
+"""add movies fts index
+
+Revision ID: b4d6f8a0c2e3
+Revises: a3c5e7f9b1d2
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d6f8a0c2e3'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e7f9b1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Копия DDL из app.database.fts на момент миграции: ревизия создает тот
+# индекс и те триггеры, что были у приложения этой ревизии
+
+def _normalized(column: str) -> str:
+    return f"replace(replace(coalesce({column}, ''), 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _indexed_values(prefix: str) -> str:
+    return ", ".join(_normalized(f"{prefix}.{column}") for column in ("title", "overview", "genre"))
+
+
+MOVIES_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, overview, genre,
+        content='',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, overview, genre)
+        VALUES (new.id, {_indexed_values("new")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview, genre)
+        VALUES ('delete', old.id, {_indexed_values("old")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF title, overview, genre ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview, genre)
+        VALUES ('delete', old.id, {_indexed_values("old")});
+        INSERT INTO movies_fts(rowid, title, overview, genre)
+        VALUES (new.id, {_indexed_values("new")});
+    END
+    """,
+]
+
+MOVIES_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS movies_fts_au",
+    "DROP TRIGGER IF EXISTS movies_fts_ad",
+    "DROP TRIGGER IF EXISTS movies_fts_ai",
+    "DROP TABLE IF EXISTS movies_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for statement in MOVIES_FTS_DDL:
+        bind.execute(sa.text(statement))
+    # Первичное заполнение по текущему содержимому movies
+    bind.execute(sa.text(
+        "INSERT INTO movies_fts(rowid, title, overview, genre) "
+        f"SELECT movies.id, {_indexed_values('movies')} FROM movies"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for statement in MOVIES_FTS_DROP:
+        bind.execute(sa.text(statement))
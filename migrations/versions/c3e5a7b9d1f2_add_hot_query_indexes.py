@@ -0,0 +1,67 @@
+"""add hot query indexes and unique favorites
+
+Revision ID: c3e5a7b9d1f2
+Revises: b2d4f6a8c0e1
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d1f2'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6a8c0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индексы моделей, которых может не быть в базах, созданных миграциями:
+# (имя, таблица, колонки). Их проверяет tests/test_query_plans.py
+INDEXES = [
+    ('ix_movies_rating_created_at', 'movies', ['rating', 'created_at']),
+    ('ix_reviews_movie_id_created_at', 'reviews', ['movie_id', 'created_at']),
+    ('ix_reviews_created_at', 'reviews', ['created_at']),
+    ('ix_favorites_user_id_created_at', 'favorites', ['user_id', 'created_at']),
+    ('ix_movie_picks_pick_id_movie_id', 'movie_picks', ['pick_id', 'movie_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    tables = set(sa.inspect(bind).get_table_names())
+
+    for name, table, columns in INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+    if 'favorites' in tables:
+        # Повторы (user_id, movie_id) мешают уникальному индексу: оставляем
+        # самое раннее добавление, счетчики поправят триггеры и пересчет ниже
+        op.execute(
+            """
+            DELETE FROM favorites WHERE id NOT IN (
+                SELECT min(id) FROM favorites GROUP BY user_id, movie_id
+            )
+            """
+        )
+        op.create_index('ux_favorites_user_id_movie_id', 'favorites', ['user_id', 'movie_id'], unique=True, if_not_exists=True)
+        # Префикс уникального индекса, отдельный индекс по user_id не нужен
+        op.drop_index('ix_favorites_user_id', table_name='favorites', if_exists=True)
+        if 'movie_stats' in tables:
+            op.execute(
+                """
+                UPDATE movie_stats SET
+                    favorites_count = (SELECT count(*) FROM favorites WHERE favorites.movie_id = movie_stats.movie_id)
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_favorites_user_id', 'favorites', ['user_id'], unique=False, if_not_exists=True)
+    op.drop_index('ux_favorites_user_id_movie_id', table_name='favorites', if_exists=True)
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,52 @@
+"""add import checkpoints
+
+Revision ID: c5e7f9b1d3f4
+Revises: b4d6f8a0c2e3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7f9b1d3f4'
+down_revision: Union[str, Sequence[str], None] = 'b4d6f8a0c2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'import_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('format', sa.String(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('line', sa.Integer(), nullable=False),
+        sa.Column('prefix_hash', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_import_checkpoints_id'), 'import_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_import_checkpoints_source'), 'import_checkpoints', ['source'], unique=True)
+
+    op.create_table(
+        'import_record_hashes',
+        sa.Column('record_key', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('record_key'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_record_hashes')
+    op.drop_index(op.f('ix_import_checkpoints_source'), table_name='import_checkpoints')
+    op.drop_index(op.f('ix_import_checkpoints_id'), table_name='import_checkpoints')
+    op.drop_table('import_checkpoints')
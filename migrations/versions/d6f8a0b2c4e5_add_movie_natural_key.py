@@ -0,0 +1,56 @@
+"""add movie natural key
+
+Revision ID: d6f8a0b2c4e5
+Revises: c5e7f9b1d3f4
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f8a0b2c4e5'
+down_revision: Union[str, Sequence[str], None] = 'c5e7f9b1d3f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def movie_natural_key(title, year):
+    """Копия app.models.movies.movie_natural_key на момент миграции: ключи
+    заполняются так, как их считало приложение этой ревизии"""
+    normalized = _SPACES_RE.sub(" ", (title or "").strip().lower().replace("ё", "е"))
+    return f"{normalized}|{year if year is not None else ''}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite добавляет NOT NULL колонку только со значением по умолчанию
+    op.add_column('movies', sa.Column('natural_key', sa.String(), nullable=False, server_default=''))
+
+    # Заполняем ключи; у уже существующих дублей (то же название и год)
+    # к ключу добавляется id, чтобы уникальный индекс можно было создать
+    bind = op.get_bind()
+    seen = set()
+    rows = []
+    for movie_id, title, year in bind.execute(sa.text("SELECT id, title, year FROM movies ORDER BY id")):
+        key = movie_natural_key(title, year)
+        if key in seen:
+            key = f"{key}#{movie_id}"
+        seen.add(key)
+        rows.append({"id": movie_id, "natural_key": key})
+    if rows:
+        bind.execute(sa.text("UPDATE movies SET natural_key = :natural_key WHERE id = :id"), rows)
+
+    op.create_index('ux_movies_natural_key', 'movies', ['natural_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_movies_natural_key', table_name='movies')
+    op.drop_column('movies', 'natural_key')
@@ -0,0 +1,38 @@
+"""page catalog on coalesced rating
+
+Revision ID: d7f9b1c3e5a7
+Revises: c3e5a7b9d1f2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f9b1c3e5a7'
+down_revision: Union[str, Sequence[str], None] = 'c3e5a7b9d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Каталог сортируется по coalesce(rating, 0.0) (app.models.movies.SORT_RATING):
+    # фильмы с NULL в rating выпадали из страниц после первой
+    op.drop_index('ix_movies_rating_created_at', table_name='movies', if_exists=True)
+    op.create_index(
+        'ix_movies_sort_rating_created_at',
+        'movies',
+        [sa.text('coalesce(rating, 0.0)'), 'created_at'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_sort_rating_created_at', table_name='movies', if_exists=True)
+    op.create_index('ix_movies_rating_created_at', 'movies', ['rating', 'created_at'], unique=False, if_not_exists=True)
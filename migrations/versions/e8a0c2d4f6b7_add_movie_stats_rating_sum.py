@@ -0,0 +1,43 @@
+"""add movie_stats rating_sum
+
+Revision ID: e8a0c2d4f6b7
+Revises: d6f8a0b2c4e5
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a0c2d4f6b7'
+down_revision: Union[str, Sequence[str], None] = 'd6f8a0b2c4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # movie_stats удаляется одной из ранних миграций и создается
+    # init_db (create_all) — тогда уже с новой колонкой
+    if 'movie_stats' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.add_column('movie_stats', sa.Column('rating_sum', sa.Float(), nullable=True, server_default='0'))
+
+    # Заполняем агрегаты по существующим отзывам
+    op.execute(
+        """
+        UPDATE movie_stats SET
+            rating_sum = coalesce((SELECT sum(rating) FROM reviews WHERE reviews.movie_id = movie_stats.movie_id), 0),
+            reviews_count = (SELECT count(*) FROM reviews WHERE reviews.movie_id = movie_stats.movie_id),
+            average_rating = coalesce((SELECT avg(rating) FROM reviews WHERE reviews.movie_id = movie_stats.movie_id), 0)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'movie_stats' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_column('movie_stats', 'rating_sum')
@@ -0,0 +1,64 @@
+"""add counters table
+
+Revision ID: f9b1d3e5a7c8
+Revises: e8a0c2d4f6b7
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9b1d3e5a7c8'
+down_revision: Union[str, Sequence[str], None] = 'e8a0c2d4f6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Копия триггеров из app.database.counters на момент миграции
+COUNTED_TABLES = ("movies", "reviews", "users", "favorites")
+
+
+def _counter_triggers(table: str) -> list:
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS counters_{table}_ai AFTER INSERT ON {table} BEGIN
+            UPDATE counters SET value = value + 1 WHERE name = '{table}';
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS counters_{table}_ad AFTER DELETE ON {table} BEGIN
+            UPDATE counters SET value = value - 1 WHERE name = '{table}';
+        END
+        """,
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'counters',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # Триггеры и первичный подсчет
+    bind = op.get_bind()
+    for table in COUNTED_TABLES:
+        for statement in _counter_triggers(table):
+            bind.execute(sa.text(statement))
+        bind.execute(sa.text(
+            f"INSERT INTO counters (name, value) SELECT '{table}', count(*) FROM {table}"
+        ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in COUNTED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS counters_{table}_ai")
+        op.execute(f"DROP TRIGGER IF EXISTS counters_{table}_ad")
+    op.drop_table('counters')
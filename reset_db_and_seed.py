@@ -1,8 +1,25 @@
-import os
+"""Сброс БД к демо-данным.
 
-from app.database.database import engine, SessionLocal
-from app.database.base import Base  # Импортируем Base из base.py
-from app.utils.security import get_password_hash
+Запуск:
+    python reset_db_and_seed.py                  # файл из DATABASE_URL
+    python reset_db_and_seed.py test.db
+    python reset_db_and_seed.py --template-only  # только собрать шаблон
+    python reset_db_and_seed.py --rebuild
+
+Схема и данные собираются в шаблон один раз (app/database/snapshots.py),
+сброс копирует шаблон в файл БД за миллисекунды.
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database.database import engine
+from app.database.snapshots import DatabaseTemplate
+from app.services.user_import import hash_passwords
 
 # Импортируем ВСЕ модели, чтобы они зарегистрировались в metadata
 # ВАЖНО: это нужно, чтобы все FK были видны SQLAlchemy
@@ -103,79 +120,89 @@ DEMO_USERS = [
 ]
 
 
-def reset_and_seed_db(db_path: str = "movies.db") -> None:
-    """Полностью пересоздать базу и заполнить её начальными фильмами и подборками."""
-    # 1. Удаляем старую БД, если есть
-    if os.path.exists(db_path):
-        os.remove(db_path)
-        print(f"✓ Удалена старая база данных {db_path}")
-
-    # 2. Создаем таблицы
-    # ВАЖНО: все модели уже зарегистрированы в единых Base родителях
-    Base.metadata.create_all(bind=engine)
-    print("✓ Таблицы созданы")
-
-    # 3. Заполняем данными
-    db = SessionLocal()
-    try:
-        # Добавляем демо-пользователей
-        for user_data in DEMO_USERS:
-            user = User(
-                id=user_data["id"],
-                username=user_data["username"],
-                email=user_data["email"],
-                password_hash=get_password_hash(user_data["password"]),
-                is_active=user_data["is_active"],
-                is_superuser=user_data["is_superuser"],
-            )
-            db.add(user)
-        db.commit()
-        print(f"✓ Добавлено {len(DEMO_USERS)} пользователей (demo: user/1234, moderator/1234)")
-
-        # Сначала добавляем подборки
-        slug_to_id = {}
-        for pick_data in PICKS_DATA:
-            pick = Pick(**pick_data)
-            db.add(pick)
-        db.commit()
-        print(f"✓ Добавлено {len(PICKS_DATA)} подборок")
-
-        # Маппим slug → id для связей
-        for pick in db.query(Pick).all():
-            slug_to_id[pick.slug] = pick.id
-
-        # Теперь добавляем фильмы
-        for item in MOVIES_DATA:
-            movie = Movie(
-                id=item["id"],
-                title=item["title"],
-                overview=item["overview"],
-                year=item["year"],
-                genre=item["genre"],
-                rating=item["rating"],
-                poster_url=item["poster_url"],
-                created_by=None,
-            )
-            db.add(movie)
-            db.flush()
-
-            # Добавляем связи с подборками (равно 2 на каждый фильм)
-            for slug in item.get("picks", []):
-                pick_id = slug_to_id.get(slug)
-                if pick_id:
-                    db.add(MoviePick(movie_id=movie.id, pick_id=pick_id))
-
-        db.commit()
-        print(f"✓ Добавлено {len(MOVIES_DATA)} фильмов (each in 2 picks)")
-        print("\n✅ База данных успешно пересоздана и заполнена!")
-
-    except Exception as e:
-        db.rollback()
-        print(f"❌ Ошибка при заполнении БД: {e}")
-        raise
-    finally:
-        db.close()
+def seed_demo_data(conn: Connection) -> None:
+    """Заполнить пустую схему демо-пользователями, подборками и фильмами.
+    Транзакцией управляет сборщик шаблона."""
+    db = Session(bind=conn)
+    # Добавляем демо-пользователей (bcrypt-хэши считаются параллельно)
+    password_hashes = hash_passwords([user_data["password"] for user_data in DEMO_USERS])
+    for user_data, password_hash in zip(DEMO_USERS, password_hashes):
+        user = User(
+            id=user_data["id"],
+            username=user_data["username"],
+            email=user_data["email"],
+            password_hash=password_hash,
+            is_active=user_data["is_active"],
+            is_superuser=user_data["is_superuser"],
+        )
+        db.add(user)
+    db.flush()
+
+    # Сначала добавляем подборки
+    for pick_data in PICKS_DATA:
+        db.add(Pick(**pick_data))
+    db.flush()
+
+    # Маппим slug → id для связей
+    slug_to_id = {pick.slug: pick.id for pick in db.query(Pick).all()}
+
+    # Теперь добавляем фильмы
+    for item in MOVIES_DATA:
+        movie = Movie(
+            id=item["id"],
+            title=item["title"],
+            overview=item["overview"],
+            year=item["year"],
+            genre=item["genre"],
+            rating=item["rating"],
+            poster_url=item["poster_url"],
+            created_by=None,
+        )
+        db.add(movie)
+        db.flush()
+
+        # Добавляем связи с подборками (равно 2 на каждый фильм)
+        for slug in item.get("picks", []):
+            pick_id = slug_to_id.get(slug)
+            if pick_id:
+                db.add(MoviePick(movie_id=movie.id, pick_id=pick_id))
+    db.flush()
+
+
+# Заполненная БД собирается один раз и пересобирается только после
+# изменения схемы (alembic head, модели) или данных выше
+RESET_TEMPLATE = DatabaseTemplate(
+    "reset",
+    seed=seed_demo_data,
+    seed_data=lambda: {"movies": MOVIES_DATA, "picks": PICKS_DATA, "users": DEMO_USERS},
+)
+
+
+def reset_and_seed_db(db_path: Optional[str] = None, rebuild: bool = False) -> None:
+    """Полностью пересоздать базу из шаблона с начальными фильмами и подборками.
+
+    db_path по умолчанию — файл из DATABASE_URL. rebuild пересобирает шаблон.
+    """
+    target = Path(db_path or engine.url.database)
+    started = time.perf_counter()
+    template = RESET_TEMPLATE.build(force=rebuild)
+    print(f"✓ Шаблон {template.name} ({time.perf_counter() - started:.2f} с)")
+
+    restored = time.perf_counter()
+    RESET_TEMPLATE.restore(target)
+    print(f"✓ База {target} восстановлена из шаблона за {(time.perf_counter() - restored) * 1000:.0f} мс")
+    print(f"  пользователей: {len(DEMO_USERS)} (demo: user/1234, moderator/1234), "
+          f"подборок: {len(PICKS_DATA)}, фильмов: {len(MOVIES_DATA)}")
+    print("\n✅ База данных успешно пересоздана и заполнена!")
 
 
 if __name__ == "__main__":
-    reset_and_seed_db()
+    parser = argparse.ArgumentParser(description="Сброс БД к начальным данным из шаблона")
+    parser.add_argument("path", nargs="?", help="файл БД (по умолчанию из DATABASE_URL)")
+    parser.add_argument("--rebuild", action="store_true", help="пересобрать шаблон")
+    parser.add_argument("--template-only", action="store_true", help="только собрать шаблон")
+    args = parser.parse_args()
+    if args.template_only:
+        print(f"✓ Шаблон: {RESET_TEMPLATE.build(force=args.rebuild)}")
+    else:
+        reset_and_seed_db(args.path, rebuild=args.rebuild)
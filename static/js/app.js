@@ -2,7 +2,13 @@ const API_URL = '/api/v1';
 let currentUser = null;
 let currentToken = null;
 let currentUserRole = null;
+const MOVIES_PAGE_SIZE = 24;
+const REVIEWS_PAGE_SIZE = 20;
 let allMovies = [];
+let moviesCursor = null;
+let moviesLoading = false;
+let moviesRequestId = 0;
+let reviewsCursor = null;
 let selectedMovieId = null;
 let currentFilter = { pick: 'all', rating: 0 };
 let favoritesSet = new Set();
@@ -11,6 +17,7 @@ let favoritesSet = new Set();
 document.addEventListener('DOMContentLoaded', () => {
   restoreSession();
   loadMovies();
+  observeMoviesEnd();
 });
 
 // Theme toggle
@@ -271,19 +278,60 @@ function handleLogout() {
 }
 
 // Movies
+// Каталог грузится страницами по курсору: первая страница при старте,
+// следующие — когда пользователь докручивает до конца списка.
+function moviesQuery() {
+  const params = new URLSearchParams({ limit: MOVIES_PAGE_SIZE });
+  if (currentFilter.pick !== 'all') params.set('pick', currentFilter.pick);
+  if (currentFilter.rating > 0) params.set('min_rating', currentFilter.rating);
+  if (moviesCursor) params.set('cursor', moviesCursor);
+  return params;
+}
+
 async function loadMovies() {
+  allMovies = [];
+  moviesCursor = null;
+  moviesLoading = false;
+  const list = document.getElementById('moviesList');
+  if (list) list.innerHTML = '';
+  
+  await loadMoviesPage(++moviesRequestId);
+  if (currentToken) loadFavoritesSet();
+}
+
+async function loadMoreMovies() {
+  if (moviesLoading || !moviesCursor) return;
+  await loadMoviesPage(moviesRequestId);
+}
+
+async function loadMoviesPage(requestId) {
+  moviesLoading = true;
   try {
-    const response = await fetch(`${API_URL}/movies`);
+    const response = await fetch(`${API_URL}/movies?${moviesQuery()}`);
+    // Фильтр сменился, пока страница грузилась
+    if (requestId !== moviesRequestId) return;
     if (response.ok) {
-      allMovies = await response.json();
-      renderMovies();
-      if (currentToken) loadFavoritesSet();
+      const page = await response.json();
+      allMovies = allMovies.concat(page.items);
+      moviesCursor = page.next_cursor;
+      renderMovies(page.items);
     }
   } catch (err) {
     console.error('Error loading movies:', err);
+  } finally {
+    if (requestId === moviesRequestId) moviesLoading = false;
   }
 }
 
+function observeMoviesEnd() {
+  const sentinel = document.getElementById('moviesSentinel');
+  if (!sentinel || !('IntersectionObserver' in window)) return;
+  
+  new IntersectionObserver(entries => {
+    if (entries.some(entry => entry.isIntersecting)) loadMoreMovies();
+  }, { rootMargin: '400px' }).observe(sentinel);
+}
+
 async function loadFavoritesSet() {
   if (!currentToken) {
     favoritesSet.clear();
@@ -291,13 +339,13 @@ async function loadFavoritesSet() {
   }
   
   try {
-    const response = await fetch(`${API_URL}/favorites`, {
+    // One request for all IDs; the browser revalidates it with If-None-Match
+    const response = await fetch(`${API_URL}/favorites/ids`, {
       headers: { 'Authorization': `Bearer ${currentToken}` }
     });
     
     if (response.ok) {
-      const favorites = await response.json();
-      favoritesSet = new Set(favorites.map(f => f.id));
+      favoritesSet = new Set((await response.json()).movie_ids);
       updateFavButtonStates();
     }
   } catch (err) {
@@ -328,7 +376,7 @@ function filterByPick(pick) {
     activeBtn.classList.add('active');
   }
   
-  renderMovies();
+  loadMovies();
 }
 
 function filterByRating(rating) {
@@ -341,28 +389,15 @@ function filterByRating(rating) {
     activeBtn.classList.add('active');
   }
   
-  renderMovies();
+  loadMovies();
 }
 
-function renderMovies() {
+// Фильтры применяет сервер, здесь только дорисовываем полученную страницу
+function renderMovies(movies) {
   const list = document.getElementById('moviesList');
   if (!list) return;
   
-  list.innerHTML = '';
-  
-  let filtered = allMovies;
-  
-  // Filter by pick
-  if (currentFilter.pick !== 'all') {
-    filtered = filtered.filter(m => m.picks && m.picks.includes(currentFilter.pick));
-  }
-  
-  // Filter by rating
-  if (currentFilter.rating > 0) {
-    filtered = filtered.filter(m => m.rating >= currentFilter.rating);
-  }
-  
-  filtered.forEach(movie => {
+  movies.forEach(movie => {
     const li = document.createElement('li');
     li.className = 'movie-card';
     li.dataset.id = movie.id;
@@ -457,18 +492,30 @@ async function showMovieDetails(movie) {
   updateFavButtonStates();
 }
 
-async function loadReviews(movieId) {
+async function loadReviews(movieId, append = false) {
+  if (!append) reviewsCursor = null;
+  
   try {
-    const response = await fetch(`${API_URL}/reviews?movie_id=${movieId}`);
+    const params = new URLSearchParams({ movie_id: movieId, limit: REVIEWS_PAGE_SIZE });
+    if (reviewsCursor) params.set('cursor', reviewsCursor);
+    
+    const response = await fetch(`${API_URL}/reviews?${params}`);
     if (response.ok) {
-      const reviews = await response.json();
+      const page = await response.json();
+      const reviews = page.items;
+      reviewsCursor = page.next_cursor;
       const container = document.getElementById('reviewsList');
       if (!container) return;
       
-      if (reviews.length === 0) {
+      const moreButton = document.getElementById('reviewsMore');
+      if (moreButton) moreButton.remove();
+      
+      if (!append && reviews.length === 0) {
         container.innerHTML = '<p style="color: var(--color-muted);">Рецензий нет</p>';
-      } else {
-        container.innerHTML = reviews.map(r => `
+        return;
+      }
+      
+      const html = reviews.map(r => `
           <div class="review-item">
             <div class="review-header">
               <span class="review-author">${r.author_name}</span>
@@ -477,6 +524,16 @@ async function loadReviews(movieId) {
             <p class="review-text">${r.text}</p>
           </div>
         `).join('');
+      
+      if (append) {
+        container.insertAdjacentHTML('beforeend', html);
+      } else {
+        container.innerHTML = html;
+      }
+      
+      if (reviewsCursor) {
+        container.insertAdjacentHTML('beforeend',
+          `<button type="button" id="reviewsMore" class="secondary-button small" onclick="loadReviews(${movieId}, true)">Показать ещё</button>`);
       }
     }
   } catch (err) {
@@ -551,12 +608,12 @@ async function loadFavorites() {
   if (!currentToken) return;
   
   try {
-    const response = await fetch(`${API_URL}/favorites`, {
+    const response = await fetch(`${API_URL}/favorites?limit=100`, {
       headers: { 'Authorization': `Bearer ${currentToken}` }
     });
     
     if (response.ok) {
-      const favorites = await response.json();
+      const favorites = (await response.json()).items;
       const list = document.getElementById('favoritesList');
       if (!list) return;
       
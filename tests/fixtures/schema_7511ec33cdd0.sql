@@ -0,0 +1,123 @@
+-- Схема базы на ревизии 7511ec33cdd0: таблицы создавались init_db (create_all)
+-- по моделям того времени, дальше база ведется миграциями. Не менять:
+-- tests/test_query_plans.py накатывает на нее alembic upgrade head.
+
+CREATE TABLE users (
+	id INTEGER NOT NULL, 
+	username VARCHAR NOT NULL, 
+	email VARCHAR, 
+	password_hash VARCHAR NOT NULL, 
+	is_active BOOLEAN, 
+	is_superuser BOOLEAN, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE roles (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description VARCHAR, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE movies (
+	id INTEGER NOT NULL, 
+	title VARCHAR NOT NULL, 
+	overview VARCHAR, 
+	year INTEGER, 
+	genre VARCHAR NOT NULL, 
+	rating FLOAT, 
+	poster_url VARCHAR, 
+	created_by INTEGER, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+
+CREATE TABLE picks (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	slug VARCHAR NOT NULL, 
+	description VARCHAR, 
+	created_by INTEGER, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+
+CREATE TABLE reviews (
+	id INTEGER NOT NULL, 
+	movie_id INTEGER NOT NULL, 
+	user_id INTEGER, 
+	text VARCHAR NOT NULL, 
+	rating FLOAT NOT NULL, 
+	author_name VARCHAR, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(movie_id) REFERENCES movies (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE movie_picks (
+	movie_id INTEGER NOT NULL, 
+	pick_id INTEGER NOT NULL, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (movie_id, pick_id), 
+	FOREIGN KEY(movie_id) REFERENCES movies (id), 
+	FOREIGN KEY(pick_id) REFERENCES picks (id)
+);
+
+CREATE TABLE favorites (
+	id INTEGER NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	movie_id INTEGER NOT NULL, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(movie_id) REFERENCES movies (id)
+);
+
+CREATE TABLE movie_stats (
+	id INTEGER NOT NULL, 
+	movie_id INTEGER NOT NULL, 
+	views_count INTEGER, 
+	average_rating FLOAT, 
+	reviews_count INTEGER, 
+	favorites_count INTEGER, 
+	picks_count INTEGER, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	UNIQUE (movie_id), 
+	FOREIGN KEY(movie_id) REFERENCES movies (id) ON DELETE CASCADE
+);
+
+CREATE INDEX ix_users_email ON users (email);
+
+CREATE UNIQUE INDEX ix_users_username ON users (username);
+
+CREATE INDEX ix_users_id ON users (id);
+
+CREATE UNIQUE INDEX ix_roles_name ON roles (name);
+
+CREATE INDEX ix_roles_id ON roles (id);
+
+CREATE INDEX ix_movies_id ON movies (id);
+
+CREATE INDEX ix_movies_genre ON movies (genre);
+
+CREATE INDEX ix_movies_title ON movies (title);
+
+CREATE INDEX ix_picks_id ON picks (id);
+
+CREATE UNIQUE INDEX ix_picks_slug ON picks (slug);
+
+CREATE INDEX ix_reviews_id ON reviews (id);
+
+CREATE INDEX ix_favorites_user_id ON favorites (user_id);
+
+CREATE INDEX ix_favorites_movie_id ON favorites (movie_id);
+
+CREATE INDEX ix_favorites_id ON favorites (id);
+
+CREATE INDEX ix_movie_stats_id ON movie_stats (id);
@@ -0,0 +1,73 @@
+# test_bulk_loader.py
+"""Частичное обновление фильмов пакетным загрузчиком."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, select
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.database.base import Base
+from app.models.genres import Genre, MovieGenre
+from app.models.movies import Movie, movie_natural_key
+from app.services.bulk_loader import BulkMovieLoader
+
+
+@pytest.fixture
+def conn(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        BulkMovieLoader(conn).load([
+            {"id": 1, "title": "Матрица", "year": 1999, "genre": "Фантастика, Боевик", "rating": 8.7},
+            {"id": 2, "title": "Начало", "year": 2010, "genre": "Фантастика", "rating": 8.8},
+        ])
+        yield conn
+    engine.dispose()
+
+
+def natural_key(conn, movie_id):
+    return conn.scalar(select(Movie.natural_key).where(Movie.id == movie_id))
+
+
+def genres(conn, movie_id):
+    stmt = (
+        select(Genre.name)
+        .join(MovieGenre, MovieGenre.genre_id == Genre.id)
+        .where(MovieGenre.movie_id == movie_id)
+        .order_by(Genre.name)
+    )
+    return list(conn.execute(stmt).scalars())
+
+
+def test_title_only_update_refreshes_natural_key(conn):
+    BulkMovieLoader(conn).update([{"id": 1, "title": "Матрица: Перезагрузка"}])
+    assert natural_key(conn, 1) == movie_natural_key("Матрица: Перезагрузка", 1999)
+    # Прежнее название и год свободны для другого фильма
+    report = BulkMovieLoader(conn).load([{"title": "Матрица", "year": 1999, "genre": "Фантастика"}])
+    assert report.movies_inserted == 1
+
+
+def test_year_only_update_refreshes_natural_key(conn):
+    BulkMovieLoader(conn).update([{"id": 2, "year": 2011}])
+    assert natural_key(conn, 2) == movie_natural_key("Начало", 2011)
+
+
+def test_partial_update_keeps_genres(conn):
+    BulkMovieLoader(conn).update([{"id": 1, "rating": 9.0}, {"id": 2, "title": "Начало", "year": 2010}])
+    assert genres(conn, 1) == ["Боевик", "Фантастика"]
+    assert genres(conn, 2) == ["Фантастика"]
+    assert natural_key(conn, 1) == movie_natural_key("Матрица", 1999)
+
+
+def test_update_keeps_duplicate_suffix(conn):
+    # Дубль, которому миграция d6f8a0b2c4e5 добавила к ключу id
+    conn.execute(Movie.__table__.insert(), {
+        "id": 3, "title": "Матрица", "year": 1999, "genre": "Фантастика",
+        "natural_key": movie_natural_key("Матрица", 1999) + "#3",
+    })
+    report = BulkMovieLoader(conn).update([{"id": 3, "title": "Матрица", "year": 1999, "rating": 7.0}])
+    assert report.movies_updated == 1
+    assert natural_key(conn, 3) == movie_natural_key("Матрица", 1999) + "#3"
@@ -0,0 +1,58 @@
+# test_engagement.py
+"""Буфер действий аналитики не теряет действия при остановке."""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.database.base import Base
+from app.models.engagement import EngagementHourly
+from app.services.engagement import EngagementRecorder
+
+
+class SlowEngine:
+    """Движок, транзакция которого начинается с задержкой"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.flushing = asyncio.Event()
+
+    @asynccontextmanager
+    async def begin(self):
+        self.flushing.set()
+        await asyncio.sleep(0.2)
+        async with self.engine.begin() as conn:
+            yield conn
+
+
+def test_stop_during_slow_flush_keeps_events(tmp_path):
+    path = tmp_path / "engagement.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            slow_engine = SlowEngine(engine)
+            recorder = EngagementRecorder(flush_interval=0.01, max_pending=1000, engine=slow_engine)
+            recorder.add(1, "view", 3)
+            recorder.start()
+            await slow_engine.flushing.wait()
+            recorder.add(1, "favorite")
+            await recorder.stop()
+            async with engine.connect() as conn:
+                totals = await conn.execute(
+                    select(func.sum(EngagementHourly.views), func.sum(EngagementHourly.favorites))
+                )
+                return tuple(totals.one()), recorder.total_pending
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run()) == ((3, 1), 0)
@@ -0,0 +1,61 @@
+# test_genre_index.py
+"""Индекс жанров (movie_genres) следует за Movie.genre при записи через ORM."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.database.base import Base
+from app.models.genres import Genre, MovieGenre
+from app.models.movies import Movie
+from app.repositories.genres import list_genre_names
+from app.repositories.movie_repository import MovieRepository
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'genres.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def movie_genres(session, movie_id):
+    stmt = (
+        select(Genre.name)
+        .join(MovieGenre, MovieGenre.genre_id == Genre.id)
+        .where(MovieGenre.movie_id == movie_id)
+        .order_by(Genre.name)
+    )
+    return list(session.execute(stmt).scalars())
+
+
+def test_orm_insert_indexes_genres(session):
+    movies = MovieRepository(session).bulk_create_movies([
+        {"title": "Побег из Шоушенка", "year": 1994, "genre": "Драма, Криминал"},
+        {"title": "Матрица", "year": 1999, "genre": "Фантастика"},
+    ])
+    assert movie_genres(session, movies[0].id) == ["Драма", "Криминал"]
+    assert movie_genres(session, movies[1].id) == ["Фантастика"]
+    assert list_genre_names(session) == ["Драма", "Криминал", "Фантастика"]
+
+
+def test_orm_update_reindexes_genres(session):
+    movie = Movie(title="Матрица", year=1999, genre="Фантастика")
+    session.add(movie)
+    session.commit()
+
+    movie.genre = "Боевик, Фантастика"
+    session.commit()
+    assert movie_genres(session, movie.id) == ["Боевик", "Фантастика"]
+
+    # Изменение других колонок индекс не трогает
+    movie.rating = 8.7
+    session.commit()
+    assert movie_genres(session, movie.id) == ["Боевик", "Фантастика"]
@@ -0,0 +1,37 @@
+# test_http_cache.py
+"""Условные ответы: 304 только по ETag, Last-Modified не отдается."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from starlette.requests import Request
+
+from app.utils.http_cache import conditional_response, render_json
+
+
+def make_request(headers=None) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_no_last_modified_header():
+    response = conditional_response(make_request(), render_json({"id": 1}))
+    assert response.status_code == 200
+    assert "last-modified" not in response.headers
+    assert response.headers["etag"]
+
+
+def test_matching_etag_gives_304():
+    rendered = render_json({"id": 1})
+    response = conditional_response(make_request({"If-None-Match": rendered.etag}), rendered)
+    assert response.status_code == 304
+    assert response.body == b""
+
+
+def test_if_modified_since_is_ignored():
+    # Дата в будущем раньше давала 304 даже для измененных данных
+    headers = {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    response = conditional_response(make_request(headers), render_json({"id": 2}))
+    assert response.status_code == 200
+    assert response.body == b'{"id":2}'
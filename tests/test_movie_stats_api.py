@@ -0,0 +1,51 @@
+# test_movie_stats_api.py
+"""Изменять статистику фильмов может только администратор."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_current_user
+from app.api.movie_stats import router
+from app.database.database import get_async_db
+from app.repositories.user_cache import UserSnapshot
+
+MUTATIONS = [
+    ("post", "/movie-stats/", {"movie_id": 1, "views_count": 10**6}),
+    ("put", "/movie-stats/1", {"views_count": 10**6}),
+    ("delete", "/movie-stats/1", None),
+]
+
+
+async def no_db():
+    # До базы запрос доходить не должен
+    yield None
+
+
+def make_client(user=None) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = no_db
+    if user is not None:
+        app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+def user(is_superuser: bool) -> UserSnapshot:
+    return UserSnapshot(id=2, username="user", is_superuser=is_superuser, is_active=True)
+
+
+@pytest.mark.parametrize("method, url, body", MUTATIONS)
+def test_anonymous_cannot_modify_stats(method, url, body):
+    response = make_client().request(method, url, json=body)
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("method, url, body", MUTATIONS)
+def test_regular_user_cannot_modify_stats(method, url, body):
+    response = make_client(user(is_superuser=False)).request(method, url, json=body)
+    assert response.status_code == 403
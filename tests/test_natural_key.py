@@ -0,0 +1,63 @@
+# test_natural_key.py
+"""natural_key при обновлении фильма через ORM: дубли с суффиксом "#<id>"
+(миграция d6f8a0b2c4e5) обновляются без конфликта уникального индекса."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.database.base import Base
+from app.models.movies import Movie, movie_natural_key
+
+DUNE_KEY = movie_natural_key("Дюна", 2021)
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'keys.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Так миграция заполняет ключи дублей, существовавших до индекса
+        conn.execute(insert(Movie.__table__), [
+            {"id": 1, "title": "Дюна", "year": 2021, "genre": "Фантастика", "natural_key": DUNE_KEY},
+            {"id": 2, "title": "Дюна", "year": 2021, "genre": "Фантастика", "natural_key": f"{DUNE_KEY}#2"},
+        ])
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def natural_key(session, movie_id):
+    return session.scalar(select(Movie.natural_key).where(Movie.id == movie_id))
+
+
+def test_rating_update_of_suffixed_duplicate(session):
+    session.get(Movie, 2).rating = 7.9
+    session.commit()
+    assert natural_key(session, 2) == f"{DUNE_KEY}#2"
+
+
+def test_same_normalized_title_keeps_suffix(session):
+    session.get(Movie, 2).title = "ДЮНА "
+    session.commit()
+    assert natural_key(session, 2) == f"{DUNE_KEY}#2"
+
+
+def test_title_change_refreshes_key(session):
+    session.get(Movie, 2).title = "Дюна: Часть вторая"
+    session.commit()
+    assert natural_key(session, 2) == movie_natural_key("Дюна: Часть вторая", 2021)
+
+
+def test_rename_into_existing_movie_is_rejected(session):
+    session.add(Movie(id=3, title="Дюна", year=1984, genre="Фантастика"))
+    session.commit()
+    session.get(Movie, 3).year = 2021
+    with pytest.raises(IntegrityError):
+        session.commit()
@@ -0,0 +1,70 @@
+# test_pagination.py
+"""Keyset-пагинация каталога, в том числе по фильмам без рейтинга."""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.database.base import Base
+from app.models.movies import Movie
+from app.repositories.catalog import CatalogRepository
+
+# Каждый третий фильм без рейтинга, у части фильмов одинаковые рейтинг и дата
+RATINGS = [None if i % 3 == 0 else float(i % 4 * 2) for i in range(1, 21)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "catalog.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    started = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Movie.__table__), [
+            {
+                "id": movie_id,
+                "title": f"Фильм {movie_id}",
+                "genre": "Драма",
+                "rating": rating,
+                "created_at": started + timedelta(days=movie_id // 2),
+            }
+            for movie_id, rating in enumerate(RATINGS, start=1)
+        ])
+    engine.dispose()
+    return path
+
+
+def expected_order():
+    movies = [(rating or 0.0, datetime(2024, 1, 1) + timedelta(days=i // 2), i) for i, rating in enumerate(RATINGS, start=1)]
+    return [movie_id for *_, movie_id in sorted(movies, reverse=True)]
+
+
+async def collect_pages(path, limit, **filters):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with async_sessionmaker(engine)() as db:
+            ids, cursor = [], None
+            while True:
+                items, cursor = await CatalogRepository(db).list_movies(limit, cursor=cursor, **filters)
+                ids.extend(item["id"] for item in items)
+                if cursor is None:
+                    return ids
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 100])
+def test_pages_cover_catalog_with_null_ratings(db_path, limit):
+    assert asyncio.run(collect_pages(db_path, limit)) == expected_order()
+
+
+def test_min_rating_filter_pages(db_path):
+    ids = asyncio.run(collect_pages(db_path, 2, min_rating=4))
+    assert ids == [movie_id for movie_id in expected_order() if (RATINGS[movie_id - 1] or 0.0) >= 4]
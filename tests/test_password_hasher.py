@@ -0,0 +1,58 @@
+# test_password_hasher.py
+"""Общий пул bcrypt: один на все импорты, закрывается без блокировки event loop."""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.user_import import PasswordHasher
+from app.utils.security import verify_password
+
+
+def test_pool_is_shared_between_imports():
+    hasher = PasswordHasher(workers=2, rounds=4)
+
+    async def scenario():
+        hasher.start()
+        pool = hasher._pool
+        first = await hasher.hash_many_async(["a", "b", "c"])
+        second = await hasher.hash_many_async(["d"])
+        assert hasher._pool is pool
+        await hasher.stop()
+        return first + second
+
+    hashes = asyncio.run(scenario())
+    assert [verify_password(p, h) for p, h in zip("abcd", hashes)] == [True] * 4
+    assert hasher._pool is None
+
+
+def test_stop_waits_for_workers_off_the_loop_thread(monkeypatch):
+    hasher = PasswordHasher(workers=1, rounds=4)
+    hasher.start()
+    close = hasher.close
+    threads = []
+
+    def recording_close():
+        threads.append(threading.get_ident())
+        close()
+
+    monkeypatch.setattr(hasher, "close", recording_close)
+
+    async def scenario():
+        await hasher.stop()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert threads and threads[0] != loop_thread
+
+
+def test_restart_after_stop():
+    hasher = PasswordHasher(workers=1, rounds=4)
+    with hasher:
+        assert verify_password("x", hasher.hash_many(["x"])[0])
+    assert hasher._pool is None
+    # После закрытия пул создается заново при следующем использовании
+    assert verify_password("y", hasher.hash_many(["y"])[0])
+    hasher.close()
@@ -0,0 +1,330 @@
+# test_query_plans.py
+"""Проверка схемы и планов горячих запросов (EXPLAIN QUERY PLAN).
+
+База строится так же, как у развернутых копий: схема ревизии 7511ec33cdd0
+(tests/fixtures/schema_7511ec33cdd0.sql), затем alembic upgrade head.
+Проверяется, что миграции дают те же индексы, что и модели, и что ни
+один горячий запрос репозиториев и эндпоинтов не читает таблицу полным
+просмотром (SCAN <таблица> без индекса): значит, пропал или перестал
+подходить индекс.
+
+Запуск:
+    python -m pytest tests/test_query_plans.py
+    python tests/test_query_plans.py [-v]   (с планами всех запросов)
+"""
+import asyncio
+import re
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, insert, inspect, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.api.main_api import REVIEW_PAGE_KEY, find_favorite
+from app.database.base import Base
+from app.database.counters import read_counters
+from app.models import Favorite, MovieStat, Pick, Review, User
+from app.repositories.catalog import CatalogRepository
+from app.repositories.engagement import record_events, trending
+from app.repositories.genres import list_genre_names
+from app.repositories.leaderboards import load_movies
+from app.repositories.movie_stats import MovieStatRepository
+from app.repositories.users import UserRepository
+from app.services.bulk_loader import BulkMovieLoader
+from app.utils.pagination import keyset_paginate
+
+BASELINE_REVISION = "7511ec33cdd0"
+BASELINE_SCHEMA = ROOT / "tests" / "fixtures" / f"schema_{BASELINE_REVISION}.sql"
+
+SCAN_RE = re.compile(r"^SCAN (\S+)(?: USING (?:COVERING )?INDEX (\S+))?")
+SKIPPED_RE = re.compile(r"^\s*(PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b|sqlite_master", re.IGNORECASE)
+PICKS = [{"id": 1, "name": "Хиты", "slug": "hits"}, {"id": 2, "name": "Новинки", "slug": "new"}]
+
+
+def migrate(path: str) -> None:
+    """Схема базовой ревизии и все миграции после нее"""
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.connection.executescript(BASELINE_SCHEMA.read_text(encoding="utf-8"))
+    engine.dispose()
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+def schema_differences(engine) -> list:
+    """Таблицы и индексы моделей, которых нет в базе, и лишние индексы"""
+    tables = set(inspect(engine).get_table_names())
+    differences = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            differences.append(f"нет таблицы {table.name}")
+            continue
+        expected = {index.name for index in table.indexes}
+        # Инспектор SQLAlchemy пропускает индексы по выражениям, поэтому
+        # список берется из PRAGMA (origin "c" — созданные CREATE INDEX)
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"PRAGMA index_list({table.name})").all()
+        actual = {row[1] for row in rows if row[3] == "c"}
+        differences += [f"нет индекса {table.name}.{name}" for name in sorted(expected - actual)]
+        differences += [f"лишний индекс {table.name}.{name}" for name in sorted(actual - expected)]
+    return differences
+
+
+def seed(engine) -> None:
+    movies = [
+        {
+            "id": movie_id,
+            "title": f"Фильм {movie_id}",
+            "overview": "описание",
+            "year": 2000 + movie_id % 20,
+            "genre": "Драма, Комедия" if movie_id % 2 else "Боевик",
+            "rating": 5 + movie_id % 5,
+            "picks": ["hits"] if movie_id % 3 else ["new"],
+        }
+        for movie_id in range(1, 51)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Pick.__table__), PICKS)
+        BulkMovieLoader(conn).load(movies)
+        conn.execute(insert(User.__table__), [{"id": 1, "username": "user", "password_hash": "x"}])
+        conn.execute(insert(Review.__table__), [{"movie_id": i, "user_id": 1, "text": "ok", "rating": 7} for i in range(1, 51)])
+        conn.execute(insert(Favorite.__table__), [{"user_id": 1, "movie_id": i} for i in range(1, 11)])
+        conn.execute(insert(MovieStat.__table__), [{"movie_id": i} for i in range(1, 51)])
+
+
+async def catalog_page(db):
+    await CatalogRepository(db).list_movies(20)
+    items, cursor = await CatalogRepository(db).list_movies(5)
+    await CatalogRepository(db).list_movies(5, cursor=cursor)
+
+
+async def catalog_filters(db):
+    await CatalogRepository(db).list_movies(20, pick="hits")
+    await CatalogRepository(db).list_movies(20, genre="Драма")
+    await CatalogRepository(db).list_movies(20, min_rating=7)
+
+
+async def movie_card(db):
+    await CatalogRepository(db).get_movie(7)
+
+
+async def search(db):
+    await CatalogRepository(db).search("фильм", 20)
+
+
+async def movie_reviews(db):
+    stmt = select(Review).where(Review.movie_id == 3)
+    await db.execute(keyset_paginate(stmt, REVIEW_PAGE_KEY, None, 20))
+
+
+async def reviews_feed(db):
+    await db.execute(keyset_paginate(select(Review), REVIEW_PAGE_KEY, None, 20))
+
+
+async def favorites(db):
+    await CatalogRepository(db).list_user_favorites(1, 20)
+    await find_favorite(db, 1, 3)
+    await CatalogRepository(db).favorite_movie_ids(1)
+    await CatalogRepository(db).favorite_movie_ids(1, [2, 3, 40])
+
+
+async def user_lookup(db):
+    await UserRepository(db).get_by_username("user")
+
+
+async def stat_writes(db):
+    repository = MovieStatRepository(db)
+    await repository.get_by_movie_id(3)
+    await repository.apply_review(3, 8.0, 1)
+    await repository.apply_favorite(3, 1)
+    await repository.add_views({3: 2, 4: 1})
+    await db.rollback()
+
+
+async def stats_counters(db):
+    await db.run_sync(lambda session: read_counters(session.connection()))
+
+
+async def genres(db):
+    await db.run_sync(list_genre_names)
+
+
+async def leaderboard_update(db):
+    await db.run_sync(lambda session: load_movies(session.connection(), [3, 4, 5]))
+
+
+async def engagement(db):
+    now = datetime.utcnow()
+    await db.run_sync(lambda session: record_events(session.connection(), {(3, "view", now.replace(minute=0, second=0, microsecond=0)): 1}))
+    for window in ("24h", "7d", "3m"):
+        await trending(db, window, "views", 20, now)
+    await db.rollback()
+
+
+# Горячие запросы: имя -> (сценарий, допустимые SCAN). Допускаются таблицы,
+# которые читаются целиком намеренно, и индексы, по которым страница с
+# LIMIT идет в порядке сортировки и останавливается после limit строк
+HOT_QUERIES = {
+    "каталог: страницы": (catalog_page, {"ix_movies_sort_rating_created_at"}),
+    "каталог: фильтры": (catalog_filters, set()),
+    "карточка фильма": (movie_card, set()),
+    "поиск": (search, set()),
+    "отзывы фильма": (movie_reviews, set()),
+    "общая лента отзывов": (reviews_feed, {"ix_reviews_created_at"}),
+    "избранное": (favorites, set()),
+    "пользователь по username": (user_lookup, set()),
+    "запись статистики": (stat_writes, set()),
+    "/stats": (stats_counters, set()),
+    # Справочник жанров отдается целиком
+    "/genres": (genres, {"genres"}),
+    "обновление рейтингов": (leaderboard_update, set()),
+    "аналитика": (engagement, set()),
+}
+
+
+def full_scans(plan, allowed) -> list:
+    """Строки плана с полным просмотром таблицы или всего индекса
+    (виртуальные таблицы и подзапросы не считаются)"""
+    tables = set(Base.metadata.tables)
+    scans = []
+    for row in plan:
+        match = SCAN_RE.match(row[-1])
+        if not match or match.group(1) not in tables:
+            continue
+        if match.group(1) not in allowed and match.group(2) not in allowed:
+            scans.append(row[-1])
+    return scans
+
+
+async def capture(async_engine, scenario) -> list:
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if not SKIPPED_RE.search(statement):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+            await scenario(db)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+def explain(engine, statements, allowed, verbose: bool = False) -> list:
+    """(запрос, строки плана с полным просмотром) для каждого плохого запроса"""
+    problems = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            scans = full_scans(plan, allowed)
+            if scans:
+                problems.append((statement, scans))
+            if verbose:
+                print(f"   {' '.join(statement.split())[:120]}")
+                for row in plan:
+                    print(f"      {row[-1]}")
+    return problems
+
+
+def format_problems(problems) -> str:
+    lines = []
+    for statement, scans in problems:
+        lines.append(f"   {' '.join(statement.split())}")
+        lines += [f"      {scan}" for scan in scans]
+    return "\n".join(lines)
+
+
+# ==================== PYTEST ====================
+
+@pytest.fixture(scope="module")
+def migrated_db(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    migrate(path)
+    engine = create_engine(f"sqlite:///{path}")
+    seed(engine)
+    yield path, engine
+    engine.dispose()
+
+
+def test_migrations_match_models(migrated_db):
+    _, engine = migrated_db
+    assert schema_differences(engine) == []
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(migrated_db, name):
+    path, engine = migrated_db
+    scenario, allowed = HOT_QUERIES[name]
+
+    async def run():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            return await capture(async_engine, scenario)
+        finally:
+            await async_engine.dispose()
+
+    statements = asyncio.run(run())
+    assert statements
+    problems = explain(engine, statements, allowed)
+    assert not problems, "Полный просмотр таблицы:\n" + format_problems(problems)
+
+
+# ==================== ЗАПУСК СКРИПТОМ ====================
+
+async def check(path: str, verbose: bool) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    failures = 0
+    differences = schema_differences(engine)
+    if differences:
+        failures += 1
+        print("❌ схема после миграций")
+        for difference in differences:
+            print(f"   {difference}")
+    else:
+        print("✅ схема после миграций совпадает с моделями")
+    seed(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        for name, (scenario, allowed) in HOT_QUERIES.items():
+            statements = await capture(async_engine, scenario)
+            problems = explain(engine, statements, allowed, verbose)
+            if problems:
+                failures += 1
+                print(f"❌ {name}")
+                print(format_problems(problems))
+            else:
+                print(f"✅ {name} ({len(statements)} запросов)")
+    finally:
+        await async_engine.dispose()
+        engine.dispose()
+    return failures
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = f"{tmp_dir}/plans.db"
+        migrate(path)
+        failures = asyncio.run(check(path, "-v" in sys.argv[1:]))
+    if failures:
+        print(f"\n❌ Проблемы в {failures} проверках")
+        return 1
+    print("\n🎉 Схема совпадает с моделями, все горячие запросы идут по индексам")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# test_snapshots.py
+"""Шаблон сброса БД собирается с производными таблицами."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database.snapshots import DatabaseTemplate
+from app.models.genres import MovieGenre
+from app.models.movie_stats import MovieStat
+from app.repositories.genres import list_genre_names, split_genres
+from reset_db_and_seed import MOVIES_DATA, RESET_TEMPLATE
+
+
+def test_reset_template_has_genre_index_and_stats(tmp_path):
+    template = DatabaseTemplate(
+        "reset",
+        seed=RESET_TEMPLATE.seed,
+        seed_data=RESET_TEMPLATE.seed_data,
+        directory=tmp_path,
+    )
+    engine = template.memory_engine()
+    try:
+        with Session(engine) as session:
+            genres = sorted({name for movie in MOVIES_DATA for name in split_genres(movie["genre"])})
+            assert list_genre_names(session) == genres
+            assert session.scalar(select(func.count()).select_from(MovieGenre)) == sum(
+                len(split_genres(movie["genre"])) for movie in MOVIES_DATA
+            )
+            assert session.scalar(select(func.count()).select_from(MovieStat)) == len(MOVIES_DATA)
+    finally:
+        engine.dispose()
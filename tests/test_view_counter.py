@@ -0,0 +1,63 @@
+# test_view_counter.py
+"""Счетчик просмотров не теряет просмотры при остановке."""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401  (регистрация моделей в Base.metadata)
+from app.database.base import Base
+from app.models.movie_stats import MovieStat
+from app.models.movies import Movie
+from app.repositories.movie_stats import MovieStatRepository
+from app.services.view_counter import ViewCounter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "views.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Movie.__table__), [{"id": i, "title": f"Фильм {i}", "genre": "Драма"} for i in (1, 2)])
+        conn.execute(insert(MovieStat.__table__), [{"movie_id": i, "views_count": 0} for i in (1, 2)])
+    engine.dispose()
+    return path
+
+
+def test_stop_during_slow_flush_keeps_views(db_path, monkeypatch):
+    add_views = MovieStatRepository.add_views
+
+    async def run():
+        flushing = asyncio.Event()
+
+        async def slow_add_views(self, increments):
+            flushing.set()
+            await asyncio.sleep(0.2)
+            return await add_views(self, increments)
+
+        monkeypatch.setattr(MovieStatRepository, "add_views", slow_add_views)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        try:
+            counter = ViewCounter(flush_interval=0.01, max_pending=1000, session_factory=async_sessionmaker(engine))
+            counter.add(1, 3)
+            counter.start()
+            await flushing.wait()
+            # Эти просмотры приходят во время записи и уходят последним сбросом
+            counter.add(1, 2)
+            counter.add(2, 4)
+            await counter.stop()
+            async with engine.connect() as conn:
+                rows = await conn.execute(select(MovieStat.movie_id, MovieStat.views_count).order_by(MovieStat.movie_id))
+                return rows.all(), counter.total_pending
+        finally:
+            await engine.dispose()
+
+    views, pending = asyncio.run(run())
+    assert views == [(1, 5), (2, 4)]
+    assert pending == 0